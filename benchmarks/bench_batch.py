@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the receiving side of an aggregator agent, for a high rate of simple messages.
+
+The frames are prepared in advance and returned by ``_receive_many`` in bursts, as they are drained from the
+read buffer, so that only the parsing and the dispatch are measured. The aggregator receives the messages one
+at a time with ``on_message``, or in batches with ``on_message_batch``, for several maximum batch sizes.
+
+    python -m benchmarks.bench_batch
+"""
+
+import asyncio
+import time
+
+from oef import agent_pb2
+from oef.agents import LocalAgent
+from oef.proxy import OEFLocalProxy
+from benchmarks.common import print_table
+
+N_MESSAGES = 100000
+BURST_SIZE = 500
+CONTENT = b"x" * 64
+BATCH_SIZES = [16, 256, 4096]
+
+
+class _Aggregator(LocalAgent):
+    """An agent that counts the simple messages it receives."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.received = 0
+        self.batches = 0
+        self.done = None
+
+    def _count(self, n):
+        self.received += n
+        if self.received >= N_MESSAGES:
+            self.done.set_result(None)
+
+    def on_message(self, msg_id, dialogue_id, origin, content):
+        self._count(1)
+
+    def on_cfp(self, *args): pass
+    def on_propose(self, *args): pass
+    def on_accept(self, *args): pass
+    def on_decline(self, *args): pass
+    def on_search_result(self, *args): pass
+    def on_search_result_wide(self, *args): pass
+    def on_oef_error(self, *args): pass
+    def on_dialogue_error(self, *args): pass
+
+
+class _BatchAggregator(_Aggregator):
+
+    def on_message_batch(self, messages):
+        self.batches += 1
+        self._count(len(messages))
+
+
+def _bursts():
+    msg = agent_pb2.Server.AgentMessage()
+    msg.content.dialogue_id = 0
+    msg.content.origin = "sender"
+    msg.content.content = CONTENT
+    frames = []
+    for i in range(N_MESSAGES):
+        msg.answer_id = i
+        frames.append(msg.SerializeToString())
+    return [frames[i:i + BURST_SIZE] for i in range(0, N_MESSAGES, BURST_SIZE)]
+
+
+def _run(loop, aggregator_class, max_batch_size: int):
+    aggregator = aggregator_class("aggregator", OEFLocalProxy.LocalNode(loop), loop=loop,
+                                  max_batch_size=max_batch_size)
+    aggregator.done = loop.create_future()
+    bursts = _bursts()
+
+    async def receive_many():
+        if not bursts:
+            await loop.create_future()
+        return bursts.pop(0)
+
+    aggregator._oef_proxy._receive_many = receive_many
+    start = time.perf_counter()
+    task = asyncio.ensure_future(aggregator.async_run(), loop=loop)
+    loop.run_until_complete(aggregator.done)
+    elapsed = time.perf_counter() - start
+    aggregator.stop()
+    loop.run_until_complete(asyncio.wait([task]))
+    return N_MESSAGES / elapsed, aggregator.batches
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    rows = []
+    throughput, _ = _run(loop, _Aggregator, 1)
+    rows.append(["on_message", "-", "{:.0f}".format(throughput), "-"])
+    for max_batch_size in BATCH_SIZES:
+        throughput, batches = _run(loop, _BatchAggregator, max_batch_size)
+        rows.append(["on_message_batch", max_batch_size, "{:.0f}".format(throughput),
+                     "{:.1f}".format(N_MESSAGES / batches)])
+    loop.close()
+    print("{} messages of {} bytes, received in bursts of {}".format(N_MESSAGES, len(CONTENT), BURST_SIZE))
+    print_table(["handler", "max batch size", "messages/s", "mean batch size"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of a CFP and a Propose sent to 1,000 recipients with :class:`~oef.proxy.OEFNetworkProxy`.
+
+The same message is sent in 1,000 dialogues, either with one ``send_cfp``/``send_propose`` call per recipient,
+which packs and serializes the whole message every time, or with ``send_cfp_many``/``send_propose_many``,
+which serialize the FIPA payload once and encode only the envelope of every recipient.
+The frames are written to a local socket pair, and the time reported includes reading them on the other end.
+
+    python -m benchmarks.bench_broadcast
+"""
+
+import asyncio
+
+from oef.query import Query, Constraint, Eq, Gt
+from oef.schema import Description, DataModel, AttributeSchema
+from benchmarks.common import print_table, read_frames, socket_pair_proxy, timeit
+
+N_RECIPIENTS = 1000
+N_ATTRIBUTES = 10
+
+_DATA_MODEL = DataModel("bench", [AttributeSchema("attr_{}".format(i), int, True) for i in range(N_ATTRIBUTES)])
+_QUERY = Query([Constraint("attr_{}".format(i), Gt(i)) for i in range(N_ATTRIBUTES)] +
+               [Constraint("attr_0", Eq(42))], _DATA_MODEL)
+_PROPOSALS = [Description({"attr_{}".format(i): i * j for i in range(N_ATTRIBUTES)}, _DATA_MODEL)
+              for j in range(10)]
+PAYLOADS = [("CFP, no query", "cfp", None),
+            ("CFP, {} constraints".format(len(_QUERY.constraints)), "cfp", _QUERY),
+            ("Propose, bytes", "propose", b"x" * 256),
+            ("Propose, {} descriptions".format(len(_PROPOSALS)), "propose", _PROPOSALS)]
+
+
+async def _drain(proxy, receiver, n_frames):
+    await read_frames(receiver, n_frames)
+    await proxy.drain()
+
+
+def _one_at_a_time(proxy, kind, recipients, payload):
+    send = proxy.send_cfp if kind == "cfp" else proxy.send_propose
+    for dialogue_id, destination in recipients:
+        send(0, dialogue_id, destination, 0, payload)
+
+
+def _broadcast(proxy, kind, recipients, payload):
+    send_many = proxy.send_cfp_many if kind == "cfp" else proxy.send_propose_many
+    send_many(0, recipients, 0, payload)
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    proxy, receiver = loop.run_until_complete(socket_pair_proxy(loop))
+    recipients = [(dialogue_id, "seller_{:04d}".format(dialogue_id)) for dialogue_id in range(N_RECIPIENTS)]
+    rows = []
+    for name, kind, payload in PAYLOADS:
+        times = []
+        for send in (_one_at_a_time, _broadcast):
+            def run():
+                send(proxy, kind, recipients, payload)
+                loop.run_until_complete(_drain(proxy, receiver, N_RECIPIENTS))
+            times.append(timeit(run))
+        rows.append([name, "{:.2f}".format(times[0] * 1e3), "{:.2f}".format(times[1] * 1e3),
+                     "{:.1f}x".format(times[0] / times[1])])
+    proxy._transport.close()
+    receiver.transport.close()
+    loop.run_until_complete(asyncio.sleep(0))
+    loop.close()
+    print("the same message sent to {} recipients, including the time to read the frames".format(N_RECIPIENTS))
+    print_table(["message", "one at a time (ms)", "broadcast (ms)", "speed-up"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the construction of descriptions, e.g. the proposals built by a station or decoded by an agent.
+
+A million descriptions with the same values are built with the constructor, which copies and checks the values,
+and with :func:`~oef.schema.Description.trusted`, with and without a data model. The decoding with
+:func:`~oef.schema.Description.from_pb` is compared with the constructor it used before.
+
+    python -m benchmarks.bench_description
+"""
+
+import time
+
+from oef.schema import AttributeSchema, DataModel, Description, Location
+from benchmarks.common import print_table
+
+N_DESCRIPTIONS = 1000000
+
+VALUES = {"price": 10, "volume": 2.5, "currency": "FET", "available": True, "position": Location(52.2, 0.1)}
+DATA_MODEL = DataModel("bench", [AttributeSchema(name, type(value), True) for name, value in VALUES.items()])
+DESCRIPTION_PB = Description(VALUES, DATA_MODEL).to_pb()
+
+
+def _legacy_from_pb():
+    """The decoding used before, through the constructors, that copy the values and the schemas."""
+    model_pb = DESCRIPTION_PB.model
+    model = DataModel(model_pb.name, [AttributeSchema.from_pb(attr_pb) for attr_pb in model_pb.attributes],
+                      model_pb.description)
+    values = dict([(attr.key, Description._extract_value(attr.value)) for attr in DESCRIPTION_PB.values])
+    return Description(values, model)
+
+
+"""The configurations: name, construction, and the index of the configuration to compare with."""
+CONFIGURATIONS = [("Description(values, model)", lambda: Description(VALUES, DATA_MODEL), 0),
+                  ("Description.trusted(values, model)", lambda: Description.trusted(VALUES, DATA_MODEL), 0),
+                  ("Description(values)", lambda: Description(VALUES), 2),
+                  ("Description.trusted(values)", lambda: Description.trusted(VALUES), 2),
+                  ("from_pb, through the constructors", _legacy_from_pb, 4),
+                  ("Description.from_pb", lambda: Description.from_pb(DESCRIPTION_PB), 4)]
+
+
+def _measure(build) -> float:
+    start = time.perf_counter()
+    for _ in range(N_DESCRIPTIONS):
+        build()
+    return time.perf_counter() - start
+
+
+def main():
+    rows = []
+    times = []
+    for name, build, reference in CONFIGURATIONS:
+        times.append(_measure(build))
+        rows.append([name, "{:.2f}".format(times[-1]), "{:.2f}".format(times[-1] / N_DESCRIPTIONS * 1e6),
+                     "{:.1f}x".format(times[reference] / times[-1])])
+    print("{} descriptions with {} attributes".format(N_DESCRIPTIONS, len(VALUES)))
+    print_table(["construction", "total (s)", "per description (us)", "speed-up"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of a buyer that receives the same proposals from many sellers.
+
+Every seller answers with one of a few distinct proposals. The buyer decodes the Propose messages and reads
+the values of the proposals, without the description cache, i.e. with a lazy description decoded for every
+proposal, and with the cache, for several capacities.
+
+    python -m benchmarks.bench_description_cache
+"""
+
+import time
+
+from oef.messages import InboundPropose, decode
+from oef.schema import AttributeSchema, DataModel, Description, description_cache
+from benchmarks.common import print_table
+
+N_SELLERS = 500
+N_ROUNDS = 20
+N_DISTINCT = 64
+CAPACITIES = [0, 16, 64, 1024]
+
+DATA_MODEL = DataModel("offer", [AttributeSchema("attr_{}".format(i), int, True) for i in range(10)])
+
+
+def _frames():
+    proposals = [Description({"attr_{}".format(i): i * j for i in range(10)}, DATA_MODEL) for j in range(N_DISTINCT)]
+    return [InboundPropose(seller, 0, "seller_{}".format(seller), 0, [proposals[(seller * 7) % N_DISTINCT]])
+            .to_pb().SerializeToString() for seller in range(N_SELLERS)]
+
+
+def _run(frames) -> float:
+    start = time.perf_counter()
+    for _ in range(N_ROUNDS):
+        for data in frames:
+            for proposal in decode(data).proposals:
+                proposal.values["attr_0"]
+    return time.perf_counter() - start
+
+
+def main():
+    frames = _frames()
+    rows = []
+    for capacity in CAPACITIES:
+        description_cache.clear()
+        description_cache.resize(capacity)
+        elapsed = _run(frames)
+        stats = description_cache.stats
+        rows.append([capacity or "disabled", "{:.2f}".format(elapsed / (N_ROUNDS * N_SELLERS) * 1e6),
+                     "{:.3f}".format(stats.hit_rate), stats.evictions, len(description_cache)])
+    description_cache.resize(0)
+    print("{} proposals from {} sellers, {} distinct".format(N_ROUNDS * N_SELLERS, N_SELLERS, N_DISTINCT))
+    print_table(["capacity", "per proposal (us)", "hit rate", "evictions", "cached"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the per-message dispatch cost of :func:`~oef.core.OEFProxy.loop`, for every type of message.
+
+The table-driven dispatch (:func:`~oef.core.OEFProxy._dispatch`) is compared with the former chain
+of ``if``/``elif``, kept here as a reference. Both parse the message and call a no-op handler.
+
+    python -m benchmarks.bench_dispatch
+"""
+
+import asyncio
+import time
+
+from oef import agent_pb2
+from oef.agents import Agent
+from oef.core import DISPATCH_CASES
+from oef.messages import OEFErrorOperation
+from oef.proxy import OEFLocalProxy
+from oef.query import Query
+from oef.schema import Description
+from benchmarks.common import print_table
+
+N_MESSAGES = 20000
+REPEAT = 5
+
+
+class _NullAgent(Agent):
+    """An agent whose handlers do nothing."""
+
+    def on_message(self, *args): pass
+    def on_cfp(self, *args): pass
+    def on_propose(self, *args): pass
+    def on_accept(self, *args): pass
+    def on_decline(self, *args): pass
+    def on_search_result(self, *args): pass
+    def on_search_result_wide(self, *args): pass
+    def on_oef_error(self, *args): pass
+    def on_dialogue_error(self, *args): pass
+
+
+def _messages():
+    """A sample message of every type."""
+    messages = {case: agent_pb2.Server.AgentMessage() for case in DISPATCH_CASES if case != "agents_wide"}
+    for case, msg in messages.items():
+        msg.answer_id = 1
+        if case == "content" or case.startswith("fipa."):
+            msg.content.dialogue_id = 2
+            msg.content.origin = "origin"
+        if case.startswith("fipa."):
+            msg.content.fipa.target = 3
+
+    messages["agents"].agents.agents.extend(["agent_{}".format(i) for i in range(10)])
+    messages["oef_error"].oef_error.operation = OEFErrorOperation.REGISTER_SERVICE.value
+    messages["dialogue_error"].dialogue_error.dialogue_id = 2
+    messages["dialogue_error"].dialogue_error.origin = "origin"
+    messages["content"].content.content = b"hello"
+    messages["fipa.cfp"].content.fipa.cfp.nothing.SetInParent()
+    messages["fipa.propose"].content.fipa.propose.proposals.objects.extend([Description({"price": 10}).to_pb()])
+    messages["fipa.accept"].content.fipa.accept.SetInParent()
+    messages["fipa.decline"].content.fipa.decline.SetInParent()
+    return {case: msg.SerializeToString() for case, msg in messages.items()}
+
+
+async def _legacy_dispatch(agent: Agent, data: bytes) -> None:  # noqa: C901
+    """The dispatch used before, kept here as a reference."""
+    msg = agent_pb2.Server.AgentMessage()
+    msg.ParseFromString(data)
+    case = msg.WhichOneof("payload")
+    if case == "agents":
+        await agent.async_on_search_result(msg.answer_id, msg.agents.agents)
+    elif case == "agents_wide":
+        agent.on_search_result_wide(msg.answer_id, [])
+    elif case == "oef_error":
+        await agent.async_on_oef_error(msg.answer_id, OEFErrorOperation(msg.oef_error.operation))
+    elif case == "dialogue_error":
+        await agent.async_on_dialogue_error(msg.answer_id, msg.dialogue_error.dialogue_id, msg.dialogue_error.origin)
+    elif case == "content":
+        content_case = msg.content.WhichOneof("payload")
+        if content_case == "content":
+            await agent.async_on_message(msg.answer_id, msg.content.dialogue_id, msg.content.origin,
+                                         msg.content.content)
+        elif content_case == "fipa":
+            fipa = msg.content.fipa
+            fipa_case = fipa.WhichOneof("msg")
+            if fipa_case == "cfp":
+                cfp_case = fipa.cfp.WhichOneof("payload")
+                if cfp_case == "nothing":
+                    query = None
+                elif cfp_case == "content":
+                    query = fipa.cfp.content
+                elif cfp_case == "query":
+                    query = Query.from_pb(fipa.cfp.query)
+                else:
+                    raise Exception("Query type not valid.")
+                await agent.async_on_cfp(msg.answer_id, msg.content.dialogue_id, msg.content.origin,
+                                         fipa.target, query)
+            elif fipa_case == "propose":
+                propose_case = fipa.propose.WhichOneof("payload")
+                if propose_case == "content":
+                    proposals = fipa.propose.content
+                else:
+                    proposals = [Description.from_pb(propose) for propose in fipa.propose.proposals.objects]
+                await agent.async_on_propose(msg.answer_id, msg.content.dialogue_id, msg.content.origin,
+                                             fipa.target, proposals)
+            elif fipa_case == "accept":
+                await agent.async_on_accept(msg.answer_id, msg.content.dialogue_id, msg.content.origin,
+                                            fipa.target)
+            elif fipa_case == "decline":
+                await agent.async_on_decline(msg.answer_id, msg.content.dialogue_id, msg.content.origin,
+                                             fipa.target)
+
+
+async def _measure(dispatch, agent: Agent, data: bytes) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(N_MESSAGES):
+            await dispatch(agent, data)
+        best = min(best, time.perf_counter() - start)
+    return best / N_MESSAGES
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    proxy = OEFLocalProxy("bench", OEFLocalProxy.LocalNode(loop), loop=loop)
+    agent = _NullAgent(proxy)
+    rows = []
+    for case, data in _messages().items():
+        before = loop.run_until_complete(_measure(_legacy_dispatch, agent, data))
+        after = loop.run_until_complete(_measure(proxy._dispatch, agent, data))
+        rows.append([case, "{:.2f}".format(before * 1e6), "{:.2f}".format(after * 1e6),
+                     "{:+.0f}%".format((after - before) / before * 100)])
+    loop.close()
+    print("Dispatch cost per message, best average over {} runs of {} messages".format(REPEAT, N_MESSAGES))
+    print_table(["type", "if/elif (us)", "table (us)", "change"], rows)
+
+
+if __name__ == '__main__':
+    main()
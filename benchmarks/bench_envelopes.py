@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the packing of the outgoing messages into their Protobuf envelopes.
+
+For every message type, the envelope is packed with ``to_pb()``, and again into an envelope reused across
+the messages with ``to_pb(target)``. The table reports the time per message and, measured with
+:mod:`tracemalloc`, the peak of the memory allocated on the Python heap while packing one message.
+
+    python -m benchmarks.bench_envelopes
+"""
+
+import time
+import tracemalloc
+
+from oef import agent_pb2
+from oef.messages import Accept, CFP, Message, Propose, RegisterService, SearchServices
+from oef.query import Query, Constraint, Gt
+from oef.schema import Description, DataModel, AttributeSchema
+from benchmarks.common import print_table
+
+N_ATTRIBUTES = 10
+REPEAT = 200
+
+_DATA_MODEL = DataModel("bench", [AttributeSchema("attr_{}".format(i), int, True) for i in range(N_ATTRIBUTES)])
+_QUERY = Query([Constraint("attr_{}".format(i), Gt(i)) for i in range(N_ATTRIBUTES)], _DATA_MODEL)
+_DESCRIPTIONS = [Description({"attr_{}".format(i): i * j for i in range(N_ATTRIBUTES)}, _DATA_MODEL)
+                 for j in range(50)]
+MESSAGES = [("Message", Message(0, 0, "destination", b"x" * 64)),
+            ("Accept", Accept(0, 0, "destination", 0)),
+            ("RegisterService", RegisterService(0, _DESCRIPTIONS[0])),
+            ("SearchServices", SearchServices(0, _QUERY)),
+            ("CFP", CFP(0, 0, "destination", 0, _QUERY)),
+            ("Propose, 1 description", Propose(0, 0, "destination", 0, _DESCRIPTIONS[:1])),
+            ("Propose, 50 descriptions", Propose(0, 0, "destination", 0, _DESCRIPTIONS))]
+
+
+def _peak_memory(pack) -> int:
+    """The peak of the memory allocated while packing one message, in bytes."""
+    pack()
+    tracemalloc.start()
+    pack()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def _time(pack) -> float:
+    """The time to pack one message, in microseconds."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        pack()
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main():
+    rows = []
+    envelope = agent_pb2.Envelope()
+    for name, msg in MESSAGES:
+        def reuse():
+            envelope.Clear()
+            msg.to_pb(envelope)
+        rows.append([name, "{:.1f}".format(_time(msg.to_pb)), _peak_memory(msg.to_pb),
+                     "{:.1f}".format(_time(reuse)), _peak_memory(reuse)])
+    print_table(["message", "to_pb() (us)", "to_pb() peak (B)", "to_pb(target) (us)", "to_pb(target) peak (B)"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+Benchmark of the comparison and the deduplication of descriptions, e.g. the proposals received by a buyer.
+
+The descriptions are compared with ``==`` and deduplicated with a list while they are mutable. Once frozen,
+as the descriptions decoded with the description cache are, they are compared by their fingerprint and
+deduplicated with a set. The fingerprint of a frozen description is computed on first use, and then kept.
+
+    python -m benchmarks.bench_fingerprint
+"""
+
+import time
+
+from oef.schema import AttributeSchema, DataModel, Description
+from benchmarks.common import print_table
+
+N_ATTRIBUTES = 50
+N_DESCRIPTIONS = 2000
+N_DISTINCT = 200
+N_COMPARISONS = 20000
+
+DATA_MODEL = DataModel("offer", [AttributeSchema("attr_{}".format(i), int, True) for i in range(N_ATTRIBUTES)])
+
+
+def _descriptions():
+    return [Description({"attr_{}".format(i): i * (j % N_DISTINCT) for i in range(N_ATTRIBUTES)}, DATA_MODEL)
+            for j in range(N_DESCRIPTIONS)]
+
+
+def _compare(first, second) -> float:
+    start = time.perf_counter()
+    for _ in range(N_COMPARISONS):
+        first == second
+    return (time.perf_counter() - start) / N_COMPARISONS
+
+
+def _dedupe_with_list(descriptions) -> float:
+    start = time.perf_counter()
+    unique = []
+    for description in descriptions:
+        if description not in unique:
+            unique.append(description)
+    assert len(unique) == N_DISTINCT
+    return time.perf_counter() - start
+
+
+def _dedupe_with_set(descriptions) -> float:
+    start = time.perf_counter()
+    unique = set(descriptions)
+    assert len(unique) == N_DISTINCT
+    return time.perf_counter() - start
+
+
+def main():
+    descriptions = _descriptions()
+    first, second = descriptions[0], descriptions[N_DISTINCT]
+    compare_mutable = _compare(first, second)
+    dedupe_list = _dedupe_with_list(descriptions)
+
+    for description in descriptions:
+        description.freeze()
+    dedupe_first = _dedupe_with_set(descriptions)
+    dedupe_set = _dedupe_with_set(descriptions)
+    compare_frozen = _compare(first, second)
+
+    print("Descriptions with {} attributes; {} descriptions, {} distinct".format(N_ATTRIBUTES, N_DESCRIPTIONS,
+                                                                                N_DISTINCT))
+    print_table(["operation", "mutable", "frozen", "speedup"],
+                [["==, equal descriptions (us)", "{:.2f}".format(compare_mutable * 1e6),
+                  "{:.2f}".format(compare_frozen * 1e6), "{:.1f}x".format(compare_mutable / compare_frozen)],
+                 ["deduplication (ms)", "{:.2f}".format(dedupe_list * 1e3), "{:.2f}".format(dedupe_set * 1e3),
+                  "{:.1f}x".format(dedupe_list / dedupe_set)],
+                 ["first deduplication, with the fingerprints (ms)", "{:.2f}".format(dedupe_list * 1e3),
+                  "{:.2f}".format(dedupe_first * 1e3), "{:.1f}x".format(dedupe_list / dedupe_first)]])
+
+
+if __name__ == '__main__':
+    main()
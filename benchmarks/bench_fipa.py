@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the latency of a FIPA round trip (CFP -> Propose -> Accept) between two
+:class:`~oef.proxy.OEFNetworkProxy`, through an in-process fake OEF Node, with different socket options:
+
+* ``nagle``: ``TCP_NODELAY`` disabled;
+* ``default``: the options set by :mod:`asyncio` (``TCP_NODELAY`` enabled);
+* ``tuned``: ``TCP_NODELAY``, 1 MB kernel buffers and keepalive.
+
+    python -m benchmarks.bench_fipa
+"""
+
+import asyncio
+import statistics
+import time
+
+from oef.proxy import OEFNetworkProxy
+from oef.schema import Description
+from oef.transport import SocketOptions
+from benchmarks.common import print_table
+from test.common import FakeOEFNode
+
+N_ROUND_TRIPS = 500
+PROPOSAL = [Description({"price": 10, "currency": "FET"})]
+
+MODES = [
+    ("nagle", SocketOptions(nodelay=False)),
+    ("default", None),
+    ("tuned", SocketOptions(nodelay=True, send_buffer_size=1 << 20, receive_buffer_size=1 << 20, keepalive=True)),
+]
+
+
+async def _run(loop, node: FakeOEFNode, options):
+    buyer = OEFNetworkProxy("buyer", node.addr, node.port, loop=loop, socket_options=options)
+    seller = OEFNetworkProxy("seller", node.addr, node.port, loop=loop, socket_options=options)
+    await buyer.connect()
+    await seller.connect()
+
+    latencies = []
+    for i in range(N_ROUND_TRIPS):
+        start = time.perf_counter()
+        buyer.send_cfp(1, i, "seller", 0, None)
+        await seller._receive()
+        seller.send_propose(2, i, "buyer", 1, PROPOSAL)
+        await buyer._receive()
+        buyer.send_accept(3, i, "seller", 2)
+        await seller._receive()
+        latencies.append(time.perf_counter() - start)
+
+    effective = buyer.effective_socket_options
+    await buyer.stop()
+    await seller.stop()
+    return latencies, effective
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    rows = []
+    for mode, options in MODES:
+        with FakeOEFNode(loop) as node:
+            latencies, effective = loop.run_until_complete(_run(loop, node, options))
+        latencies.sort()
+        rows.append([mode,
+                     "{:.1f}".format(statistics.median(latencies) * 1e6),
+                     "{:.1f}".format(latencies[int(len(latencies) * 0.99)] * 1e6),
+                     ", ".join("{}={}".format(k, v) for k, v in sorted(effective.items()) if k in
+                               ("nodelay", "send_buffer_size", "receive_buffer_size", "keepalive"))])
+    loop.close()
+    print("{} FIPA round trips (CFP -> Propose -> Accept)".format(N_ROUND_TRIPS))
+    print_table(["mode", "median (us)", "p99 (us)", "effective options"], rows)
+
+
+if __name__ == '__main__':
+    main()
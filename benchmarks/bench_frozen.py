@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of a seller that sends the same proposals over and over, e.g. a weather station.
+
+The proposals are sent with ``send_propose`` in many dialogues, one dialogue at a time, with descriptions
+that are serialized every time, or frozen with :func:`~oef.schema.ProtobufSerializable.freeze`, so that their
+serialized form is cached. The frames are written to a local socket pair and read on the other end.
+
+    python -m benchmarks.bench_frozen
+"""
+
+import asyncio
+import time
+
+from oef.schema import Description, DataModel, AttributeSchema, serialization_cache_stats
+from benchmarks.common import print_table, read_frames, socket_pair_proxy
+
+N_MESSAGES = 2000
+N_ATTRIBUTES = 10
+N_PROPOSALS = [1, 10, 50]
+
+
+def _proposals(n: int, frozen: bool):
+    data_model = DataModel("weather", [AttributeSchema("attr_{}".format(i), float, True) for i in range(N_ATTRIBUTES)])
+    proposals = [Description({"attr_{}".format(i): i * j * 0.5 for i in range(N_ATTRIBUTES)}, data_model)
+                 for j in range(n)]
+    return [proposal.freeze() for proposal in proposals] if frozen else proposals
+
+
+def _run(loop, proxy, receiver, proposals) -> float:
+    start = time.perf_counter()
+    for dialogue_id in range(N_MESSAGES):
+        proxy.send_propose(1, dialogue_id, "buyer", 0, proposals)
+    loop.run_until_complete(read_frames(receiver, N_MESSAGES))
+    return N_MESSAGES / (time.perf_counter() - start)
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    proxy, receiver = loop.run_until_complete(socket_pair_proxy(loop))
+    rows = []
+    for n in N_PROPOSALS:
+        plain = _run(loop, proxy, receiver, _proposals(n, False))
+        serialization_cache_stats.reset()
+        frozen = _run(loop, proxy, receiver, _proposals(n, True))
+        rows.append([n, "{:.0f}".format(plain), "{:.0f}".format(frozen), "{:.1f}x".format(frozen / plain),
+                     "{:.4f}".format(serialization_cache_stats.hit_rate)])
+    proxy._transport.close()
+    receiver.transport.close()
+    loop.run_until_complete(asyncio.sleep(0))
+    loop.close()
+    print("{} proposals sent, with descriptions of {} attributes".format(N_MESSAGES, N_ATTRIBUTES))
+    print_table(["descriptions", "plain (msg/s)", "frozen (msg/s)", "speed-up", "cache hit rate"], rows)
+
+
+if __name__ == '__main__':
+    main()
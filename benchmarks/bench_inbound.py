@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the decoding of the incoming messages, for an agent that retains the messages it receives,
+e.g. to record them.
+
+For every message type, the frames are kept as parsed :class:`~oef.agent_pb2.Server.AgentMessage` objects,
+and as the inbound messages returned by :func:`~oef.messages.decode`. The table reports the time to decode
+a message and the memory retained per message. The Protobuf objects are allocated outside of the Python heap,
+so the memory is the growth of the resident set of a child process that decodes and retains the messages.
+The queries and the proposals are decoded lazily, so an inbound CFP or Propose keeps its Protobuf object alive,
+and is slightly larger than the Protobuf object alone.
+
+    python -m benchmarks.bench_inbound
+"""
+
+import multiprocessing
+import resource
+import time
+
+from oef import agent_pb2
+from oef.messages import InboundAccept, InboundCFP, InboundDialogueError, InboundMessageContent, InboundPropose, \
+    InboundSearchResult, decode
+from oef.query import Query, Constraint, Gt
+from oef.schema import Description
+from benchmarks.common import print_table
+
+N_MESSAGES = 100000
+
+_QUERY = Query([Constraint("attr_{}".format(i), Gt(i)) for i in range(10)])
+MESSAGES = [("search result", InboundSearchResult(1, ["agent_{}".format(i) for i in range(10)])),
+            ("dialogue error", InboundDialogueError(1, 2, "origin")),
+            ("content, 64 bytes", InboundMessageContent(1, 2, "origin", b"x" * 64)),
+            ("cfp, query", InboundCFP(1, 2, "origin", 3, _QUERY)),
+            ("propose, 1 description", InboundPropose(1, 2, "origin", 3, [Description({"price": 10})])),
+            ("accept", InboundAccept(1, 2, "origin", 3))]
+
+
+def _parse_pb(data: bytes) -> agent_pb2.Server.AgentMessage:
+    msg = agent_pb2.Server.AgentMessage()
+    msg.ParseFromString(data)
+    return msg
+
+
+DECODERS = {"protobuf": _parse_pb, "inbound": decode}
+
+
+def _retain(decoder: str, data: bytes, results) -> None:
+    """Decode the same frame many times, retaining the messages, and report the time and the memory growth."""
+    decode_ = DECODERS[decoder]
+    frames = [bytes(data) for _ in range(N_MESSAGES)]
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    messages = [decode_(frame) for frame in frames]
+    elapsed = time.perf_counter() - start
+    end_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed / len(messages), (end_rss - start_rss) * 1024 / len(messages)))
+
+
+def _run(decoder: str, data: bytes):
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_retain, args=(decoder, data, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    rows = []
+    for name, msg in MESSAGES:
+        data = msg.to_pb().SerializeToString()
+        pb_time, pb_memory = _run("protobuf", data)
+        inbound_time, inbound_memory = _run("inbound", data)
+        rows.append([name, "{:.2f}".format(pb_time * 1e6), "{:.2f}".format(inbound_time * 1e6),
+                     "{:.0f}".format(pb_memory), "{:.0f}".format(inbound_memory)])
+    print("{} messages decoded and retained, in a child process for every type and decoder".format(N_MESSAGES))
+    print_table(["type", "protobuf (us)", "inbound (us)", "protobuf (bytes/msg)", "inbound (bytes/msg)"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the interning of the data models, for many descriptions sharing the same data model.
+
+The descriptions are encoded with a plain data model, rebuilt into every Protobuf object, and with
+the interned one, whose serialized form is cached. They are decoded with a new data model for every
+description, as before, kept here as a reference, and with :func:`~oef.schema.Description.from_pb`,
+that returns the interned data model. The memory is the Python heap retained by the decoded descriptions,
+measured with :mod:`tracemalloc`.
+
+    python -m benchmarks.bench_interning
+"""
+
+import time
+import tracemalloc
+
+from oef.schema import AttributeSchema, DataModel, Description, data_model_registry
+from benchmarks.common import print_table
+
+N_DESCRIPTIONS = 10000
+
+ATTRIBUTES = [AttributeSchema(name, bool, True, "Provides {} measurements.".format(name))
+              for name in ("wind_speed", "temperature", "air_pressure", "humidity")]
+PLAIN_DATA_MODEL = DataModel("weather_data", ATTRIBUTES, "All possible weather data.")
+INTERNED_DATA_MODEL = data_model_registry.intern(DataModel("weather_data", ATTRIBUTES, "All possible weather data."))
+VALUES = [{"wind_speed": i % 2 == 0, "temperature": True, "air_pressure": i % 3 == 0, "humidity": False}
+          for i in range(N_DESCRIPTIONS)]
+
+
+def _legacy_from_pb(description_pb):
+    """The decoding used before, with a new data model for every description."""
+    values = {attr.key: Description._extract_value(attr.value) for attr in description_pb.values}
+    description = Description.trusted(values, DataModel._decode(description_pb.model))
+    description._check_consistency()
+    return description
+
+
+def _encode(data_model: DataModel):
+    descriptions = [Description.trusted(values, data_model) for values in VALUES]
+    start = time.perf_counter()
+    pbs = [description.to_pb() for description in descriptions]
+    return time.perf_counter() - start, pbs
+
+
+def _decode(from_pb, pbs):
+    start = time.perf_counter()
+    descriptions = [from_pb(pb) for pb in pbs]
+    elapsed = time.perf_counter() - start
+    del descriptions
+    tracemalloc.start()
+    descriptions = [from_pb(pb) for pb in pbs]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return elapsed, memory, len({id(description.data_model) for description in descriptions})
+
+
+def main():
+    plain_time, pbs = _encode(PLAIN_DATA_MODEL)
+    interned_time, _ = _encode(INTERNED_DATA_MODEL)
+    rows = [["encode", "plain", "{:.2f}".format(plain_time * 1e6 / N_DESCRIPTIONS), "-", "-"],
+            ["encode", "interned", "{:.2f}".format(interned_time * 1e6 / N_DESCRIPTIONS), "-", "-"]]
+    for name, from_pb in (("new data models", _legacy_from_pb), ("interned", Description.from_pb)):
+        elapsed, memory, n_data_models = _decode(from_pb, pbs)
+        rows.append(["decode", name, "{:.2f}".format(elapsed * 1e6 / N_DESCRIPTIONS),
+                     "{:.0f}".format(memory / N_DESCRIPTIONS), n_data_models])
+    print("{} descriptions sharing a data model with {} attributes".format(N_DESCRIPTIONS, len(ATTRIBUTES)))
+    print("registry: {}".format(data_model_registry.stats))
+    print_table(["operation", "data model", "per description (us)", "retained (bytes/description)",
+                 "data model instances"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the message throughput of :class:`~oef.proxy.OEFLocalProxy` and :class:`~oef.proxy.OEFNetworkProxy`
+(through an in-process fake OEF Node) on every event loop implementation available, see :mod:`oef.runtime`.
+
+    python -m benchmarks.bench_loops
+"""
+
+import asyncio
+import time
+
+from oef import runtime
+from oef.core import OEFProxy
+from oef.proxy import OEFLocalProxy, OEFNetworkProxy
+from benchmarks.common import print_table
+from test.common import FakeOEFNode
+
+N_MESSAGES = 20000
+BURST_SIZE = 100
+CONTENT = b"x" * 128
+
+
+async def _throughput(sender: OEFProxy, receiver: OEFProxy) -> float:
+    """Send messages in bursts from the sender to the receiver, and return the messages received per second."""
+    await sender.connect()
+    await receiver.connect()
+    start = time.perf_counter()
+    for burst in range(N_MESSAGES // BURST_SIZE):
+        for i in range(BURST_SIZE):
+            sender.send_message(i, burst, receiver.public_key, CONTENT)
+        received = 0
+        while received < BURST_SIZE:
+            received += len(await receiver._receive_many())
+    elapsed = time.perf_counter() - start
+    await sender.stop()
+    await receiver.stop()
+    return N_MESSAGES / elapsed
+
+
+def _local(loop) -> float:
+    with OEFLocalProxy.LocalNode(loop) as node:
+        sender = OEFLocalProxy("sender", node, loop=loop)
+        receiver = OEFLocalProxy("receiver", node, loop=loop)
+        throughput = loop.run_until_complete(_throughput(sender, receiver))
+    # let the node tasks process their cancellation.
+    loop.run_until_complete(asyncio.sleep(0))
+    return throughput
+
+
+def _network(loop) -> float:
+    with FakeOEFNode(loop) as node:
+        sender = OEFNetworkProxy("sender", node.addr, node.port, loop=loop)
+        receiver = OEFNetworkProxy("receiver", node.addr, node.port, loop=loop)
+        return loop.run_until_complete(_throughput(sender, receiver))
+
+
+def main():
+    rows = []
+    for implementation in runtime.available_loops():
+        for proxy, run in (("local", _local), ("network", _network)):
+            loop = runtime.new_event_loop(implementation)
+            asyncio.set_event_loop(loop)
+            rows.append([implementation, proxy, "{:.0f}".format(run(loop))])
+            loop.close()
+    print("{} messages of {} bytes, bursts of {}".format(N_MESSAGES, len(CONTENT), BURST_SIZE))
+    print_table(["loop", "proxy", "messages/s"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of a seller agent whose ``on_cfp`` handler does CPU-heavy pricing work.
+
+A buyer sends CFPs in many dialogues to the seller, which answers every one of them with a proposal.
+Meanwhile, a ticker on the same event loop measures how late it is woken up, i.e. how long the event loop
+is blocked. The pricing runs:
+
+* inline, in the event loop;
+* in a thread pool, with the handler decorated with :func:`~oef.offload.offload`;
+* in a process pool, with :func:`~oef.offload.Offloader.run`.
+
+    python -m benchmarks.bench_offload
+"""
+
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from oef.agents import LocalAgent
+from oef.messages import CFP_TYPES
+from oef.offload import offload
+from oef.proxy import OEFLocalProxy
+from oef.schema import Description
+from benchmarks.common import print_table
+
+N_CFPS = 64
+WORK = 200000
+TICK = 0.001
+WORKERS = os.cpu_count() or 1
+
+
+def compute_price(seed: int) -> int:
+    """The CPU-heavy pricing work."""
+    price = seed
+    for i in range(WORK):
+        price = (price * 31 + i) % 1000003
+    return price
+
+
+class _Buyer(LocalAgent):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.proposals = 0
+        self.done = None
+
+    def on_propose(self, msg_id, dialogue_id, origin, target, proposals):
+        self.proposals += 1
+        if self.proposals == N_CFPS:
+            self.done.set_result(None)
+
+    def on_message(self, *args): pass
+    def on_cfp(self, *args): pass
+    def on_accept(self, *args): pass
+    def on_decline(self, *args): pass
+    def on_search_result(self, *args): pass
+    def on_search_result_wide(self, *args): pass
+    def on_oef_error(self, *args): pass
+    def on_dialogue_error(self, *args): pass
+
+
+class _InlineSeller(_Buyer):
+
+    def on_cfp(self, msg_id: int, dialogue_id: int, origin: str, target: int, query: CFP_TYPES):
+        price = compute_price(dialogue_id)
+        self.send_propose(msg_id + 1, dialogue_id, origin, msg_id, [Description({"price": price})])
+
+
+class _ThreadSeller(_Buyer):
+
+    @offload
+    def on_cfp(self, msg_id: int, dialogue_id: int, origin: str, target: int, query: CFP_TYPES):
+        price = compute_price(dialogue_id)
+        self.send_propose(msg_id + 1, dialogue_id, origin, msg_id, [Description({"price": price})])
+
+
+class _ProcessSeller(_Buyer):
+
+    async def async_on_cfp(self, msg_id: int, dialogue_id: int, origin: str, target: int, query: CFP_TYPES):
+        price = await self.offloader.run(compute_price, dialogue_id)
+        self.send_propose(msg_id + 1, dialogue_id, origin, msg_id, [Description({"price": price})])
+
+
+async def _ticker(lags, stop):
+    """Sleep for one tick at a time, and record how late every wake-up is."""
+    while not stop.done():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+def _run(loop, seller_class, executor=None):
+    with OEFLocalProxy.LocalNode(loop) as node:
+        seller = seller_class("seller", node, loop=loop, max_concurrent_handlers=WORKERS, executor=executor)
+        buyer = _Buyer("buyer", node, loop=loop)
+        buyer.done = loop.create_future()
+        seller.connect()
+        buyer.connect()
+        asyncio.ensure_future(seller.async_run(), loop=loop)
+        asyncio.ensure_future(buyer.async_run(), loop=loop)
+        lags = []
+        ticker = asyncio.ensure_future(_ticker(lags, buyer.done), loop=loop)
+
+        seller.offload_stats.reset()
+        start = time.perf_counter()
+        for dialogue_id in range(N_CFPS):
+            buyer.send_cfp(0, dialogue_id, seller.public_key, 0, None)
+        loop.run_until_complete(buyer.done)
+        elapsed = time.perf_counter() - start
+        loop.run_until_complete(ticker)
+        stats = seller.offload_stats
+
+        seller.stop()
+        buyer.stop()
+        seller.disconnect()
+        buyer.disconnect()
+    loop.run_until_complete(asyncio.sleep(0.01))
+    return elapsed, lags, stats
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    rows = []
+    with ProcessPoolExecutor(max_workers=WORKERS) as processes:
+        for name, seller_class, executor in (("inline", _InlineSeller, None),
+                                             ("threads", _ThreadSeller, None),
+                                             ("processes", _ProcessSeller, processes)):
+            elapsed, lags, stats = _run(loop, seller_class, executor)
+            rows.append([name, "{:.0f}".format(N_CFPS / elapsed),
+                         "{:.2f}".format(statistics.median(lags) * 1e3) if lags else "-",
+                         "{:.2f}".format(max(lags) * 1e3) if lags else "-",
+                         "{:.2f}".format(stats.mean_wait * 1e3), "{:.2f}".format(stats.mean_run * 1e3),
+                         "{:.0f}%".format(stats.utilisation * 100)])
+    loop.close()
+    print("{} CFPs priced with {} iterations each, {} workers".format(N_CFPS, WORK, WORKERS))
+    print_table(["pricing", "CFPs/s", "median loop lag (ms)", "max loop lag (ms)",
+                 "mean wait (ms)", "mean run (ms)", "utilisation"], rows)
+
+
+if __name__ == '__main__':
+    main()
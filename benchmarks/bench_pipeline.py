@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the agent loop with and without a pipeline between the reader and the dispatcher stages.
+
+A sender streams simple messages through an in-process fake OEF Node to a receiver, whose handler spends
+some CPU time on every message. The table reports the throughput and, with the pipeline, where the time
+of each stage goes.
+
+    python -m benchmarks.bench_pipeline
+"""
+
+import asyncio
+import time
+
+from oef.agents import OEFAgent
+from oef.pipeline import PipelineOverflowPolicy
+from oef.proxy import OEFNetworkProxy
+from benchmarks.common import print_table
+from test.common import FakeOEFNode
+
+N_MESSAGES = 20000
+BURST_SIZE = 100
+CONTENT = b"x" * 1024
+HANDLER_WORK = 200
+CONFIGURATIONS = [("serial", None, PipelineOverflowPolicy.BLOCK),
+                  ("pipeline 64", 64, PipelineOverflowPolicy.BLOCK),
+                  ("pipeline 4096", 4096, PipelineOverflowPolicy.BLOCK),
+                  ("pipeline 64, drop", 64, PipelineOverflowPolicy.DROP_OLDEST)]
+
+
+class _Receiver(OEFAgent):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.received = 0
+        self.last = None
+
+    def on_message(self, msg_id, dialogue_id, origin, content):
+        total = 0
+        for i in range(HANDLER_WORK):
+            total += i
+        self.received += 1
+        self.last = msg_id
+
+    def on_cfp(self, *args): pass
+    def on_propose(self, *args): pass
+    def on_accept(self, *args): pass
+    def on_decline(self, *args): pass
+    def on_search_result(self, *args): pass
+    def on_search_result_wide(self, *args): pass
+    def on_oef_error(self, *args): pass
+    def on_dialogue_error(self, *args): pass
+
+
+async def _run(loop, node: FakeOEFNode, depth, policy):
+    sender = OEFNetworkProxy("sender", node.addr, node.port, loop=loop)
+    receiver = _Receiver("receiver", node.addr, node.port, loop=loop, pipeline_depth=depth, pipeline_policy=policy)
+    await sender.connect()
+    await receiver.async_connect()
+    task = asyncio.ensure_future(receiver.async_run(), loop=loop)
+
+    start = time.perf_counter()
+    for burst in range(N_MESSAGES // BURST_SIZE):
+        for i in range(BURST_SIZE):
+            sender.send_message(burst * BURST_SIZE + i, 0, "receiver", CONTENT)
+        await asyncio.sleep(0)
+    while receiver.last != N_MESSAGES - 1:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    stats = receiver._oef_proxy.pipeline_stats
+
+    receiver.stop()
+    await asyncio.wait([task])
+    await receiver.async_disconnect()
+    await sender.stop()
+    return receiver.received / elapsed, stats
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    rows = []
+    with FakeOEFNode(loop) as node:
+        for name, depth, policy in CONFIGURATIONS:
+            throughput, stats = loop.run_until_complete(_run(loop, node, depth, policy))
+            if stats is None:
+                rows.append([name, "{:.0f}".format(throughput)] + ["-"] * 6)
+                continue
+            rows.append([name, "{:.0f}".format(throughput), "{:.3f}".format(stats.read_time),
+                         "{:.3f}".format(stats.blocked_time), "{:.3f}".format(stats.idle_time),
+                         "{:.3f}".format(stats.dispatch_time), "{:.2f}".format(stats.mean_queue_latency * 1e3),
+                         "{}/{}".format(stats.peak_depth, stats.dropped)])
+    loop.run_until_complete(asyncio.sleep(0))
+    loop.close()
+    print("{} messages of {} bytes, sent in bursts of {}".format(N_MESSAGES, len(CONTENT), BURST_SIZE))
+    print_table(["loop", "messages/s", "read (s)", "blocked (s)", "idle (s)", "dispatch (s)",
+                 "queue latency (ms)", "peak depth/dropped"], rows)
+
+
+if __name__ == '__main__':
+    main()
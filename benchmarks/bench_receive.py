@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the frame reassembly in :class:`~oef.transport.OEFProtocol`, used by :class:`~oef.proxy.OEFNetworkProxy`.
+
+Frames from 1 KB to 64 MB are delivered to the proxy in 64 KB chunks, one chunk per event loop
+iteration, as it happens with a real socket. The per-byte cost of the current implementation should
+stay flat across sizes, while the former ``data += read(...)`` loop grows linearly with the frame size
+(i.e. the total cost is quadratic). The former implementation is skipped above 16 MB.
+
+    python -m benchmarks.bench_receive
+"""
+
+import asyncio
+import struct
+import time
+
+from oef.transport import OEFProtocol
+from benchmarks.common import print_table, human_size
+
+CHUNK_SIZE = 64 * 1024
+SIZES = [2 ** 10 * 4 ** i for i in range(9)]  # 1 KB ... 64 MB
+LEGACY_MAX_SIZE = 16 * 2 ** 20
+
+
+async def _legacy_receive(reader: asyncio.StreamReader) -> bytes:
+    """The frame reassembly loop used before, kept here as a reference."""
+    nbytes = struct.unpack("I", await reader.read(4))[0]
+    data = b""
+    while len(data) < nbytes:
+        data += await reader.read(nbytes - len(data))
+    return data
+
+
+async def _feed(receiver, frame: bytes) -> None:
+    view = memoryview(frame)
+    for start in range(0, len(frame), CHUNK_SIZE):
+        if isinstance(receiver, asyncio.StreamReader):
+            receiver.feed_data(view[start:start + CHUNK_SIZE])
+        else:
+            receiver.data_received(view[start:start + CHUNK_SIZE])
+        await asyncio.sleep(0)
+
+
+async def _measure(loop, size: int, legacy: bool) -> float:
+    body = b"x" * size
+    frame = struct.pack("I", size) + body
+    if legacy:
+        receiver = asyncio.StreamReader(limit=2 ** 31)
+        receive = _legacy_receive(receiver)
+    else:
+        receiver = OEFProtocol(loop)
+        receive = receiver.receive()
+
+    feeder = asyncio.ensure_future(_feed(receiver, frame))
+    start = time.perf_counter()
+    data = await receive
+    elapsed = time.perf_counter() - start
+    await feeder
+    assert len(data) == size
+    return elapsed
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    rows = []
+    for size in SIZES:
+        current = loop.run_until_complete(_measure(loop, size, legacy=False))
+        if size <= LEGACY_MAX_SIZE:
+            legacy = loop.run_until_complete(_measure(loop, size, legacy=True))
+            legacy_ns = "{:.3f}".format(legacy / size * 1e9)
+        else:
+            legacy_ns = "skipped"
+        rows.append([human_size(size), "{:.3f}".format(current / size * 1e9), legacy_ns])
+    loop.close()
+    print_table(["frame size", "ns/byte (OEFProtocol)", "ns/byte (data += read)"], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the write path of :class:`~oef.proxy.OEFNetworkProxy`.
+
+A burst of small FIPA messages (``send_accept``) is sent over a local socket pair, and the number of
+``send``/``sendmsg`` system calls issued by the transport is counted, together with the throughput.
+The modes compared are:
+
+* ``two writes``: a write for the length prefix and one for the body, as it was done before;
+* ``writelines``: one call per frame (the default);
+* ``batched``: frames queued and flushed once per event loop iteration (``batch_writes=True``);
+* ``corked``: the whole burst sent inside ``proxy.cork()``.
+
+    python -m benchmarks.bench_send
+"""
+
+import asyncio
+import contextlib
+import socket
+import time
+
+from oef.proxy import OEFNetworkProxy
+from oef.transport import OEFProtocol, _HEADER
+from benchmarks.common import print_table
+
+N_MESSAGES = 20000
+BURST_SIZE = 100
+
+
+class _CountingSocket(socket.socket):
+    """A socket that counts the system calls used to send data."""
+
+    syscalls = 0
+
+    def send(self, *args, **kwargs):
+        _CountingSocket.syscalls += 1
+        return super().send(*args, **kwargs)
+
+    def sendmsg(self, *args, **kwargs):
+        _CountingSocket.syscalls += 1
+        return super().sendmsg(*args, **kwargs)
+
+
+class _TwoWritesProtocol(OEFProtocol):
+    """The write path used before: the length prefix and the body are written separately."""
+
+    def write_frame(self, data: bytes) -> None:
+        self.transport.write(_HEADER.pack(len(data)))
+        self.transport.write(data)
+
+
+async def _run(loop, mode: str):
+    left, right = socket.socketpair()
+    left = _CountingSocket(fileno=left.detach())
+    left.setblocking(False)
+    right.setblocking(False)
+
+    protocol_class = _TwoWritesProtocol if mode == "two writes" else OEFProtocol
+    transport, protocol = await loop.create_connection(lambda: protocol_class(loop, mode == "batched"), sock=left)
+    _, receiver = await loop.create_connection(lambda: OEFProtocol(loop), sock=right)
+
+    proxy = OEFNetworkProxy("bench", "127.0.0.1", loop=loop)
+    proxy._connection = (transport, protocol)
+    proxy._transport, proxy._protocol = transport, protocol
+
+    _CountingSocket.syscalls = 0
+    received = 0
+    start = time.perf_counter()
+    for burst in range(N_MESSAGES // BURST_SIZE):
+        cork = proxy.cork() if mode == "corked" else contextlib.ExitStack()
+        with cork:
+            for i in range(BURST_SIZE):
+                proxy.send_accept(i, burst, "destination", i)
+        # let the event loop run, as an agent would do between two bursts.
+        await asyncio.sleep(0)
+        while receiver._frames:
+            received += len(await receiver.receive_many())
+    while received < N_MESSAGES:
+        received += len(await receiver.receive_many())
+    elapsed = time.perf_counter() - start
+
+    transport.close()
+    receiver.transport.close()
+    return _CountingSocket.syscalls, N_MESSAGES / elapsed
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    rows = []
+    for mode in ("two writes", "writelines", "batched", "corked"):
+        syscalls, throughput = loop.run_until_complete(_run(loop, mode))
+        rows.append([mode, syscalls, "{:.0f}".format(throughput)])
+    loop.close()
+    print("{} messages sent in bursts of {}".format(N_MESSAGES, BURST_SIZE))
+    print_table(["mode", "send syscalls", "messages/s"], rows)
+
+
+if __name__ == '__main__':
+    main()
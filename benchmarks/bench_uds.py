@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of :class:`~oef.proxy.OEFNetworkProxy` over loopback TCP and over a Unix domain socket.
+
+Two proxies connect to an in-process fake OEF Node, and exchange ``send_message`` round trips:
+
+* latency: one message at a time, each one answered before sending the next;
+* throughput: bursts of messages, answered in bursts.
+
+    python -m benchmarks.bench_uds
+"""
+
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from oef.proxy import OEFNetworkProxy
+from benchmarks.common import print_table
+from test.common import FakeOEFNode
+
+N_ROUND_TRIPS = 2000
+BURST_SIZE = 100
+CONTENT = b"x" * 128
+
+
+async def _exchange(sender: OEFNetworkProxy, receiver: OEFNetworkProxy, n: int) -> None:
+    """Send ``n`` messages from the sender, answer all of them from the receiver, and wait for the answers."""
+    for i in range(n):
+        sender.send_message(i, 0, receiver.public_key, CONTENT)
+    received = 0
+    while received < n:
+        received += len(await receiver._receive_many())
+    for i in range(n):
+        receiver.send_message(i, 0, sender.public_key, CONTENT)
+    received = 0
+    while received < n:
+        received += len(await sender._receive_many())
+
+
+async def _run(loop, node: FakeOEFNode):
+    sender = OEFNetworkProxy("sender", node.addr, node.port, loop=loop)
+    receiver = OEFNetworkProxy("receiver", node.addr, node.port, loop=loop)
+    await sender.connect()
+    await receiver.connect()
+
+    latencies = []
+    for _ in range(N_ROUND_TRIPS):
+        start = time.perf_counter()
+        await _exchange(sender, receiver, 1)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(N_ROUND_TRIPS // BURST_SIZE):
+        await _exchange(sender, receiver, BURST_SIZE)
+    throughput = N_ROUND_TRIPS / (time.perf_counter() - start)
+
+    await sender.stop()
+    await receiver.stop()
+    return statistics.median(latencies), throughput
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for transport, path in (("tcp", None), ("uds", os.path.join(tmp_dir, "oef.sock"))):
+            with FakeOEFNode(loop, path=path) as node:
+                latency, throughput = loop.run_until_complete(_run(loop, node))
+            rows.append([transport, "{:.1f}".format(latency * 1e6), "{:.0f}".format(throughput)])
+    loop.close()
+    print("{} round trips of {} bytes, bursts of {}".format(N_ROUND_TRIPS, len(CONTENT), BURST_SIZE))
+    print_table(["transport", "median latency (us)", "round trips/s"], rows)
+
+
+if __name__ == '__main__':
+    main()
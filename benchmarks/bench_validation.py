@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Benchmark of the validation of the values of a description against its data model.
+
+For data models of several sizes, a valid description is checked with the list scans used before,
+kept here as a reference, and with :func:`~oef.schema.DataModel.validate`, whose sets and types
+are computed once, when the data model is created.
+
+    python -m benchmarks.bench_validation
+"""
+
+import time
+
+from oef.schema import ATTRIBUTE_TYPES, AttributeInconsistencyException, AttributeSchema, DataModel, Description
+from benchmarks.common import print_table
+
+N_ATTRIBUTES = [5, 50, 500]
+N_CHECKS = 2000000
+REPEAT = 3
+
+
+def _legacy_check_consistency(data_model: DataModel, values) -> None:  # noqa: C901
+    """The validation used before, kept here as a reference."""
+    required_attributes = [s.name for s in data_model.attribute_schemas if s.required]
+    if not all(a in values for a in required_attributes):
+        raise AttributeInconsistencyException("Missing required attribute.")
+    all_schema_attributes = [s.name for s in data_model.attribute_schemas]
+    if not all(k in all_schema_attributes for k in values):
+        raise AttributeInconsistencyException("Have extra attribute not in schema")
+    for schema in data_model.attribute_schemas:
+        if schema.name in values:
+            if type(values[schema.name]) != schema.type:
+                raise AttributeInconsistencyException(
+                    "Attribute {} has incorrect type: {}".format(schema.name, schema.type))
+            elif not isinstance(values[schema.name], ATTRIBUTE_TYPES.__args__):
+                raise AttributeInconsistencyException("Attribute {} has unallowed type".format(schema.name))
+
+
+def _measure(check, data_model: DataModel, values, n: int) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(n):
+            check(data_model, values)
+        best = min(best, time.perf_counter() - start)
+    return best / n
+
+
+def main():
+    rows = []
+    for n_attributes in N_ATTRIBUTES:
+        # every other attribute is optional, and half of the optional ones are left out.
+        data_model = DataModel("bench", [AttributeSchema("attr_{:03}".format(i), (int, str, float)[i % 3], i % 2 == 0)
+                                         for i in range(n_attributes)])
+        values = {"attr_{:03}".format(i): (i, str(i), float(i))[i % 3] for i in range(n_attributes) if i % 4 != 1}
+        description = Description(values, data_model)
+        # the legacy scans are quadratic, so they are timed on fewer checks for the larger data models.
+        n = N_CHECKS // n_attributes ** 2 + 1
+        before = _measure(_legacy_check_consistency, data_model, description.values, n)
+        after = _measure(DataModel.validate, data_model, description.values, N_CHECKS // n_attributes)
+        rows.append([n_attributes, len(values), "{:.2f}".format(before * 1e6), "{:.2f}".format(after * 1e6),
+                     "{:.1f}x".format(before / after)])
+    print("Validation of a valid description, best of {} runs".format(REPEAT))
+    print_table(["attributes", "values", "list scans (us)", "validate (us)", "speed-up"], rows)
+
+
+if __name__ == '__main__':
+    main()
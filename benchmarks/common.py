@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Shared helpers for the benchmark scripts.
+
+Every benchmark is a plain script, to be run from the root of the repository, e.g.::
+
+    python -m benchmarks.bench_receive
+
+"""
+
+import asyncio
+import socket
+import time
+from typing import Callable, List, Sequence, Tuple
+
+from oef.proxy import OEFNetworkProxy
+from oef.transport import OEFProtocol
+
+
+def timeit(fn: Callable[[], None], repeat: int = 5) -> float:
+    """
+    Run a function several times and return the best wall-clock time.
+
+    :param fn: the function to measure.
+    :param repeat: how many times the function is run.
+    :return: the best time, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_table(header: Sequence[str], rows: List[Sequence]) -> None:
+    """
+    Print a list of rows as a left-aligned text table.
+
+    :param header: the column names.
+    :param rows: the rows of the table. Each value is converted with ``str``.
+    :return: ``None``
+    """
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max(len(str(h)), *(len(row[i]) for row in rows)) if rows else len(str(h))
+              for i, h in enumerate(header)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(header, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(value.ljust(w) for value, w in zip(row, widths)))
+
+
+def human_size(nbytes: int) -> str:
+    """
+    Format a number of bytes, e.g. ``human_size(2048) == "2 KB"``.
+
+    :param nbytes: the number of bytes.
+    :return: the formatted size.
+    """
+    for unit in ("B", "KB", "MB"):
+        if nbytes < 1024 or unit == "MB":
+            return "{} {}".format(nbytes, unit)
+        nbytes //= 1024
+
+
+async def socket_pair_proxy(loop: asyncio.AbstractEventLoop) -> Tuple[OEFNetworkProxy, OEFProtocol]:
+    """
+    Connect a network proxy to a local socket pair, without an OEF Node.
+
+    :param loop: the event loop.
+    :return: the proxy, and the protocol that reads the frames it sends.
+    """
+    left, right = socket.socketpair()
+    left.setblocking(False)
+    right.setblocking(False)
+    transport, protocol = await loop.create_connection(lambda: OEFProtocol(loop), sock=left)
+    _, receiver = await loop.create_connection(lambda: OEFProtocol(loop), sock=right)
+    proxy = OEFNetworkProxy("bench", "127.0.0.1", loop=loop)
+    proxy._connection = (transport, protocol)
+    proxy._transport, proxy._protocol = transport, protocol
+    return proxy, receiver
+
+
+async def read_frames(receiver: OEFProtocol, n_frames: int) -> None:
+    """
+    Read a number of frames.
+
+    :param receiver: the protocol that reads the frames.
+    :param n_frames: the number of frames.
+    :return: ``None``
+    """
+    received = 0
+    while received < n_frames:
+        received += len(await receiver.receive_many())
@@ -21,7 +21,7 @@ import json
 import pprint
 from typing import List, Optional, Callable
 
-from oef.proxy import OEFNetworkProxy, OEFProxy
+from oef.proxy import OEFNetworkProxy, OEFProxy, connect_many
 
 from oef.dialogue import SingleDialogue, DialogueAgent, GroupDialogues
 from oef.query import Query, Constraint, Eq
@@ -179,8 +179,10 @@ if __name__ == '__main__':
                                        oef_addr="127.0.0.1", port=3333) for i in range(N)]
 
     stations = [WeatherStation(station_proxy, random.randint(10, 50)) for station_proxy in station_proxies]
+    # run the handshakes of all the stations concurrently
+    stats = asyncio.get_event_loop().run_until_complete(connect_many(station_proxies))
+    print(stats)
     for station in stations:
-        station.connect()
         station.register_service(0, station.weather_service_description)
 
     query = Query([
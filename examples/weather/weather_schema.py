@@ -24,7 +24,7 @@
 This module defines the attributes and the data model used by the weather example.
 """
 
-from oef.schema import DataModel, AttributeSchema
+from oef.schema import DataModel, AttributeSchema, data_model_registry
 
 WIND_SPEED_ATTR = AttributeSchema("wind_speed",
                                   bool,
@@ -47,6 +47,8 @@ HUMIDITY_ATTR = AttributeSchema("humidity",
                                 attribute_description="Provides humidity measurements.")
 
 
-WEATHER_DATA_MODEL = DataModel("weather_data",
-                               [WIND_SPEED_ATTR, TEMPERATURE_ATTR, AIR_PRESSURE_ATTR, HUMIDITY_ATTR],
-                               "All possible weather data.")
+# interned, so that it is shared with the data models received from the other agents, and serialized only once.
+WEATHER_DATA_MODEL = data_model_registry.intern(DataModel("weather_data",
+                                                          [WIND_SPEED_ATTR, TEMPERATURE_ATTR, AIR_PRESSURE_ATTR,
+                                                           HUMIDITY_ATTR],
+                                                          "All possible weather data."))
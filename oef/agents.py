@@ -31,11 +31,16 @@ import asyncio
 
 import logging
 from abc import ABC
-from typing import List, Optional
-
-from oef.core import OEFProxy, AgentInterface
-from oef.messages import OEFErrorOperation
-from oef.proxy import OEFNetworkProxy, PROPOSE_TYPES, CFP_TYPES, OEFLocalProxy, OEFConnectionError
+from concurrent.futures import Executor
+from typing import List, Optional, Tuple
+
+from oef.chunking import DEFAULT_CHUNK_SIZE, DEFAULT_MAX_CONTENT_SIZE
+from oef.core import OEFProxy, AgentInterface, DEFAULT_MAX_BATCH_SIZE
+from oef.messages import OEFErrorOperation, RECIPIENTS_TYPES
+from oef.offload import Offloader, OffloadStats
+from oef.pipeline import PipelineOverflowPolicy
+from oef.proxy import OEFNetworkProxy, PROPOSE_TYPES, CFP_TYPES, OEFLocalProxy, OEFConnectionError, OverflowPolicy, \
+    ReconnectPolicy, SocketOptions, DEFAULT_READ_BUFFER_LIMITS
 from oef.query import Query, SearchResultItem
 from oef.schema import Description
 
@@ -71,16 +76,24 @@ class Agent(AgentInterface, ABC):
         """
         return self._oef_proxy.public_key
 
-    def __init__(self, oef_proxy: OEFProxy):
+    def __init__(self, oef_proxy: OEFProxy, executor: Optional[Executor] = None):
         """
         Initialize the OEF Agent.
 
         :param oef_proxy: the proxy for an OEF Node.
+        :param executor: the executor of the handlers decorated with :func:`~oef.offload.offload`.
+                       | If ``None``, a thread pool is created when first needed.
         """
 
         self._oef_proxy = oef_proxy
         self._loop = self._oef_proxy._loop
         self._task = None
+        self.offloader = Offloader(executor, loop=self._loop)
+
+    @property
+    def offload_stats(self) -> OffloadStats:
+        """The latency and utilisation metrics of the handlers run in the executor of the agent."""
+        return self.offloader.stats
 
     def run(self) -> None:
         """
@@ -116,6 +129,7 @@ class Agent(AgentInterface, ABC):
         if self._task:
             self._task.cancel()
             self._task = None
+        self.offloader.close()
 
     def connect(self) -> bool:
         """
@@ -158,62 +172,147 @@ class Agent(AgentInterface, ABC):
 
     def register_agent(self, msg_id: int, agent_description: Description) -> None:
         """Register an agent. See :func:`~oef.core.OEFCoreInterface.register_agent`."""
-        self._oef_proxy.register_agent(msg_id, agent_description)
+        self.offloader.call_in_loop(self._oef_proxy.register_agent, msg_id, agent_description)
 
     def unregister_agent(self, msg_id: int) -> None:
         """Unregister an agent. See :func:`~oef.core.OEFCoreInterface.unregister_agent`."""
-        self._oef_proxy.unregister_agent(msg_id)
+        self.offloader.call_in_loop(self._oef_proxy.unregister_agent, msg_id)
 
     def register_service(self, msg_id: int, service_description: Description) -> None:
         """Unregister a service. See :func:`~oef.core.OEFCoreInterface.register_service`."""
-        self._oef_proxy.register_service(msg_id, service_description)
+        self.offloader.call_in_loop(self._oef_proxy.register_service, msg_id, service_description)
 
     def unregister_service(self, msg_id: int, service_description: Description) -> None:
         """Unregister a service. See :func:`~oef.core.OEFCoreInterface.unregister_service`."""
-        self._oef_proxy.unregister_service(msg_id, service_description)
+        self.offloader.call_in_loop(self._oef_proxy.unregister_service, msg_id, service_description)
 
     def search_agents(self, search_id: int, query: Query) -> None:
         """Search agents. See :func:`~oef.core.OEFCoreInterface.search_agents`."""
-        self._oef_proxy.search_agents(search_id, query)
+        self.offloader.call_in_loop(self._oef_proxy.search_agents, search_id, query)
 
     def search_services(self, search_id: int, query: Query) -> None:
         """Search services. See :func:`~oef.core.OEFCoreInterface.search_services`."""
-        self._oef_proxy.search_services(search_id, query)
+        self.offloader.call_in_loop(self._oef_proxy.search_services, search_id, query)
 
     def search_services_wide(self, search_id: int, query: Query) -> None:
         """Search services widely. See :func:`~oef.core.OEFCoreInterface.search_services_wide`."""
-        self._oef_proxy.search_services_wide(search_id, query)
+        self.offloader.call_in_loop(self._oef_proxy.search_services_wide, search_id, query)
 
     def send_message(self, msg_id: int, dialogue_id: int, destination: str, msg: bytes) -> None:
         """Send a simple message. See :func:`~oef.core.OEFCoreInterface.send_message`."""
         logger.debug("Agent {}: msg_id={}, dialogue_id={}, destination={}, msg={}"
                      .format(self.public_key, msg_id, dialogue_id, destination, msg))
-        self._oef_proxy.send_message(msg_id, dialogue_id, destination, msg)
+        self.offloader.call_in_loop(self._oef_proxy.send_message, msg_id, dialogue_id, destination, msg)
+
+    def send_message_chunked(self, msg_id: int, dialogue_id: int, destination: str, msg: bytes,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """Send a large content in chunks. See :func:`~oef.core.OEFProxy.send_message_chunked`."""
+        logger.debug("Agent {}: msg_id={}, dialogue_id={}, destination={}, chunked msg of {} bytes"
+                     .format(self.public_key, msg_id, dialogue_id, destination, len(msg)))
+        self.offloader.call_in_loop(self._oef_proxy.send_message_chunked, msg_id, dialogue_id, destination, msg, chunk_size)
 
     def send_cfp(self, msg_id: int, dialogue_id: int, destination: str, target: int, query: CFP_TYPES) -> None:
         """Send a CFP. See :func:`~oef.core.OEFCoreInterface.send_cfp`."""
         logger.debug("Agent {}: msg_id={}, dialogue_id={}, destination={}, target={}, query={}"
                      .format(self.public_key, dialogue_id, destination, query, msg_id, target))
-        self._oef_proxy.send_cfp(msg_id, dialogue_id, destination, target, query)
+        self.offloader.call_in_loop(self._oef_proxy.send_cfp, msg_id, dialogue_id, destination, target, query)
 
     def send_propose(self, msg_id: int, dialogue_id: int, destination: str, target: int,
                      proposals: PROPOSE_TYPES) -> None:
         """Send a Propose. See :func:`~oef.core.OEFCoreInterface.send_propose`."""
         logger.debug("Agent {}: msg_id={}, dialogue_id={}, destination={}, target={}, proposals={}"
                      .format(self.public_key, msg_id, dialogue_id, destination, target, proposals))
-        self._oef_proxy.send_propose(msg_id, dialogue_id, destination, target, proposals)
+        self.offloader.call_in_loop(self._oef_proxy.send_propose, msg_id, dialogue_id, destination, target, proposals)
+
+    def send_cfp_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int, query: CFP_TYPES) -> None:
+        """Send a CFP in many dialogues. See :func:`~oef.core.OEFCoreInterface.send_cfp_many`."""
+        logger.debug("Agent {}: msg_id={}, recipients={}, target={}, query={}"
+                     .format(self.public_key, msg_id, len(recipients), target, query))
+        self.offloader.call_in_loop(self._oef_proxy.send_cfp_many, msg_id, recipients, target, query)
+
+    def send_propose_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int,
+                          proposals: PROPOSE_TYPES) -> None:
+        """Send a Propose in many dialogues. See :func:`~oef.core.OEFCoreInterface.send_propose_many`."""
+        logger.debug("Agent {}: msg_id={}, recipients={}, target={}, proposals={}"
+                     .format(self.public_key, msg_id, len(recipients), target, proposals))
+        self.offloader.call_in_loop(self._oef_proxy.send_propose_many, msg_id, recipients, target, proposals)
 
     def send_accept(self, msg_id: int, dialogue_id: int, destination: str, target: int) -> None:
         """Send an Accept. See :func:`~oef.core.OEFCoreInterface.send_accept`."""
         logger.debug("Agent {}: dialogue_id={}, destination={}, msg_id={}, target={}"
                      .format(self.public_key, msg_id, dialogue_id, destination, target))
-        self._oef_proxy.send_accept(msg_id, dialogue_id, destination, target)
+        self.offloader.call_in_loop(self._oef_proxy.send_accept, msg_id, dialogue_id, destination, target)
 
     def send_decline(self, msg_id: int, dialogue_id: int, destination: str, target: int) -> None:
         """Send a Decline. See :func:`~oef.core.OEFCoreInterface.send_decline`."""
         logger.debug("Agent {}: dialogue_id={}, destination={}, msg_id={}, target={}"
                      .format(self.public_key, msg_id, dialogue_id, destination, target))
-        self._oef_proxy.send_decline(msg_id, dialogue_id, destination, target)
+        self.offloader.call_in_loop(self._oef_proxy.send_decline, msg_id, dialogue_id, destination, target)
+
+    async def async_register_agent(self, msg_id: int, agent_description: Description) -> None:
+        """Register an agent, waiting for the write buffer. See :func:`~oef.core.OEFProxy.async_register_agent`."""
+        await self._oef_proxy.async_register_agent(msg_id, agent_description)
+
+    async def async_unregister_agent(self, msg_id: int) -> None:
+        """Unregister an agent, waiting for the write buffer. See :func:`~oef.core.OEFProxy.async_unregister_agent`."""
+        await self._oef_proxy.async_unregister_agent(msg_id)
+
+    async def async_register_service(self, msg_id: int, service_description: Description) -> None:
+        """Register a service, waiting for the write buffer. See :func:`~oef.core.OEFProxy.async_register_service`."""
+        await self._oef_proxy.async_register_service(msg_id, service_description)
+
+    async def async_unregister_service(self, msg_id: int, service_description: Description) -> None:
+        """Unregister a service, waiting for the write buffer.
+        See :func:`~oef.core.OEFProxy.async_unregister_service`."""
+        await self._oef_proxy.async_unregister_service(msg_id, service_description)
+
+    async def async_search_agents(self, search_id: int, query: Query) -> None:
+        """Search agents, waiting for the write buffer. See :func:`~oef.core.OEFProxy.async_search_agents`."""
+        await self._oef_proxy.async_search_agents(search_id, query)
+
+    async def async_search_services(self, search_id: int, query: Query) -> None:
+        """Search services, waiting for the write buffer. See :func:`~oef.core.OEFProxy.async_search_services`."""
+        await self._oef_proxy.async_search_services(search_id, query)
+
+    async def async_search_services_wide(self, search_id: int, query: Query) -> None:
+        """Search services widely, waiting for the write buffer.
+        See :func:`~oef.core.OEFProxy.async_search_services_wide`."""
+        await self._oef_proxy.async_search_services_wide(search_id, query)
+
+    async def async_send_message(self, msg_id: int, dialogue_id: int, destination: str, msg: bytes) -> None:
+        """Send a simple message, waiting for the write buffer. See :func:`~oef.core.OEFProxy.async_send_message`."""
+        await self._oef_proxy.async_send_message(msg_id, dialogue_id, destination, msg)
+
+    async def async_send_cfp(self, msg_id: int, dialogue_id: int, destination: str, target: int,
+                             query: CFP_TYPES) -> None:
+        """Send a CFP, waiting for the write buffer. See :func:`~oef.core.OEFProxy.async_send_cfp`."""
+        await self._oef_proxy.async_send_cfp(msg_id, dialogue_id, destination, target, query)
+
+    async def async_send_propose(self, msg_id: int, dialogue_id: int, destination: str, target: int,
+                                 proposals: PROPOSE_TYPES) -> None:
+        """Send a Propose, waiting for the write buffer. See :func:`~oef.core.OEFProxy.async_send_propose`."""
+        await self._oef_proxy.async_send_propose(msg_id, dialogue_id, destination, target, proposals)
+
+    async def async_send_cfp_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int,
+                                  query: CFP_TYPES) -> None:
+        """Send a CFP in many dialogues, waiting for the write buffer. See :func:`~oef.core.OEFProxy.async_send_cfp_many`."""
+        await self._oef_proxy.async_send_cfp_many(msg_id, recipients, target, query)
+
+    async def async_send_propose_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int,
+                                      proposals: PROPOSE_TYPES) -> None:
+        """
+        Send a Propose in many dialogues, waiting for the write buffer.
+        See :func:`~oef.core.OEFProxy.async_send_propose_many`.
+        """
+        await self._oef_proxy.async_send_propose_many(msg_id, recipients, target, proposals)
+
+    async def async_send_accept(self, msg_id: int, dialogue_id: int, destination: str, target: int) -> None:
+        """Send an Accept, waiting for the write buffer. See :func:`~oef.core.OEFProxy.async_send_accept`."""
+        await self._oef_proxy.async_send_accept(msg_id, dialogue_id, destination, target)
+
+    async def async_send_decline(self, msg_id: int, dialogue_id: int, destination: str, target: int) -> None:
+        """Send a Decline, waiting for the write buffer. See :func:`~oef.core.OEFProxy.async_send_decline`."""
+        await self._oef_proxy.async_send_decline(msg_id, dialogue_id, destination, target)
 
     def on_message(self, msg_id: int, dialogue_id: int, origin: str, content: bytes):
         logger.debug("on_message: msg_id={}, dialogue_id={}, origin={}, content={}"
@@ -266,18 +365,73 @@ class OEFAgent(Agent):
     """
 
     def __init__(self, public_key: str, oef_addr: str, oef_port: int = 3333,
-                 loop: Optional[asyncio.AbstractEventLoop] = None):
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 batch_writes: bool = False,
+                 write_buffer_limits: Optional[Tuple[int, int]] = None,
+                 read_buffer_limits: Optional[Tuple[int, int]] = DEFAULT_READ_BUFFER_LIMITS,
+                 overflow_policy: Optional[OverflowPolicy] = None,
+                 reconnect_policy: Optional[ReconnectPolicy] = None,
+                 socket_options: Optional[SocketOptions] = None,
+                 max_frame_size: Optional[int] = None,
+                 max_concurrent_handlers: Optional[int] = None,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_linger: float = 0.0,
+                 pipeline_depth: Optional[int] = None,
+                 pipeline_policy: PipelineOverflowPolicy = PipelineOverflowPolicy.BLOCK,
+                 max_content_size: Optional[int] = DEFAULT_MAX_CONTENT_SIZE,
+                 executor: Optional[Executor] = None):
         """
         Initialize an OEF network agent.
 
         :param public_key: the public key (identifier) of the agent
-        :param oef_addr: the IP address of the OEF Node.
+        :param oef_addr: the IP address of the OEF Node, or ``unix://<path>`` for a Unix domain socket.
         :param oef_port: the port for the connection.
         :param loop: the event loop.
+        :param batch_writes: whether the messages sent during one iteration of the event loop are written together.
+        :param write_buffer_limits: the high-water and low-water marks (in bytes) of the write buffer.
+        :param read_buffer_limits: the high-water and low-water marks (in bytes) of the messages received
+                                 | but not handled yet, above which the agent stops reading from the connection.
+        :param overflow_policy: what the send methods do when the write buffer is above its high-water mark.
+        :param reconnect_policy: how to reconnect automatically when the connection drops.
+                               | If ``None``, the agent does not reconnect.
+        :param socket_options: the options to set on the socket (``TCP_NODELAY``, buffer sizes, keepalive).
+        :param max_frame_size: the maximum size (in bytes) of a message, sent or received.
+        :param max_concurrent_handlers: the maximum number of message handlers running concurrently.
+                                      | The messages of the same dialogue are always handled in order.
+        :param max_batch_size: the maximum number of simple messages delivered in a batch to
+                             | :attr:`~oef.core.DialogueInterface.on_message_batch`, if implemented.
+        :param max_linger: how long (in seconds) a batch waits for more messages before being delivered.
+        :param pipeline_depth: if provided, the maximum number of frames read from the connection
+                             | while the handlers run, and queued for them.
+        :param pipeline_policy: what to do with the frames read when the queue is full.
+        :param max_content_size: the maximum size (in bytes) of a content received in chunks.
+        :param executor: the executor of the handlers decorated with :func:`~oef.offload.offload`.
         """
         self._oef_addr = oef_addr
         self._oef_port = oef_port
-        super().__init__(OEFNetworkProxy(public_key, str(self._oef_addr), self._oef_port, loop=loop))
+        super().__init__(OEFNetworkProxy(public_key, str(self._oef_addr), self._oef_port, loop=loop,
+                                         batch_writes=batch_writes,
+                                         write_buffer_limits=write_buffer_limits,
+                                         read_buffer_limits=read_buffer_limits,
+                                         overflow_policy=overflow_policy,
+                                         reconnect_policy=reconnect_policy,
+                                         socket_options=socket_options,
+                                         max_frame_size=max_frame_size,
+                                         max_concurrent_handlers=max_concurrent_handlers,
+                                         max_batch_size=max_batch_size,
+                                         max_linger=max_linger,
+                                         pipeline_depth=pipeline_depth,
+                                         pipeline_policy=pipeline_policy,
+                                         max_content_size=max_content_size),
+                         executor=executor)
+
+    def flush(self) -> None:
+        """Write the pending messages immediately. See :func:`~oef.proxy.OEFNetworkProxy.flush`."""
+        self._oef_proxy.flush()
+
+    def cork(self):
+        """Hold back the messages sent inside a block. See :func:`~oef.proxy.OEFNetworkProxy.cork`."""
+        return self._oef_proxy.cork()
 
 
 class LocalAgent(Agent):
@@ -290,12 +444,34 @@ class LocalAgent(Agent):
     """
 
     def __init__(self, public_key: str, local_node: OEFLocalProxy.LocalNode,
-                 loop: Optional[asyncio.AbstractEventLoop] = None):
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 max_concurrent_handlers: Optional[int] = None,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_linger: float = 0.0,
+                 pipeline_depth: Optional[int] = None,
+                 pipeline_policy: PipelineOverflowPolicy = PipelineOverflowPolicy.BLOCK,
+                 max_content_size: Optional[int] = DEFAULT_MAX_CONTENT_SIZE,
+                 executor: Optional[Executor] = None):
         """
         Initialize an OEF local agent.
 
         :param public_key: the public key (identifier) of the agent.
         :param local_node: an instance of the local implementation of the OEF Node.
         :param loop: the event loop.
+        :param max_concurrent_handlers: the maximum number of message handlers running concurrently.
+                                      | The messages of the same dialogue are always handled in order.
+        :param max_batch_size: the maximum number of simple messages delivered in a batch to
+                             | :attr:`~oef.core.DialogueInterface.on_message_batch`, if implemented.
+        :param max_linger: how long (in seconds) a batch waits for more messages before being delivered.
+        :param pipeline_depth: if provided, the maximum number of frames read from the connection
+                             | while the handlers run, and queued for them.
+        :param pipeline_policy: what to do with the frames read when the queue is full.
+        :param max_content_size: the maximum size (in bytes) of a content received in chunks.
+        :param executor: the executor of the handlers decorated with :func:`~oef.offload.offload`.
         """
-        super().__init__(OEFLocalProxy(public_key, local_node, loop=loop))
+        super().__init__(OEFLocalProxy(public_key, local_node, loop=loop,
+                                       max_concurrent_handlers=max_concurrent_handlers,
+                                       max_batch_size=max_batch_size, max_linger=max_linger,
+                                       pipeline_depth=pipeline_depth, pipeline_policy=pipeline_policy,
+                                       max_content_size=max_content_size),
+                         executor=executor)
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+
+oef.chunking
+~~~~~~~~~~~~
+
+This module implements the chunked transfer of large message contents.
+
+A large content is split into chunks, and every chunk is sent as a simple message, whose content starts with
+a header made of :data:`~oef.chunking.CHUNK_MAGIC`, a transfer identifier, the total size of the content
+and the offset of the chunk. On the receiving side, :class:`~oef.chunking.ChunkAssembler` writes every chunk
+at its offset into a buffer (in memory, or in a memory-mapped temporary file), and the content is delivered
+to :func:`~oef.core.DialogueInterface.on_message` once complete.
+
+"""
+
+import bisect
+import collections
+import logging
+import mmap
+import struct
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+"""The prefix of every chunk, used to tell chunks apart from the other message contents."""
+CHUNK_MAGIC = b"\x00OEFCHK\x01"
+
+"""The header of a chunk: magic, transfer id, total size of the content, offset of the chunk."""
+_CHUNK_HEADER = struct.Struct("!8sIQQ")
+CHUNK_HEADER_SIZE = _CHUNK_HEADER.size
+
+"""The default size (in bytes) of the content of a chunk."""
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+"""The default maximum size (in bytes) of a content reassembled from chunks."""
+DEFAULT_MAX_CONTENT_SIZE = 64 * 1024 * 1024
+
+"""The default maximum size (in bytes) of the chunks buffered by the pending transfers of the same sender."""
+DEFAULT_MAX_PENDING_SIZE = DEFAULT_MAX_CONTENT_SIZE
+
+"""The default time (in seconds) after which a transfer that receives no chunk is discarded."""
+DEFAULT_TRANSFER_TIMEOUT = 60.0
+
+CONTENT_TYPES = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class OEFChunkError(Exception):
+    """This exception is raised when a chunk is inconsistent with the transfer it belongs to."""
+
+
+def is_chunk(content: bytes) -> bool:
+    """
+    Check whether a message content is a chunk of a larger content.
+
+    :param content: the message content.
+    :return: ``True`` if the content is a chunk, ``False`` otherwise.
+    """
+    return len(content) >= CHUNK_HEADER_SIZE and content[:len(CHUNK_MAGIC)] == CHUNK_MAGIC
+
+
+def split_content(transfer_id: int, content: CONTENT_TYPES, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Split a content into chunks.
+
+    :param transfer_id: the identifier of the transfer, unique among the transfers of the same sender.
+    :param content: the content to split.
+    :param chunk_size: the maximum size (in bytes) of the content of a chunk, header excluded.
+    :return: an iterator over the chunks, header included.
+    """
+    if chunk_size <= 0:
+        raise ValueError("The chunk size must be positive.")
+    total_size = len(content)
+    with memoryview(content) as view:
+        for offset in range(0, max(total_size, 1), chunk_size):
+            header = _CHUNK_HEADER.pack(CHUNK_MAGIC, transfer_id, total_size, offset)
+            yield header + view[offset:offset + chunk_size].tobytes()
+
+
+class _Transfer:
+    """A content being reassembled."""
+
+    def __init__(self, total_size: int, spool_dir: Optional[str]):
+        self.total_size = total_size
+        self.received = 0
+        # the bytes buffered: in memory, the buffer grows up to the end of the furthest chunk received.
+        self.held = 0
+        self.last_activity = time.monotonic()
+        # the start and end offsets of the chunks received so far, sorted.
+        self._starts = []  # type: List[int]
+        self._ends = []  # type: List[int]
+        if spool_dir is not None and total_size > 0:
+            # the mapping keeps the (already unlinked) file alive after it is closed.
+            with tempfile.TemporaryFile(dir=spool_dir) as file:
+                file.truncate(total_size)
+                self.buffer = mmap.mmap(file.fileno(), total_size)  # type: Union[bytearray, mmap.mmap]
+        else:
+            self.buffer = bytearray()
+
+    def growth(self, offset: int, size: int) -> int:
+        """The number of bytes that writing a chunk adds to :attr:`held`."""
+        if isinstance(self.buffer, bytearray):
+            return max(offset + size - len(self.buffer), 0)
+        return size
+
+    def write(self, offset: int, data: memoryview) -> None:
+        end = offset + len(data)
+        if end > self.total_size:
+            raise OEFChunkError("Chunk at offset {} of {} bytes exceeds the content size {}."
+                                .format(offset, len(data), self.total_size))
+        if not data and self.total_size > 0:
+            raise OEFChunkError("Empty chunk at offset {}.".format(offset))
+        i = bisect.bisect_right(self._starts, offset)
+        if (i > 0 and self._ends[i - 1] > offset) or (i < len(self._starts) and self._starts[i] < end):
+            raise OEFChunkError("Chunk at offset {} of {} bytes overlaps a chunk already received."
+                                .format(offset, len(data)))
+        self._starts.insert(i, offset)
+        self._ends.insert(i, end)
+        self.held += self.growth(offset, len(data))
+        buffer = self.buffer
+        if isinstance(buffer, bytearray) and offset == len(buffer):
+            buffer += data
+        else:
+            if isinstance(buffer, bytearray) and end > len(buffer):
+                buffer.extend(bytes(end - len(buffer)))
+            buffer[offset:end] = data
+        self.received += len(data)
+
+    @property
+    def complete(self) -> bool:
+        return self.received >= self.total_size
+
+    def close(self) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+
+class ChunkAssembler:
+    """
+    Reassemble the contents sent in chunks with :func:`~oef.core.OEFProxy.send_message_chunked`.
+
+    Every transfer is identified by the sender, the dialogue and the transfer id. The content is reassembled
+    in a :class:`bytearray` that grows as the chunks arrive or, if ``spool_dir`` is given, in a :class:`mmap.mmap`
+    of a temporary file in that directory, so that large contents do not stay in memory.
+
+    Since the sizes are declared by the senders, every sender can buffer at most ``max_pending_size`` bytes
+    in its pending transfers, and a transfer that receives no chunk for ``transfer_timeout`` seconds
+    is discarded by :func:`~oef.chunking.ChunkAssembler.expire`.
+    """
+
+    def __init__(self, spool_dir: Optional[str] = None,
+                 max_content_size: Optional[int] = DEFAULT_MAX_CONTENT_SIZE,
+                 max_pending_size: Optional[int] = DEFAULT_MAX_PENDING_SIZE,
+                 transfer_timeout: Optional[float] = DEFAULT_TRANSFER_TIMEOUT):
+        """
+        Initialize the assembler.
+
+        :param spool_dir: if provided, the contents are reassembled into memory-mapped temporary files
+                        | in this directory. The mapping is closed after the content has been delivered.
+        :param max_content_size: the maximum size (in bytes) of a content. Larger transfers are refused
+                               | before any buffer is allocated. ``None`` means no limit: the size is
+                               | declared by the sender, so only use it with trusted peers.
+        :param max_pending_size: the maximum size (in bytes) of the chunks buffered by the pending transfers
+                               | of the same sender. The transfer of a chunk that exceeds it is discarded.
+                               | ``None`` means no limit.
+        :param transfer_timeout: the time (in seconds) after which a transfer that receives no chunk
+                               | is discarded. ``None`` means that the transfers never expire.
+        """
+        self.spool_dir = spool_dir
+        self.max_content_size = max_content_size
+        self.max_pending_size = max_pending_size
+        self.transfer_timeout = transfer_timeout
+        # in order of last activity, the least recent first.
+        self._transfers = collections.OrderedDict()  # type: Dict[Tuple[str, int, int], _Transfer]
+        self._pending_sizes = {}  # type: Dict[str, int]
+
+    @property
+    def pending(self) -> int:
+        """The number of transfers not complete yet."""
+        return len(self._transfers)
+
+    def feed(self, origin: str, dialogue_id: int, chunk: bytes) -> Optional[CONTENT_TYPES]:
+        """
+        Process a chunk.
+
+        :param origin: the sender of the chunk.
+        :param dialogue_id: the dialogue of the chunk.
+        :param chunk: the chunk, header included.
+        :return: the content, if the chunk completes it, ``None`` otherwise.
+        :raises OEFChunkError: if the chunk is inconsistent with its transfer, or the content is too large,
+                             | or the sender has too many bytes pending. The transfer is discarded.
+        """
+        if self._transfers:
+            self.expire()
+        _, transfer_id, total_size, offset = _CHUNK_HEADER.unpack_from(chunk)
+        key = (origin, dialogue_id, transfer_id)
+        transfer = self._transfers.get(key)
+        try:
+            if transfer is None:
+                if self.max_content_size is not None and total_size > self.max_content_size:
+                    raise OEFChunkError("Content of {} bytes exceeds the maximum size {}."
+                                        .format(total_size, self.max_content_size))
+                transfer = self._new_transfer(total_size)
+                self._transfers[key] = transfer
+            elif transfer.total_size != total_size:
+                raise OEFChunkError("Inconsistent size in chunk of transfer {}.".format(transfer_id))
+            else:
+                self._transfers.move_to_end(key)
+                transfer.last_activity = time.monotonic()
+            pending_size = self._pending_sizes.get(origin, 0)
+            growth = transfer.growth(offset, len(chunk) - CHUNK_HEADER_SIZE)
+            if self.max_pending_size is not None and pending_size + growth > self.max_pending_size:
+                raise OEFChunkError("The pending transfers of {} exceed {} bytes."
+                                    .format(origin, self.max_pending_size))
+            with memoryview(chunk) as view:
+                transfer.write(offset, view[CHUNK_HEADER_SIZE:])
+            self._pending_sizes[origin] = pending_size + growth
+        except OEFChunkError:
+            self.discard(key)
+            raise
+
+        if not transfer.complete:
+            return None
+        self._remove(key)
+        return transfer.buffer
+
+    def _new_transfer(self, total_size: int) -> _Transfer:
+        """
+        Allocate the buffer of a new transfer.
+
+        :param total_size: the size of the content, declared by the sender.
+        :return: the transfer.
+        :raises OEFChunkError: if the buffer cannot be allocated.
+        """
+        try:
+            return _Transfer(total_size, self.spool_dir)
+        except (MemoryError, OverflowError, OSError) as e:
+            raise OEFChunkError("Cannot allocate a content of {} bytes: {}.".format(total_size, e)) from e
+
+    def release(self, content: CONTENT_TYPES) -> None:
+        """
+        Release the resources of a content returned by :func:`~oef.chunking.ChunkAssembler.feed`,
+        i.e. close the memory mapping, if any.
+
+        :param content: the content.
+        :return: ``None``
+        """
+        if isinstance(content, mmap.mmap):
+            content.close()
+
+    def discard(self, key: Tuple[str, int, int]) -> None:
+        """
+        Discard a transfer.
+
+        :param key: the sender, the dialogue and the id of the transfer.
+        :return: ``None``
+        """
+        transfer = self._remove(key)
+        if transfer is not None:
+            transfer.close()
+
+    def expire(self) -> int:
+        """
+        Discard the transfers that have received no chunk for ``transfer_timeout`` seconds.
+
+        :return: the number of transfers discarded.
+        """
+        if self.transfer_timeout is None:
+            return 0
+        deadline = time.monotonic() - self.transfer_timeout
+        expired = []
+        for key, transfer in self._transfers.items():
+            if transfer.last_activity > deadline:
+                break
+            expired.append(key)
+        for key in expired:
+            logger.warning("Chunked content from {} discarded: no chunk received for {} seconds."
+                           .format(key[0], self.transfer_timeout))
+            self.discard(key)
+        return len(expired)
+
+    def _remove(self, key: Tuple[str, int, int]) -> Optional[_Transfer]:
+        """
+        Remove a transfer, and the bytes it buffers from the pending size of its sender.
+
+        :param key: the sender, the dialogue and the id of the transfer.
+        :return: the transfer, if any.
+        """
+        transfer = self._transfers.pop(key, None)
+        if transfer is not None:
+            origin = key[0]
+            pending_size = self._pending_sizes.get(origin, 0) - transfer.held
+            if pending_size > 0:
+                self._pending_sizes[origin] = pending_size
+            else:
+                self._pending_sizes.pop(origin, None)
+        return transfer
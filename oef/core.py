@@ -29,11 +29,16 @@ The core module that contains the main abstraction of the SDK.
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Optional
-
-from oef import agent_pb2 as agent_pb2
-from oef.messages import CFP_TYPES, PROPOSE_TYPES, OEFErrorOperation
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from oef.chunking import ChunkAssembler, OEFChunkError, DEFAULT_CHUNK_SIZE, DEFAULT_MAX_CONTENT_SIZE, CONTENT_TYPES, \
+    is_chunk, split_content
+from oef.messages import CFP_TYPES, PROPOSE_TYPES, RECIPIENTS_TYPES, InboundAccept, InboundAgentMessage, InboundCFP, \
+    InboundDecline, InboundDialogueError, InboundMessage, InboundMessageContent, InboundOEFError, InboundPropose, \
+    InboundSearchResult, InboundSearchResultWide, OEFErrorOperation, decode
+from oef.pipeline import FramePipeline, PipelineOverflowPolicy, PipelineStats
 from oef.query import Query, SearchResultItem
+from oef.scheduler import HandlerScheduler, HandlerStats
 from oef.schema import Description
 
 logger = logging.getLogger(__name__)
@@ -171,6 +176,39 @@ class OEFCoreInterface(ABC):
         :return: ``None``
         """
 
+    def send_cfp_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int, query: CFP_TYPES) -> None:
+        """
+        Send the same Call-For-Proposals in many dialogues.
+
+        The default implementation calls :func:`~oef.core.OEFCoreInterface.send_cfp` for every recipient.
+        The proxies override it to serialize the query only once, with :class:`~oef.messages.CFPBroadcast`.
+
+        :param msg_id: the message identifier, the same in every dialogue.
+        :param recipients: the ``(dialogue_id, destination)`` pairs of the recipients.
+        :param target: the identifier of the message to whom this message is answering.
+        :param query: the query associated with the Call For Proposals.
+        :return: ``None``
+        """
+        for dialogue_id, destination in recipients:
+            self.send_cfp(msg_id, dialogue_id, destination, target, query)
+
+    def send_propose_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int,
+                          proposals: PROPOSE_TYPES) -> None:
+        """
+        Send the same Propose in many dialogues.
+
+        The default implementation calls :func:`~oef.core.OEFCoreInterface.send_propose` for every recipient.
+        The proxies override it to serialize the proposals only once, with :class:`~oef.messages.ProposeBroadcast`.
+
+        :param msg_id: the message identifier, the same in every dialogue.
+        :param recipients: the ``(dialogue_id, destination)`` pairs of the recipients.
+        :param target: the identifier of the message to whom this message is answering.
+        :param proposals: either a list of :class:`~oef.schema.Description` or ``bytes``.
+        :return: ``None``
+        """
+        for dialogue_id, destination in recipients:
+            self.send_propose(msg_id, dialogue_id, destination, target, proposals)
+
     @abstractmethod
     def send_accept(self, msg_id: int, dialogue_id: int, destination: str, target: int) -> None:
         """
@@ -200,6 +238,10 @@ class OEFCoreInterface(ABC):
         """Stop the proxy."""
 
 
+"""A simple message delivered in a batch: the message id, the dialogue id, the origin and the content."""
+BATCH_ITEM_TYPES = Tuple[int, int, str, bytes]
+
+
 class DialogueInterface(ABC):
     """
     The methods of this interface are the callbacks that are called from the OEFProxy
@@ -293,7 +335,9 @@ class DialogueInterface(ABC):
         """
         The same of :func:`~oef.core.DialogueInterface.on_message`, but in asynchronous context.
         """
-        self.on_message(msg_id, dialogue_id, origin, content)
+        pending = self.on_message(msg_id, dialogue_id, origin, content)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_cfp(self, msg_id: int,
                            dialogue_id: int,
@@ -303,7 +347,9 @@ class DialogueInterface(ABC):
         """
         The same of :func:`~oef.core.DialogueInterface.on_cfp`, but in asynchronous context.
         """
-        self.on_cfp(msg_id, dialogue_id, origin, target, query)
+        pending = self.on_cfp(msg_id, dialogue_id, origin, target, query)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_propose(self, msg_id: int,
                                dialogue_id: int,
@@ -313,7 +359,9 @@ class DialogueInterface(ABC):
         """
         The same of :func:`~oef.core.DialogueInterface.on_propose`, but in asynchronous context.
         """
-        self.on_propose(msg_id, dialogue_id, origin, target, proposals)
+        pending = self.on_propose(msg_id, dialogue_id, origin, target, proposals)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_accept(self, msg_id: int,
                               dialogue_id: int,
@@ -322,7 +370,9 @@ class DialogueInterface(ABC):
         """
         The same of :func:`~oef.core.DialogueInterface.on_accept`, but in asynchronous context.
         """
-        self.on_accept(msg_id, dialogue_id, origin, target)
+        pending = self.on_accept(msg_id, dialogue_id, origin, target)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_decline(self, msg_id: int,
                                dialogue_id: int,
@@ -331,7 +381,26 @@ class DialogueInterface(ABC):
         """
         The same of :func:`~oef.core.DialogueInterface.on_decline`, but in asynchronous context.
         """
-        self.on_decline(msg_id, dialogue_id, origin, target)
+        pending = self.on_decline(msg_id, dialogue_id, origin, target)
+        if isinstance(pending, asyncio.Future):
+            await pending
+
+    on_message_batch = None  # type: Optional[Callable[[List[BATCH_ITEM_TYPES]], None]]
+    """
+    Optional handler for batches of simple messages. If an agent implements it, with the signature
+    ``on_message_batch(self, messages: List[BATCH_ITEM_TYPES]) -> None``, the simple messages already received
+    are delivered together, in order of arrival, instead of one at a time through
+    :func:`~oef.core.DialogueInterface.on_message`. See :func:`~oef.core.OEFProxy.loop`.
+    """
+
+    async def async_on_message_batch(self, messages: List[BATCH_ITEM_TYPES]) -> None:
+        """
+        The same of :attr:`~oef.core.DialogueInterface.on_message_batch`, but in asynchronous context.
+        Agents that implement it are delivered batches of messages too.
+        """
+        pending = self.on_message_batch(messages)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
 
 class ConnectionInterface(ABC):
@@ -383,19 +452,25 @@ class ConnectionInterface(ABC):
         """
         The same of :func:`~oef.core.ConnectionInterface.on_oef_error`, but in asynchronous context.
         """
-        self.on_oef_error(answer_id, operation)
+        pending = self.on_oef_error(answer_id, operation)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_dialogue_error(self, answer_id: int, dialogue_id: int, origin: str) -> None:
         """
         The same of :func:`~oef.core.ConnectionInterface.on_dialogue_error`, but in asynchronous context.
         """
-        self.on_dialogue_error(answer_id, dialogue_id, origin)
+        pending = self.on_dialogue_error(answer_id, dialogue_id, origin)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_search_result(self, search_id: int, agents: List[str]) -> None:
         """
         The same of :func:`~oef.core.ConnectionInterface.on_search_result`, but in asynchronous context.
         """
-        self.on_search_result(search_id, agents)
+        pending = self.on_search_result(search_id, agents)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
 
 class AgentInterface(DialogueInterface, ConnectionInterface, ABC):
@@ -408,14 +483,78 @@ class AgentInterface(DialogueInterface, ConnectionInterface, ABC):
     """
 
 
+"""The type of a message handler of :class:`~oef.core.OEFProxy`: a coroutine function taking the agent and the message."""
+HANDLER_TYPES = Callable[[AgentInterface, InboundMessage], Awaitable[None]]
+
+"""The types of message dispatched by :func:`~oef.core.OEFProxy.loop` to a default handler."""
+DISPATCH_CASES = ("agents", "agents_wide", "oef_error", "dialogue_error", "content",
+                  "fipa.cfp", "fipa.propose", "fipa.accept", "fipa.decline")
+
+"""The default maximum number of simple messages delivered in a batch."""
+DEFAULT_MAX_BATCH_SIZE = 1024
+
+"""The lane of the handler scheduler where the batches of messages are handled."""
+_BATCH_LANE = "batch"
+
+
 class OEFProxy(OEFCoreInterface, ABC):
     """Abstract definition of an OEF Proxy."""
 
-    def __init__(self, public_key: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+    def __init__(self, public_key: str, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 max_concurrent_handlers: Optional[int] = None,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_linger: float = 0.0,
+                 pipeline_depth: Optional[int] = None,
+                 pipeline_policy: PipelineOverflowPolicy = PipelineOverflowPolicy.BLOCK,
+                 max_content_size: Optional[int] = DEFAULT_MAX_CONTENT_SIZE):
+        """
+        Initialize the proxy.
+
+        :param public_key: the public key of the agent.
+        :param loop: the event loop. By default, the current event loop.
+        :param max_concurrent_handlers: if provided, the maximum number of message handlers running concurrently.
+                                      | The messages of the same dialogue are always handled in order.
+                                      | If ``None``, the messages are handled one at a time.
+        :param max_batch_size: the maximum number of simple messages delivered in a batch,
+                             | to the agents that implement :attr:`~oef.core.DialogueInterface.on_message_batch`.
+        :param max_linger: how long (in seconds) a batch waits for more messages before being delivered.
+                         | With ``0``, the batch contains the messages already received.
+        :param pipeline_depth: if provided, the frames are read from the connection while the handlers run,
+                             | and up to this number of frames are queued for the handlers.
+                             | If ``None``, the frames are read only when the previous ones have been handled.
+        :param pipeline_policy: what to do with the frames read when the queue is full.
+        :param max_content_size: the maximum size (in bytes) of a content received in chunks, and of the chunks
+                               | buffered by the pending transfers of every sender. Larger transfers are
+                               | discarded. ``None`` means no limit.
+        """
+        if max_batch_size < 1:
+            raise ValueError("The maximum batch size must be positive.")
         self._public_key = public_key
-        if not loop:
-            raise Exception("no NONE loop")
-        self._loop = loop if loop else asyncio.get_event_loop()
+        self._loop = loop if loop is not None else asyncio.get_event_loop()
+        self.max_concurrent_handlers = max_concurrent_handlers
+        self.max_batch_size = max_batch_size
+        self.max_linger = max_linger
+        self.pipeline_depth = pipeline_depth
+        self.pipeline_policy = pipeline_policy
+        self.pipeline = None  # type: Optional[FramePipeline]
+        self._reader_task = None  # type: Optional[asyncio.Task]
+        self.handler_scheduler = None  # type: Optional[HandlerScheduler]
+        self.chunk_assembler = ChunkAssembler(max_content_size=max_content_size, max_pending_size=max_content_size)
+        self._chunk_expiry = None  # type: Optional[asyncio.Handle]
+        self._next_transfer_id = 0
+
+        self._handlers = {
+            "agents": self._on_search_result,
+            "agents_wide": self._on_search_result_wide,
+            "oef_error": self._on_oef_error,
+            "dialogue_error": self._on_dialogue_error,
+            "content": self._on_message,
+            "fipa.cfp": self._on_cfp,
+            "fipa.propose": self._on_propose,
+            "fipa.accept": self._on_accept,
+            "fipa.decline": self._on_decline,
+        }  # type: Dict[Optional[str], HANDLER_TYPES]
+        self._fallback_handler = self._on_unknown  # type: HANDLER_TYPES
 
     @property
     def public_key(self) -> str:
@@ -430,6 +569,190 @@ class OEFProxy(OEFCoreInterface, ABC):
         :return: the bytes received from the communication channel.
         """
 
+    async def _receive_many(self) -> List[bytes]:
+        """
+        Receive all the messages that are already available, waiting for at least one.
+        By default, only one message is received at a time.
+
+        :return: the list of the bytes received from the communication channel, in order of arrival.
+        """
+        return [await self._receive()]
+
+    async def drain(self) -> None:
+        """
+        Wait until the outgoing messages buffered by the proxy are below the low-water mark.
+        By default, the proxy does not buffer outgoing messages, so it returns immediately.
+
+        :return: ``None``
+        """
+
+    async def async_register_agent(self, msg_id: int, agent_description: Description) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.register_agent`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.register_agent(msg_id, agent_description)
+
+    async def async_register_service(self, msg_id: int, service_description: Description) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.register_service`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.register_service(msg_id, service_description)
+
+    async def async_unregister_agent(self, msg_id: int) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.unregister_agent`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.unregister_agent(msg_id)
+
+    async def async_unregister_service(self, msg_id: int, service_description: Description) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.unregister_service`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.unregister_service(msg_id, service_description)
+
+    async def async_search_agents(self, search_id: int, query: Query) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.search_agents`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.search_agents(search_id, query)
+
+    async def async_search_services(self, search_id: int, query: Query) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.search_services`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.search_services(search_id, query)
+
+    async def async_search_services_wide(self, search_id: int, query: Query) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.search_services_wide`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.search_services_wide(search_id, query)
+
+    async def async_send_message(self, msg_id: int, dialogue_id: int, destination: str, msg: bytes) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.send_message`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.send_message(msg_id, dialogue_id, destination, msg)
+
+    async def async_send_cfp(self, msg_id: int, dialogue_id: int, destination: str, target: int,
+                             query: CFP_TYPES) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.send_cfp`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.send_cfp(msg_id, dialogue_id, destination, target, query)
+
+    async def async_send_propose(self, msg_id: int, dialogue_id: int, destination: str, target: int,
+                                 proposals: PROPOSE_TYPES) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.send_propose`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.send_propose(msg_id, dialogue_id, destination, target, proposals)
+
+    async def async_send_cfp_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int,
+                                  query: CFP_TYPES) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.send_cfp_many`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.send_cfp_many(msg_id, recipients, target, query)
+
+    async def async_send_propose_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int,
+                                      proposals: PROPOSE_TYPES) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.send_propose_many`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.send_propose_many(msg_id, recipients, target, proposals)
+
+    async def async_send_accept(self, msg_id: int, dialogue_id: int, destination: str, target: int) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.send_accept`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.send_accept(msg_id, dialogue_id, destination, target)
+
+    async def async_send_decline(self, msg_id: int, dialogue_id: int, destination: str, target: int) -> None:
+        """
+        The same of :func:`~oef.core.OEFCoreInterface.send_decline`, but it waits for the write buffer to
+        drain before sending, so a fast producer cannot grow it without bound.
+        """
+        await self.drain()
+        self.send_decline(msg_id, dialogue_id, destination, target)
+
+    def send_message_chunked(self, msg_id: int, dialogue_id: int, destination: str, msg: CONTENT_TYPES,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Send a large content as a sequence of simple messages of at most ``chunk_size`` bytes each.
+        The receiving proxy reassembles the chunks (see :class:`~oef.chunking.ChunkAssembler`)
+        and calls :func:`~oef.core.DialogueInterface.on_message` once, with the whole content.
+
+        :param msg_id: the identifier of the message.
+        :param dialogue_id: the identifier of the dialogue.
+        :param destination: the public key of the recipient.
+        :param msg: the content, any bytes-like object.
+        :param chunk_size: the maximum size (in bytes) of every chunk. Keep it below the maximum frame size.
+        :return: ``None``
+        """
+        transfer_id = self._next_transfer_id
+        self._next_transfer_id = (self._next_transfer_id + 1) & 0xFFFFFFFF
+        for chunk in split_content(transfer_id, msg, chunk_size):
+            self.send_message(msg_id, dialogue_id, destination, chunk)
+
+    def _assemble_chunk(self, origin: str, dialogue_id: int, chunk: bytes) -> Optional[CONTENT_TYPES]:
+        """
+        Process a chunk received from another agent.
+
+        :param origin: the sender of the chunk.
+        :param dialogue_id: the dialogue of the chunk.
+        :param chunk: the chunk, header included.
+        :return: the whole content, if the chunk completes it, ``None`` otherwise.
+        """
+        try:
+            return self.chunk_assembler.feed(origin, dialogue_id, chunk)
+        except OEFChunkError as e:
+            logger.warning("Proxy {}: chunked content from {} discarded: {}".format(self.public_key, origin, e))
+            return None
+        finally:
+            self._schedule_chunk_expiry()
+
+    def _schedule_chunk_expiry(self) -> None:
+        """
+        Make sure that the pending transfers of chunks are expired even if no more chunk is received.
+
+        :return: ``None``
+        """
+        timeout = self.chunk_assembler.transfer_timeout
+        if self._chunk_expiry is None and timeout is not None and self.chunk_assembler.pending:
+            self._chunk_expiry = self._loop.call_later(timeout, self._expire_chunks)
+
+    def _expire_chunks(self) -> None:
+        self._chunk_expiry = None
+        self.chunk_assembler.expire()
+        self._schedule_chunk_expiry()
+
     @abstractmethod
     def is_connected(self) -> bool:
         """
@@ -438,79 +761,296 @@ class OEFProxy(OEFCoreInterface, ABC):
         :return: ``True`` if the proxy is connected, ``False`` otherwise.
         """
 
-    async def loop(self, agent: AgentInterface) -> None:  # noqa: C901
+    def register_handler(self, case: str, handler: HANDLER_TYPES) -> Optional[HANDLER_TYPES]:
+        """
+        Register the handler of a type of message, replacing the current one (if any).
+
+        The types of message are the cases of the ``payload`` of :class:`~oef.agent_pb2.Server.AgentMessage`
+        (e.g. ``"agents"``, ``"oef_error"``), ``"content"`` for the simple messages
+        and ``"fipa.<msg>"`` for the FIPA messages (e.g. ``"fipa.cfp"``). See :data:`~oef.core.DISPATCH_CASES`
+        and the :attr:`~oef.messages.InboundMessage.case` of the inbound messages.
+
+        :param case: the type of message.
+        :param handler: a coroutine function (or any callable returning an awaitable), called with the agent
+                      | and the :class:`~oef.messages.InboundMessage` to handle.
+        :return: the previous handler, if any.
+        """
+        previous = self._handlers.get(case)
+        self._handlers[case] = handler
+        return previous
+
+    def register_fallback_handler(self, handler: HANDLER_TYPES) -> HANDLER_TYPES:
+        """
+        Register the handler of the messages whose type has no handler.
+        By default, they are logged and ignored.
+
+        :param handler: a coroutine function, called with the agent and the message.
+        :return: the previous fallback handler.
+        """
+        previous = self._fallback_handler
+        self._fallback_handler = handler
+        return previous
+
+    async def _dispatch(self, agent: AgentInterface, data: bytes) -> None:
+        """
+        Parse a message received from the OEF Node, and dispatch it to its handler.
+
+        :param agent: the implementation of the message handlers specified in AgentInterface.
+        :param data: the serialized message.
+        :return: ``None``
+        """
+        msg = decode(data)
+        await self._handlers.get(msg.case, self._fallback_handler)(agent, msg)
+
+    async def _schedule(self, agent: AgentInterface, data: bytes) -> None:
+        """
+        Parse a message received from the OEF Node, and submit its handler to the handler scheduler.
+        The messages of a dialogue are handled in order; the other messages (e.g. search results)
+        are handled in order among themselves.
+
+        :param agent: the implementation of the message handlers specified in AgentInterface.
+        :param data: the serialized message.
+        :return: ``None``, once the handler has been queued.
+        """
+        await self._submit(agent, decode(data))
+
+    async def _handle(self, agent: AgentInterface, msg: InboundMessage) -> None:
+        """
+        Pass a decoded message to its handler.
+
+        :param agent: the implementation of the message handlers specified in AgentInterface.
+        :param msg: the message.
+        :return: ``None``
+        """
+        await self._handlers.get(msg.case, self._fallback_handler)(agent, msg)
+
+    async def _submit(self, agent: AgentInterface, msg: InboundMessage) -> None:
+        """
+        Submit the handler of a decoded message to the handler scheduler, in the lane of its dialogue.
+
+        :param agent: the implementation of the message handlers specified in AgentInterface.
+        :param msg: the message.
+        :return: ``None``, once the handler has been queued.
+        """
+        handler = self._handlers.get(msg.case, self._fallback_handler)
+        if isinstance(msg, (InboundAgentMessage, InboundDialogueError)):
+            lane = (msg.origin, msg.dialogue_id)
+        else:
+            lane = None
+        await self.handler_scheduler.submit(lane, lambda: handler(agent, msg))
+
+    @property
+    def handler_stats(self) -> Optional[HandlerStats]:
+        """The metrics of the concurrent handlers, if enabled with ``max_concurrent_handlers``."""
+        return self.handler_scheduler.stats if self.handler_scheduler is not None else None
+
+    async def loop(self, agent: AgentInterface) -> None:
         """
         Event loop to wait for messages and to dispatch the arrived messages to the proper handler.
 
+        By default, every handler completes before the next message is read. If ``max_concurrent_handlers``
+        is set, up to that number of handlers run concurrently, but the messages of the same dialogue
+        are still handled one at a time, in order of arrival. See :class:`~oef.scheduler.HandlerScheduler`.
+
+        If the agent implements :attr:`~oef.core.DialogueInterface.on_message_batch`, the simple messages
+        are delivered in batches, see :func:`~oef.core.OEFProxy._loop_batched`.
+
+        If ``pipeline_depth`` is set, the frames are read from the connection by a separate task, the reader stage,
+        and queued in a :class:`~oef.pipeline.FramePipeline` until this loop, the dispatcher stage, takes them.
+        The metrics of both stages are in :attr:`~oef.core.OEFProxy.pipeline_stats`.
+
         :param agent: the implementation of the message handlers specified in AgentInterface.
         :return: ``None``
         """
+        if self.max_concurrent_handlers is not None:
+            self.handler_scheduler = HandlerScheduler(self.max_concurrent_handlers, loop=self._loop)
+            dispatch, handle = self._schedule, self._submit
+        else:
+            dispatch, handle = self._dispatch, self._handle
+        receive = self._start_reader()
+        try:
+            if self._batches_messages(agent):
+                await self._loop_batched(agent, handle, receive)
+                return
+            while True:
+                try:
+                    frames = await receive()
+                except asyncio.CancelledError:
+                    logger.debug("Proxy {}: loop cancelled".format(self.public_key))
+                    break
+                for data in frames:
+                    await dispatch(agent, data)
+        finally:
+            if self.handler_scheduler is not None:
+                self.handler_scheduler.close()
+            if self._reader_task is not None:
+                self._reader_task.cancel()
+                self._reader_task = None
+
+    def _start_reader(self) -> Callable[[], Awaitable[List[bytes]]]:
+        """
+        Start the reader stage, if ``pipeline_depth`` is set.
+
+        :return: the function the dispatcher stage calls to wait for the frames: either
+               | :func:`~oef.pipeline.FramePipeline.get_many`, or ``_receive_many`` if there is no reader stage.
+        """
+        if self.pipeline_depth is None:
+            return self._receive_many
+        self.pipeline = FramePipeline(self.pipeline_depth, self.pipeline_policy, loop=self._loop)
+        self._reader_task = asyncio.ensure_future(self._read_frames(self.pipeline), loop=self._loop)
+        return self.pipeline.get_many
+
+    async def _read_frames(self, pipeline: FramePipeline) -> None:
+        """
+        The reader stage: pull the frames off the connection and queue them in the pipeline, until cancelled.
+        An error stops the reader stage, and is raised in the dispatcher stage.
+
+        :param pipeline: the pipeline.
+        :return: ``None``
+        """
+        try:
+            while True:
+                start = self._loop.time()
+                frames = await self._receive_many()
+                pipeline.stats.read_time += self._loop.time() - start
+                await pipeline.put(frames)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            pipeline.close(e)
+
+    @property
+    def pipeline_stats(self) -> Optional[PipelineStats]:
+        """The metrics of the reader and dispatcher stages, if enabled with ``pipeline_depth``."""
+        return self.pipeline.stats if self.pipeline is not None else None
+
+    def _batches_messages(self, agent: AgentInterface) -> bool:
+        """
+        Check whether the simple messages have to be delivered to the agent in batches, i.e. whether the agent
+        implements a batch handler, and the default handler of simple messages has not been replaced.
+
+        :param agent: the agent.
+        :return: ``True`` if the messages have to be delivered in batches, ``False`` otherwise.
+        """
+        implements_batches = getattr(agent, "on_message_batch", None) is not None or \
+            type(agent).async_on_message_batch is not DialogueInterface.async_on_message_batch
+        return implements_batches and self._handlers.get("content") == self._on_message
+
+    async def _loop_batched(self, agent: AgentInterface,
+                            handle: Callable[[AgentInterface, InboundMessage], Awaitable[None]],
+                            receive: Callable[[], Awaitable[List[bytes]]]) -> None:
+        """
+        Wait for messages, and deliver the consecutive simple messages in batches to
+        :func:`~oef.core.DialogueInterface.async_on_message_batch`.
+
+        A batch is delivered when it reaches ``max_batch_size`` messages, when a message of another type
+        (or a chunk) is received, so that the order of arrival is kept, or when no message has been
+        received for ``max_linger`` seconds since the first message of the batch.
+        When the loop is cancelled, the last batch is not dropped: it is delivered like the previous ones.
+        With ``max_concurrent_handlers``, the batches are handled one after the other in a lane of their own,
+        so they are not ordered with respect to the other messages of the same dialogues.
+
+        :param agent: the implementation of the message handlers specified in AgentInterface.
+        :param handle: the function that passes the other messages to their handler.
+        :param receive: the function that waits for the frames.
+        :return: ``None``
+        """
+        batch = []  # type: List[BATCH_ITEM_TYPES]
+        deadline = None  # type: Optional[float]
         while True:
             try:
-                data = await self._receive()
+                frames = await self._receive_before(receive, deadline)
             except asyncio.CancelledError:
-                logger.debug("Proxy {}: loop cancelled".format(self.public_key))
+                logger.debug("Proxy {}: loop cancelled, delivering the {} messages of the last batch"
+                             .format(self.public_key, len(batch)))
+                await self._flush_batch(agent, batch)
                 break
-            msg = agent_pb2.Server.AgentMessage()
-            msg.ParseFromString(data)
-            case = msg.WhichOneof("payload")
-            logger.debug("loop {0}".format(case))
-
-            if case == "agents":
-                await agent.async_on_search_result(msg.answer_id, msg.agents.agents)
-            elif case == "agents_wide":
-                result_items = []
-                for item in msg.agents_wide.result:
-                    core_key  = str(item.key,'ascii')
-                    core_addr = item.ip
-                    distance = item.distance
-                    core_port = item.port
-                    for agt in item.agents:
-                        agent_key = str(agt.key,'ascii')
-                        result_items.append(SearchResultItem(agent_key, core_key, core_addr, core_port, distance))
-                agent.on_search_result_wide(msg.answer_id, result_items)
-            elif case == "oef_error":
-                await agent.async_on_oef_error(msg.answer_id, OEFErrorOperation(msg.oef_error.operation))
-            elif case == "dialogue_error":
-                await agent.async_on_dialogue_error(msg.answer_id,
-                                                    msg.dialogue_error.dialogue_id,
-                                                    msg.dialogue_error.origin)
-            elif case == "content":
-                content_case = msg.content.WhichOneof("payload")
-                logger.debug("msg content {0}".format(content_case))
-                if content_case == "content":
-                    await agent.async_on_message(msg.answer_id, msg.content.dialogue_id, msg.content.origin, msg.content.content)
-                elif content_case == "fipa":
-                    fipa = msg.content.fipa
-                    fipa_case = fipa.WhichOneof("msg")
-                    if fipa_case == "cfp":
-                        cfp_case = fipa.cfp.WhichOneof("payload")
-                        if cfp_case == "nothing":
-                            query = None
-                        elif cfp_case == "content":
-                            query = fipa.cfp.content
-                        elif cfp_case == "query":
-                            query = Query.from_pb(fipa.cfp.query)
-                        else:
-                            raise Exception("Query type not valid.")
-                        await agent.async_on_cfp(msg.answer_id, msg.content.dialogue_id, msg.content.origin,
-                                                 fipa.target, query)
-                    elif fipa_case == "propose":
-                        propose_case = fipa.propose.WhichOneof("payload")
-                        if propose_case == "content":
-                            proposals = fipa.propose.content
-                        else:
-                            proposals = [Description.from_pb(propose) for propose in fipa.propose.proposals.objects]
-                        await agent.async_on_propose(msg.answer_id, msg.content.dialogue_id, msg.content.origin,
-                                                     fipa.target, proposals)
-                    elif fipa_case == "accept":
-                        await agent.async_on_accept(msg.answer_id, msg.content.dialogue_id, msg.content.origin,
-                                                    fipa.target)
-                    elif fipa_case == "decline":
-                        await agent.async_on_decline(msg.answer_id, msg.content.dialogue_id, msg.content.origin,
-                                                     fipa.target)
-                    else:
-                        logger.warning("Not implemented yet: fipa {0}".format(fipa_case))
-            else:
-                print("UNKNOWN CASE: ", case)
-                exit(76)
+            for data in frames:
+                msg = decode(data)
+                if msg.case != "content" or is_chunk(msg.content):
+                    await self._flush_batch(agent, batch)
+                    await handle(agent, msg)
+                    continue
+                if not batch:
+                    deadline = self._loop.time() + self.max_linger
+                batch.append((msg.msg_id, msg.dialogue_id, msg.origin, msg.content))
+                if len(batch) >= self.max_batch_size:
+                    await self._flush_batch(agent, batch)
+            if not batch or self._loop.time() >= deadline:
+                await self._flush_batch(agent, batch)
+                deadline = None
+
+    async def _receive_before(self, receive: Callable[[], Awaitable[List[bytes]]],
+                              deadline: Optional[float]) -> List[bytes]:
+        """
+        Wait for the messages received from the OEF Node, until a deadline.
+
+        :param receive: the function that waits for the frames.
+        :param deadline: the deadline, in the time of the event loop. If ``None``, wait indefinitely.
+        :return: the serialized messages, possibly none if the deadline has passed.
+        """
+        if deadline is None:
+            return await receive()
+        try:
+            return await asyncio.wait_for(receive(), deadline - self._loop.time())
+        except asyncio.TimeoutError:
+            return []
+
+    async def _flush_batch(self, agent: AgentInterface, batch: List[BATCH_ITEM_TYPES]) -> None:
+        """
+        Deliver a batch of messages, if not empty, and empty it.
+
+        :param agent: the implementation of the message handlers specified in AgentInterface.
+        :param batch: the batch.
+        :return: ``None``
+        """
+        if not batch:
+            return
+        messages = batch[:]
+        del batch[:]
+        if self.handler_scheduler is not None:
+            await self.handler_scheduler.submit(_BATCH_LANE, lambda: agent.async_on_message_batch(messages))
+        else:
+            await agent.async_on_message_batch(messages)
+
+    def _on_search_result(self, agent: AgentInterface, msg: InboundSearchResult) -> Awaitable[None]:
+        return agent.async_on_search_result(msg.msg_id, msg.agents)
+
+    async def _on_search_result_wide(self, agent: AgentInterface, msg: InboundSearchResultWide) -> None:
+        pending = agent.on_search_result_wide(msg.msg_id, msg.items)
+        if isinstance(pending, asyncio.Future):
+            await pending
+
+    def _on_oef_error(self, agent: AgentInterface, msg: InboundOEFError) -> Awaitable[None]:
+        return agent.async_on_oef_error(msg.msg_id, msg.operation)
+
+    def _on_dialogue_error(self, agent: AgentInterface, msg: InboundDialogueError) -> Awaitable[None]:
+        return agent.async_on_dialogue_error(msg.msg_id, msg.dialogue_id, msg.origin)
+
+    def _on_message(self, agent: AgentInterface, msg: InboundMessageContent) -> Awaitable[None]:
+        if is_chunk(msg.content):
+            return self._on_chunk(agent, msg)
+        return agent.async_on_message(msg.msg_id, msg.dialogue_id, msg.origin, msg.content)
+
+    async def _on_chunk(self, agent: AgentInterface, msg: InboundMessageContent) -> None:
+        content = self._assemble_chunk(msg.origin, msg.dialogue_id, msg.content)
+        if content is not None:
+            try:
+                await agent.async_on_message(msg.msg_id, msg.dialogue_id, msg.origin, content)
+            finally:
+                self.chunk_assembler.release(content)
+
+    def _on_cfp(self, agent: AgentInterface, msg: InboundCFP) -> Awaitable[None]:
+        return agent.async_on_cfp(msg.msg_id, msg.dialogue_id, msg.origin, msg.target, msg.query)
+
+    def _on_propose(self, agent: AgentInterface, msg: InboundPropose) -> Awaitable[None]:
+        return agent.async_on_propose(msg.msg_id, msg.dialogue_id, msg.origin, msg.target, msg.proposals)
+
+    def _on_accept(self, agent: AgentInterface, msg: InboundAccept) -> Awaitable[None]:
+        return agent.async_on_accept(msg.msg_id, msg.dialogue_id, msg.origin, msg.target)
+
+    def _on_decline(self, agent: AgentInterface, msg: InboundDecline) -> Awaitable[None]:
+        return agent.async_on_decline(msg.msg_id, msg.dialogue_id, msg.origin, msg.target)
+
+    async def _on_unknown(self, agent: AgentInterface, msg: InboundMessage) -> None:
+        logger.warning("Proxy {}: no handler for message of type {}, ignored.".format(self.public_key, msg.case))
@@ -27,7 +27,9 @@ This module contains classes to implement more complex dialogues.
 
 """
 
+import asyncio
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
 from typing import Dict, Tuple, List, Optional
 
 from oef.messages import CFP_TYPES, PROPOSE_TYPES, OEFErrorOperation
@@ -140,31 +142,41 @@ class SingleDialogue(ABC):
         """
         The same of :func:`~oef.dialogue.SingleDialogue.on_message`, but in asynchronous context.
         """
-        self.on_message(msg_id, content)
+        pending = self.on_message(msg_id, content)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_cfp(self, msg_id: int, target: int, query: CFP_TYPES) -> None:
         """
         The same of :func:`~oef.dialogue.SingleDialogue.on_cfp`, but in asynchronous context.
         """
-        self.on_cfp(msg_id, target, query)
+        pending = self.on_cfp(msg_id, target, query)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_propose(self, msg_id: int, target: int, proposals: PROPOSE_TYPES) -> None:
         """
         The same of :func:`~oef.dialogue.SingleDialogue.on_propose`, but in asynchronous context.
         """
-        self.on_propose(msg_id, target, proposals)
+        pending = self.on_propose(msg_id, target, proposals)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_accept(self, msg_id: int, target: int) -> None:
         """
         The same of :func:`~oef.dialogue.SingleDialogue.on_accept`, but in asynchronous context.
         """
-        self.on_accept(msg_id, target)
+        pending = self.on_accept(msg_id, target)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_decline(self, msg_id: int, target: int) -> None:
         """
         The same of :func:`~oef.dialogue.SingleDialogue.on_decline`, but in asynchronous context.
         """
-        self.on_decline(msg_id, target)
+        pending = self.on_decline(msg_id, target)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     def send_message(self, msg_id: int, msg: bytes) -> None:
         """
@@ -224,13 +236,14 @@ class DialogueAgent(Agent, ABC):
     This class implements a special agent that uses the dialogue to make complex interactions with other agents.
     """
 
-    def __init__(self, oef_proxy: OEFProxy):
+    def __init__(self, oef_proxy: OEFProxy, executor: Optional[Executor] = None):
         """
         Initialize a Dialogue Agent.
 
         :param oef_proxy: the proxy to the OEF Node.
+        :param executor: the executor of the handlers decorated with :func:`~oef.offload.offload`.
         """
-        super().__init__(oef_proxy)
+        super().__init__(oef_proxy, executor=executor)
         self.dialogues = {}  # type: Dict[DialogueKey, SingleDialogue]
 
     def register_dialogue(self, dialogue: SingleDialogue) -> None:
@@ -297,19 +310,25 @@ class DialogueAgent(Agent, ABC):
         """
         The same of :func:`~oef.dialogue.DialogueAgent.on_new_cfp`, but in asynchronous context.
         """
-        self.on_new_cfp(msg_id, dialogue_id, from_, target, query)
+        pending = self.on_new_cfp(msg_id, dialogue_id, from_, target, query)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_new_message(self, msg_id: int, dialogue_id: int, from_: str, content: bytes) -> None:
         """
         The same of :func:`~oef.dialogue.DialogueAgent.on_new_message`, but in asynchronous context.
         """
-        self.on_new_message(msg_id, dialogue_id, from_, content)
+        pending = self.on_new_message(msg_id, dialogue_id, from_, content)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_connection_error(self, operation: OEFErrorOperation) -> None:
         """
         The same of :func:`~oef.dialogue.DialogueAgent.on_connection_error`, but in asynchronous context.
         """
-        self.on_connection_error(operation)
+        pending = self.on_connection_error(operation)
+        if isinstance(pending, asyncio.Future):
+            await pending
 
     async def async_on_message(self, msg_id: int, dialogue_id: int, origin: str, content: bytes):
         try:
@@ -398,6 +417,35 @@ class GroupDialogues:
             self.dialogues[a.destination] = a
             self.agent.register_dialogue(a)
 
+    def send_cfp_many(self, msg_id: int, target: int, query: CFP_TYPES) -> None:
+        """
+        Send the same CFP in all the dialogues of the group. The query is serialized only once.
+        See :func:`~oef.agents.Agent.send_cfp_many`.
+
+        :param msg_id: the message identifier for the dialogues.
+        :param target: the identifier of the message to whom this message is answering.
+        :param query: the query associated with the Call For Proposals.
+        :return: ``None``
+        """
+        self.agent.send_cfp_many(msg_id, self.recipients, target, query)
+
+    def send_propose_many(self, msg_id: int, target: int, proposals: PROPOSE_TYPES) -> None:
+        """
+        Send the same Propose in all the dialogues of the group. The proposals are serialized only once.
+        See :func:`~oef.agents.Agent.send_propose_many`.
+
+        :param msg_id: the message identifier for the dialogues.
+        :param target: the identifier of the message to whom this message is answering.
+        :param proposals: either a list of :class:`~oef.schema.Description` or ``bytes``.
+        :return: ``None``
+        """
+        self.agent.send_propose_many(msg_id, self.recipients, target, proposals)
+
+    @property
+    def recipients(self) -> List[Tuple[int, str]]:
+        """The ``(dialogue_id, destination)`` pairs of the dialogues in the group."""
+        return [(dialogue.id, dialogue.destination) for dialogue in self.dialogues.values()]
+
     @abstractmethod
     def better(self, price1: int, price2: int) -> bool:
         """
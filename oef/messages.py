@@ -29,15 +29,16 @@ This module contains classes to manage serialization of data in Protobuf message
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Union, List
+from typing import Iterator, Union, List, Optional, Sequence, Tuple
 
 from oef import agent_pb2, fipa_pb2
-from oef.query import Query
-from oef.schema import Description
+from oef.query import LazyQuery, Query, SearchResultItem
+from oef.schema import Description, LazyDescription, description_cache
 
 NoneType = type(None)
 CFP_TYPES = Union[Query, bytes, NoneType]
 PROPOSE_TYPES = Union[bytes, List[Description]]
+RECIPIENTS_TYPES = Sequence[Tuple[int, str]]
 
 
 class OEFErrorOperation(Enum):
@@ -64,10 +65,12 @@ class BaseMessage(ABC):
         self.msg_id = msg_id
 
     @abstractmethod
-    def to_pb(self):
+    def to_pb(self, target=None):
         """
         Pack the message into a protobuf message.
 
+        :param target: the protobuf message to fill in. If ``None``, a new one is created.
+                     | The nested messages are written in place, rather than built apart and copied.
         :return: the envelope.
         """
 
@@ -90,10 +93,10 @@ class RegisterDescription(BaseMessage):
         super().__init__(msg_id)
         self.agent_description = agent_description
 
-    def to_pb(self) -> agent_pb2.Envelope:
-        envelope = agent_pb2.Envelope()
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = agent_pb2.Envelope() if target is None else target
         envelope.msg_id = self.msg_id
-        envelope.register_description.CopyFrom(self.agent_description.to_agent_description_pb())
+        self.agent_description.to_agent_description_pb(envelope.register_description)
         return envelope
 
 
@@ -115,10 +118,10 @@ class RegisterService(BaseMessage):
         super().__init__(msg_id)
         self.service_description = service_description
 
-    def to_pb(self) -> agent_pb2.Envelope:
-        envelope = agent_pb2.Envelope()
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = agent_pb2.Envelope() if target is None else target
         envelope.msg_id = self.msg_id
-        envelope.register_service.CopyFrom(self.service_description.to_agent_description_pb())
+        self.service_description.to_agent_description_pb(envelope.register_service)
         return envelope
 
 
@@ -136,10 +139,10 @@ class UnregisterDescription(BaseMessage):
         """
         super().__init__(msg_id)
 
-    def to_pb(self) -> agent_pb2.Envelope:
-        envelope = agent_pb2.Envelope()
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = agent_pb2.Envelope() if target is None else target
         envelope.msg_id = self.msg_id
-        envelope.unregister_description.CopyFrom(agent_pb2.Envelope.Nothing())
+        envelope.unregister_description.SetInParent()
         return envelope
 
 
@@ -161,10 +164,10 @@ class UnregisterService(BaseMessage):
         super().__init__(msg_id)
         self.service_description = service_description
 
-    def to_pb(self) -> agent_pb2.Envelope:
-        envelope = agent_pb2.Envelope()
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = agent_pb2.Envelope() if target is None else target
         envelope.msg_id = self.msg_id
-        envelope.unregister_service.CopyFrom(self.service_description.to_agent_description_pb())
+        self.service_description.to_agent_description_pb(envelope.unregister_service)
         return envelope
 
 
@@ -193,10 +196,10 @@ class SearchAgents(BaseMessage):
         super().__init__(msg_id)
         self.query = query
 
-    def to_pb(self) -> agent_pb2.Envelope:
-        envelope = agent_pb2.Envelope()
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = agent_pb2.Envelope() if target is None else target
         envelope.msg_id = self.msg_id
-        envelope.search_agents.query.CopyFrom(self.query.to_pb())
+        self.query.to_pb(envelope.search_agents.query)
         return envelope
 
 
@@ -225,10 +228,10 @@ class SearchServices(BaseMessage):
         super().__init__(msg_id)
         self.query = query
 
-    def to_pb(self) -> agent_pb2.Envelope:
-        envelope = agent_pb2.Envelope()
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = agent_pb2.Envelope() if target is None else target
         envelope.msg_id = self.msg_id
-        envelope.search_services.query.CopyFrom(self.query.to_pb())
+        self.query.to_pb(envelope.search_services.query)
         return envelope
 
 
@@ -258,10 +261,10 @@ class SearchServicesWide(BaseMessage):
         super().__init__(msg_id)
         self.query = query
 
-    def to_pb(self) -> agent_pb2.Envelope:
-        envelope = agent_pb2.Envelope()
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = agent_pb2.Envelope() if target is None else target
         envelope.msg_id = self.msg_id
-        envelope.search_services_wide.query.CopyFrom(self.query.to_pb())
+        self.query.to_pb(envelope.search_services_wide.query)
         return envelope
 
 
@@ -282,8 +285,8 @@ class OEFErrorMessage(BaseMessage):
         super().__init__(msg_id)
         self.oef_error_operation = oef_error_operation
 
-    def to_pb(self) -> agent_pb2.Server.AgentMessage:
-        msg = agent_pb2.Server.AgentMessage()
+    def to_pb(self, target: Optional[agent_pb2.Server.AgentMessage] = None) -> agent_pb2.Server.AgentMessage:
+        msg = agent_pb2.Server.AgentMessage() if target is None else target
         msg.answer_id = self.msg_id
         msg.oef_error.operation = self.oef_error_operation.value
         return msg
@@ -295,12 +298,12 @@ class DialogueErrorMessage(BaseMessage):
     """
 
     def __init__(self, msg_id: int, dialogue_id: int, origin: str):
-        super().__init__(msg_id)
+        self.msg_id = msg_id
         self.dialogue_id = dialogue_id
         self.origin = origin
 
-    def to_pb(self) -> agent_pb2.Server.AgentMessage:
-        msg = agent_pb2.Server.AgentMessage()
+    def to_pb(self, target: Optional[agent_pb2.Server.AgentMessage] = None) -> agent_pb2.Server.AgentMessage:
+        msg = agent_pb2.Server.AgentMessage() if target is None else target
         msg.answer_id = self.msg_id
         msg.dialogue_error.dialogue_id = self.dialogue_id
         msg.dialogue_error.origin = self.origin
@@ -316,8 +319,8 @@ class SearchResult(BaseMessage):
         super().__init__(search_id)
         self.agents = agents
 
-    def to_pb(self) -> agent_pb2.Server.SearchResult:
-        msg = agent_pb2.Server.AgentMessage()
+    def to_pb(self, target: Optional[agent_pb2.Server.AgentMessage] = None) -> agent_pb2.Server.AgentMessage:
+        msg = agent_pb2.Server.AgentMessage() if target is None else target
         msg.answer_id = self.msg_id
         msg.agents.agents.extend(self.agents)
         return msg
@@ -341,6 +344,19 @@ class AgentMessage(BaseMessage, ABC):
     The protocol is compliant with FIPA specifications.
     """
 
+    def _send_message_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        """
+        Pack the fields common to all the agent messages into an envelope.
+
+        :param target: the envelope to fill in. If ``None``, a new one is created.
+        :return: the envelope, whose ``send_message`` field is to be completed with the payload.
+        """
+        envelope = agent_pb2.Envelope() if target is None else target
+        envelope.msg_id = self.msg_id
+        envelope.send_message.dialogue_id = self.dialogue_id
+        envelope.send_message.destination = self.destination
+        return envelope
+
 
 class Message(AgentMessage):
     """
@@ -374,15 +390,9 @@ class Message(AgentMessage):
         self.destination = destination
         self.msg = msg
 
-    def to_pb(self) -> agent_pb2.Envelope:
-        agent_msg = agent_pb2.Agent.Message()
-        agent_msg.dialogue_id = self.dialogue_id
-        agent_msg.destination = self.destination
-        agent_msg.content = self.msg
-
-        envelope = agent_pb2.Envelope()
-        envelope.msg_id = self.msg_id
-        envelope.send_message.CopyFrom(agent_msg)
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = self._send_message_pb(target)
+        envelope.send_message.content = self.msg
         return envelope
 
 
@@ -423,26 +433,32 @@ class CFP(AgentMessage):
         self.query = query
         self.target = target
 
-    def to_pb(self) -> agent_pb2.Agent.Message:
-        fipa_msg = fipa_pb2.Fipa.Message()
-        fipa_msg.target = self.target
-        cfp = fipa_pb2.Fipa.Cfp()
-
-        if self.query is None:
-            cfp.nothing.CopyFrom(fipa_pb2.Fipa.Cfp.Nothing())
-        elif isinstance(self.query, Query):
-            cfp.query.CopyFrom(self.query.to_pb())
-        elif isinstance(self.query, bytes):
-            cfp.content = self.query
-        fipa_msg.cfp.CopyFrom(cfp)
-        agent_msg = agent_pb2.Agent.Message()
-        agent_msg.dialogue_id = self.dialogue_id
-        agent_msg.destination = self.destination
-        agent_msg.fipa.CopyFrom(fipa_msg)
-
-        envelope = agent_pb2.Envelope()
-        envelope.msg_id = self.msg_id
-        envelope.send_message.CopyFrom(agent_msg)
+    @staticmethod
+    def fipa_pb(target: int, query: CFP_TYPES,
+                fipa_msg: Optional[fipa_pb2.Fipa.Message] = None) -> fipa_pb2.Fipa.Message:
+        """
+        Pack the FIPA part of a `Call For Proposals`, i.e. what does not depend on the dialogue.
+
+        :param target: the identifier of the message to whom this message is targeting.
+        :param query: the query, an instance of `~oef.schema.Query`, ``bytes``, or ``None``.
+        :param fipa_msg: the FIPA message to fill in. If ``None``, a new one is created.
+        :return: the FIPA message.
+        """
+        fipa_msg = fipa_pb2.Fipa.Message() if fipa_msg is None else fipa_msg
+        fipa_msg.target = target
+        cfp = fipa_msg.cfp
+
+        if query is None:
+            cfp.nothing.SetInParent()
+        elif isinstance(query, Query):
+            query.to_pb(cfp.query)
+        elif isinstance(query, bytes):
+            cfp.content = query
+        return fipa_msg
+
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = self._send_message_pb(target)
+        self.fipa_pb(self.target, self.query, envelope.send_message.fipa)
         return envelope
 
 
@@ -484,28 +500,187 @@ class Propose(AgentMessage):
         self.target = target
         self.proposals = proposals
 
-    def to_pb(self) -> agent_pb2.Agent.Message:
-        fipa_msg = fipa_pb2.Fipa.Message()
-        fipa_msg.target = self.target
-        propose = fipa_pb2.Fipa.Propose()
-        if isinstance(self.proposals, bytes):
-            propose.content = self.proposals
+    @staticmethod
+    def fipa_pb(target: int, proposals: PROPOSE_TYPES,
+                fipa_msg: Optional[fipa_pb2.Fipa.Message] = None) -> fipa_pb2.Fipa.Message:
+        """
+        Pack the FIPA part of a `Propose`, i.e. what does not depend on the dialogue.
+
+        :param target: the identifier of the message to whom this message is targeting.
+        :param proposals: a list of proposals. A proposal can be a `~oef.schema.Description` or ``bytes``.
+        :param fipa_msg: the FIPA message to fill in. If ``None``, a new one is created.
+        :return: the FIPA message.
+        """
+        fipa_msg = fipa_pb2.Fipa.Message() if fipa_msg is None else fipa_msg
+        fipa_msg.target = target
+        propose = fipa_msg.propose
+        if isinstance(proposals, bytes):
+            propose.content = proposals
         else:
-            proposals_pb = fipa_pb2.Fipa.Propose.Proposals()
-            proposals_pb.objects.extend([propose.to_pb() for propose in self.proposals])
-            propose.proposals.CopyFrom(proposals_pb)
-        fipa_msg.propose.CopyFrom(propose)
-        agent_msg = agent_pb2.Agent.Message()
-        agent_msg.dialogue_id = self.dialogue_id
-        agent_msg.destination = self.destination
-        agent_msg.fipa.CopyFrom(fipa_msg)
-
-        envelope = agent_pb2.Envelope()
-        envelope.msg_id = self.msg_id
-        envelope.send_message.CopyFrom(agent_msg)
+            # the list of proposals can be empty: mark the field as set anyway.
+            propose.proposals.SetInParent()
+            objects = propose.proposals.objects
+            for proposal in proposals:
+                proposal.to_pb(objects.add())
+        return fipa_msg
+
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = self._send_message_pb(target)
+        self.fipa_pb(self.target, self.proposals, envelope.send_message.fipa)
         return envelope
 
 
+def _encode_varint(value: int) -> bytes:
+    """
+    Encode an integer as a Protobuf varint. Negative values take ten bytes, as for the ``int32`` fields.
+
+    :param value: the integer.
+    :return: the encoded integer.
+    """
+    value &= 0xFFFFFFFFFFFFFFFF
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _encode_field(tag: bytes, data: bytes) -> bytes:
+    """
+    Encode a length-delimited Protobuf field, e.g. a string or an embedded message.
+
+    :param tag: the encoded tag of the field.
+    :param data: the value of the field.
+    :return: the encoded field.
+    """
+    return tag + _encode_varint(len(data)) + data
+
+
+# The tags of the fields encoded by hand by :class:`.Broadcast`: (field number << 3) | wire type.
+_ENVELOPE_MSG_ID_TAG = b"\x08"
+_ENVELOPE_SEND_MESSAGE_TAG = b"\x12"
+_MESSAGE_DIALOGUE_ID_TAG = b"\x08"
+_MESSAGE_DESTINATION_TAG = b"\x12"
+_MESSAGE_FIPA_TAG = b"\x22"
+
+
+class Broadcast(BaseMessage, ABC):
+    """
+    A FIPA message sent in many dialogues, e.g. a :class:`.CFP` to all the agents found with a search.
+
+    Every recipient is a pair ``(dialogue_id, destination)``. The FIPA payload is the same for all of them,
+    so it is packed and serialized once: the envelope of every recipient is written around the serialized
+    payload, and only the message id, the dialogue id and the destination are encoded again.
+
+    It is used in the methods :func:`~oef.agents.Agent.send_cfp_many` and :func:`~oef.agents.Agent.send_propose_many`.
+    """
+
+    def __init__(self, msg_id: int, recipients: RECIPIENTS_TYPES):
+        """
+        Initialize a broadcast.
+
+        :param msg_id: the identifier of the message, the same in every dialogue.
+        :param recipients: the ``(dialogue_id, destination)`` pairs of the recipients.
+        """
+        super().__init__(msg_id)
+        self.recipients = recipients
+        self.fipa = self.fipa_pb()
+        self._msg_id_field = _ENVELOPE_MSG_ID_TAG + _encode_varint(msg_id)
+        self._fipa_field = _encode_field(_MESSAGE_FIPA_TAG, self.fipa.SerializeToString())
+
+    @abstractmethod
+    def fipa_pb(self) -> fipa_pb2.Fipa.Message:
+        """
+        Pack the FIPA payload shared by the recipients.
+
+        :return: the FIPA message.
+        """
+
+    def to_pb(self) -> List[agent_pb2.Envelope]:
+        """
+        Pack the message into one envelope per recipient.
+
+        :return: the envelopes.
+        """
+        envelopes = []
+        for dialogue_id, destination in self.recipients:
+            envelope = agent_pb2.Envelope()
+            envelope.msg_id = self.msg_id
+            envelope.send_message.dialogue_id = dialogue_id
+            envelope.send_message.destination = destination
+            envelope.send_message.fipa.CopyFrom(self.fipa)
+            envelopes.append(envelope)
+        return envelopes
+
+    def to_bytes(self, dialogue_id: int, destination: str) -> bytes:
+        """
+        Serialize the envelope for a recipient. The bytes are the same of ``SerializeToString()``
+        on the envelope packed by the equivalent :class:`.CFP` or :class:`.Propose`.
+
+        :param dialogue_id: the identifier of the dialogue.
+        :param destination: the public key of the recipient agent.
+        :return: the serialized envelope.
+        """
+        agent_msg = _MESSAGE_DIALOGUE_ID_TAG + _encode_varint(dialogue_id) \
+            + _encode_field(_MESSAGE_DESTINATION_TAG, destination.encode("utf-8")) \
+            + self._fipa_field
+        return self._msg_id_field + _encode_field(_ENVELOPE_SEND_MESSAGE_TAG, agent_msg)
+
+    def frames(self) -> Iterator[bytes]:
+        """
+        Serialize the envelopes for all the recipients.
+
+        :return: an iterator over the serialized envelopes, in the order of the recipients.
+        """
+        for dialogue_id, destination in self.recipients:
+            yield self.to_bytes(dialogue_id, destination)
+
+
+class CFPBroadcast(Broadcast):
+    """
+    A :class:`.CFP` sent in many dialogues. See :class:`.Broadcast`.
+    """
+
+    def __init__(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int, query: CFP_TYPES):
+        """
+        Initialize a `Call For Proposal` to many recipients.
+
+        :param msg_id: the identifier of the message, the same in every dialogue.
+        :param recipients: the ``(dialogue_id, destination)`` pairs of the recipients.
+        :param target: the identifier of the message to whom this message is targeting.
+        :param query: the query, an instance of `~oef.schema.Query`, ``bytes``, or ``None``.
+        """
+        self.target = target
+        self.query = query
+        super().__init__(msg_id, recipients)
+
+    def fipa_pb(self) -> fipa_pb2.Fipa.Message:
+        return CFP.fipa_pb(self.target, self.query)
+
+
+class ProposeBroadcast(Broadcast):
+    """
+    A :class:`.Propose` sent in many dialogues. See :class:`.Broadcast`.
+    """
+
+    def __init__(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int, proposals: PROPOSE_TYPES):
+        """
+        Initialize a `Propose` to many recipients.
+
+        :param msg_id: the identifier of the message, the same in every dialogue.
+        :param recipients: the ``(dialogue_id, destination)`` pairs of the recipients.
+        :param target: the identifier of the message to whom this message is targeting.
+        :param proposals: a list of proposals. A proposal can be a `~oef.schema.Description` or ``bytes``.
+        """
+        self.target = target
+        self.proposals = proposals
+        super().__init__(msg_id, recipients)
+
+    def fipa_pb(self) -> fipa_pb2.Fipa.Message:
+        return Propose.fipa_pb(self.target, self.proposals)
+
+
 class Accept(AgentMessage):
     """
     This message is used to send an `Accept`.
@@ -539,19 +714,10 @@ class Accept(AgentMessage):
         self.destination = destination
         self.target = target
 
-    def to_pb(self) -> agent_pb2.Agent.Message:
-        fipa_msg = fipa_pb2.Fipa.Message()
-        fipa_msg.target = self.target
-        accept = fipa_pb2.Fipa.Accept()
-        fipa_msg.accept.CopyFrom(accept)
-        agent_msg = agent_pb2.Agent.Message()
-        agent_msg.dialogue_id = self.dialogue_id
-        agent_msg.destination = self.destination
-        agent_msg.fipa.CopyFrom(fipa_msg)
-
-        envelope = agent_pb2.Envelope()
-        envelope.msg_id = self.msg_id
-        envelope.send_message.CopyFrom(agent_msg)
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = self._send_message_pb(target)
+        envelope.send_message.fipa.target = self.target
+        envelope.send_message.fipa.accept.SetInParent()
         return envelope
 
 
@@ -589,17 +755,492 @@ class Decline(AgentMessage):
         self.destination = destination
         self.target = target
 
-    def to_pb(self):
-        fipa_msg = fipa_pb2.Fipa.Message()
-        fipa_msg.target = self.target
-        decline = fipa_pb2.Fipa.Decline()
-        fipa_msg.decline.CopyFrom(decline)
-        agent_msg = agent_pb2.Agent.Message()
-        agent_msg.dialogue_id = self.dialogue_id
-        agent_msg.destination = self.destination
-        agent_msg.fipa.CopyFrom(fipa_msg)
-
-        envelope = agent_pb2.Envelope()
-        envelope.msg_id = self.msg_id
-        envelope.send_message.CopyFrom(agent_msg)
+    def to_pb(self, target: Optional[agent_pb2.Envelope] = None) -> agent_pb2.Envelope:
+        envelope = self._send_message_pb(target)
+        envelope.send_message.fipa.target = self.target
+        envelope.send_message.fipa.decline.SetInParent()
         return envelope
+
+
+class InboundMessage(ABC):
+    """
+    A message received from the OEF Node, i.e. a decoded :class:`~oef.agent_pb2.Server.AgentMessage`.
+
+    The inbound messages are the counterpart of the messages above: they are decoded with
+    :func:`~oef.messages.InboundMessage.from_pb` or :func:`~oef.messages.InboundMessage.from_bytes`, and encoded
+    back with :func:`~oef.messages.InboundMessage.to_pb`. They only keep their fields, in ``__slots__``,
+    so they are cheaper to retain than the Protobuf objects they come from. Since one is created for every
+    message received, the constructors assign all the fields themselves, instead of chaining ``super().__init__``.
+
+    Calling the decoders on :class:`~oef.messages.InboundMessage` itself returns the subclass for the type
+    of the message; calling them on a subclass assumes that the message is of that type.
+    """
+
+    __slots__ = ("msg_id", )
+
+    case = None  # type: Optional[str]
+    """The type of the message. See :func:`~oef.core.OEFProxy.register_handler`."""
+
+    def __init__(self, msg_id: int):
+        """
+        Initialize an inbound message.
+
+        :param msg_id: the identifier of the message, i.e. the ``answer_id`` of the Protobuf message.
+        """
+        self.msg_id = msg_id
+
+    @classmethod
+    def from_pb(cls, msg: agent_pb2.Server.AgentMessage) -> 'InboundMessage':
+        """
+        Decode a message received from the OEF Node.
+
+        :param msg: the Protobuf message.
+        :return: the decoded message.
+        """
+        return decode_pb(msg)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'InboundMessage':
+        """
+        Decode a serialized message received from the OEF Node.
+
+        :param data: the serialized Protobuf message.
+        :return: the decoded message.
+        """
+        msg = agent_pb2.Server.AgentMessage()
+        msg.ParseFromString(data)
+        return cls.from_pb(msg)
+
+    @abstractmethod
+    def to_pb(self, target: Optional[agent_pb2.Server.AgentMessage] = None) -> agent_pb2.Server.AgentMessage:
+        """
+        Encode the message.
+
+        :param target: the Protobuf message to fill in. If ``None``, a new one is created.
+        :return: the Protobuf message.
+        """
+
+    def _fields(self) -> Tuple:
+        return tuple(getattr(self, name)
+                     for cls in reversed(type(self).__mro__) for name in getattr(cls, "__slots__", ()))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._fields() == other._fields()
+
+    def __repr__(self):
+        return "{}{}".format(type(self).__name__, self._fields())
+
+
+class InboundSearchResult(InboundMessage):
+    """The result of a search, i.e. the public keys of the agents found. See :class:`.SearchResult`."""
+
+    __slots__ = ("agents", )
+
+    case = "agents"
+
+    def __init__(self, msg_id: int, agents: List[str]):
+        self.msg_id = msg_id
+        self.agents = agents
+
+    @classmethod
+    def from_pb(cls, msg: agent_pb2.Server.AgentMessage) -> 'InboundSearchResult':
+        return cls(msg.answer_id, list(msg.agents.agents))
+
+    def to_pb(self, target: Optional[agent_pb2.Server.AgentMessage] = None) -> agent_pb2.Server.AgentMessage:
+        return SearchResult(self.msg_id, self.agents).to_pb(target)
+
+
+class InboundSearchResultWide(InboundMessage):
+    """The result of a search across the OEF Nodes, i.e. the agents found and the nodes they are connected to."""
+
+    __slots__ = ("items", )
+
+    case = "agents_wide"
+
+    def __init__(self, msg_id: int, items: List[SearchResultItem]):
+        self.msg_id = msg_id
+        self.items = items
+
+    @classmethod
+    def from_pb(cls, msg: agent_pb2.Server.AgentMessage) -> 'InboundSearchResultWide':
+        items = []
+        for item in msg.agents_wide.result:
+            core_key = str(item.key, 'ascii')
+            for agent in item.agents:
+                items.append(SearchResultItem(str(agent.key, 'ascii'), core_key, item.ip, item.port, item.distance))
+        return cls(msg.answer_id, items)
+
+    def to_pb(self, target: Optional[agent_pb2.Server.AgentMessage] = None) -> agent_pb2.Server.AgentMessage:
+        msg = agent_pb2.Server.AgentMessage() if target is None else target
+        msg.answer_id = self.msg_id
+        msg.agents_wide.SetInParent()
+        item_pb = None
+        for item in self.items:
+            # the consecutive agents of the same OEF Node are grouped in one item, as the OEF Node does.
+            if item_pb is None or item_pb.key != item.core_key.encode('ascii'):
+                item_pb = msg.agents_wide.result.add()
+                item_pb.key = item.core_key.encode('ascii')
+                item_pb.ip = item.core_addr
+                item_pb.port = item.core_port
+                item_pb.distance = item.distance
+            item_pb.agents.add().key = item.public_key.encode('ascii')
+        return msg
+
+
+class InboundOEFError(InboundMessage):
+    """An error of the OEF Node in one of the operations of the agent. See :class:`.OEFErrorMessage`."""
+
+    __slots__ = ("operation", )
+
+    case = "oef_error"
+
+    def __init__(self, msg_id: int, operation: OEFErrorOperation):
+        self.msg_id = msg_id
+        self.operation = operation
+
+    @classmethod
+    def from_pb(cls, msg: agent_pb2.Server.AgentMessage) -> 'InboundOEFError':
+        return cls(msg.answer_id, OEFErrorOperation(msg.oef_error.operation))
+
+    def to_pb(self, target: Optional[agent_pb2.Server.AgentMessage] = None) -> agent_pb2.Server.AgentMessage:
+        return OEFErrorMessage(self.msg_id, self.operation).to_pb(target)
+
+
+class InboundDialogueError(InboundMessage):
+    """An error in sending a message to another agent. See :class:`.DialogueErrorMessage`."""
+
+    __slots__ = ("dialogue_id", "origin")
+
+    case = "dialogue_error"
+
+    def __init__(self, msg_id: int, dialogue_id: int, origin: str):
+        self.msg_id = msg_id
+        self.dialogue_id = dialogue_id
+        self.origin = origin
+
+    @classmethod
+    def from_pb(cls, msg: agent_pb2.Server.AgentMessage) -> 'InboundDialogueError':
+        return cls(msg.answer_id, msg.dialogue_error.dialogue_id, msg.dialogue_error.origin)
+
+    def to_pb(self, target: Optional[agent_pb2.Server.AgentMessage] = None) -> agent_pb2.Server.AgentMessage:
+        return DialogueErrorMessage(self.msg_id, self.dialogue_id, self.origin).to_pb(target)
+
+
+class InboundAgentMessage(InboundMessage, ABC):
+    """
+    A message received from another agent. It is the counterpart of :class:`.AgentMessage`,
+    with the public key of the sender (``origin``) instead of the one of the recipient.
+    """
+
+    __slots__ = ("dialogue_id", "origin")
+
+    def __init__(self, msg_id: int, dialogue_id: int, origin: str):
+        self.msg_id = msg_id
+        self.dialogue_id = dialogue_id
+        self.origin = origin
+
+    @classmethod
+    def from_pb(cls, msg: agent_pb2.Server.AgentMessage) -> InboundMessage:
+        if cls.case is None:
+            return decode_pb(msg)
+        return cls._from_payload(msg.answer_id, msg.content.dialogue_id, msg.content.origin, msg.content)
+
+    @classmethod
+    def from_send_message(cls, msg_id: int, origin: str,
+                          send_message: agent_pb2.Agent.Message) -> InboundMessage:
+        """
+        Decode a message sent by an agent, as it is delivered to its recipient.
+        This is what an OEF Node does, e.g. :class:`~oef.proxy.OEFLocalProxy.LocalNode`.
+
+        :param msg_id: the identifier of the message, i.e. the ``msg_id`` of the envelope.
+        :param origin: the public key of the sender agent.
+        :param send_message: the ``send_message`` field of the envelope.
+        :return: the decoded message, an :class:`.InboundUnknown` if its type is not known.
+        """
+        if cls.case is None:
+            cls = _AGENT_MESSAGE_CLASSES.get(_payload_case(send_message))
+            if cls is None:
+                msg = agent_pb2.Server.AgentMessage()
+                msg.answer_id = msg_id
+                msg.content.dialogue_id = send_message.dialogue_id
+                msg.content.origin = origin
+                return InboundUnknown.from_pb(msg)
+        return cls._from_payload(msg_id, send_message.dialogue_id, origin, send_message)
+
+    @classmethod
+    @abstractmethod
+    def _from_payload(cls, msg_id: int, dialogue_id: int, origin: str, payload) -> 'InboundAgentMessage':
+        """
+        Decode the payload of a message from another agent.
+
+        :param msg_id: the identifier of the message.
+        :param dialogue_id: the identifier of the dialogue.
+        :param origin: the public key of the sender agent.
+        :param payload: the Protobuf object with the ``payload`` oneof, i.e. a
+                      | :class:`~oef.agent_pb2.Server.AgentMessage.Content` or a :class:`~oef.agent_pb2.Agent.Message`.
+        :return: the decoded message.
+        """
+
+    def to_pb(self, target: Optional[agent_pb2.Server.AgentMessage] = None) -> agent_pb2.Server.AgentMessage:
+        msg = agent_pb2.Server.AgentMessage() if target is None else target
+        msg.answer_id = self.msg_id
+        msg.content.dialogue_id = self.dialogue_id
+        msg.content.origin = self.origin
+        self._payload_to_pb(msg.content)
+        return msg
+
+    @abstractmethod
+    def _payload_to_pb(self, content: agent_pb2.Server.AgentMessage.Content) -> None:
+        """
+        Encode the payload of the message.
+
+        :param content: the ``content`` field of the Protobuf message.
+        :return: ``None``
+        """
+
+
+class InboundMessageContent(InboundAgentMessage):
+    """A simple message, i.e. a sequence of bytes. See :class:`.Message`."""
+
+    __slots__ = ("content", )
+
+    case = "content"
+
+    def __init__(self, msg_id: int, dialogue_id: int, origin: str, content: bytes):
+        self.msg_id = msg_id
+        self.dialogue_id = dialogue_id
+        self.origin = origin
+        self.content = content
+
+    @classmethod
+    def _from_payload(cls, msg_id: int, dialogue_id: int, origin: str, payload) -> 'InboundMessageContent':
+        return cls(msg_id, dialogue_id, origin, payload.content)
+
+    def _payload_to_pb(self, content: agent_pb2.Server.AgentMessage.Content) -> None:
+        content.content = self.content
+
+
+class InboundFipaMessage(InboundAgentMessage, ABC):
+    """A FIPA message, i.e. a message of a negotiation, targeting a previous message of the dialogue."""
+
+    __slots__ = ("target", )
+
+    def __init__(self, msg_id: int, dialogue_id: int, origin: str, target: int):
+        self.msg_id = msg_id
+        self.dialogue_id = dialogue_id
+        self.origin = origin
+        self.target = target
+
+    @classmethod
+    def _from_payload(cls, msg_id: int, dialogue_id: int, origin: str, payload) -> 'InboundFipaMessage':
+        return cls._from_fipa(msg_id, dialogue_id, origin, payload.fipa)
+
+    @classmethod
+    @abstractmethod
+    def _from_fipa(cls, msg_id: int, dialogue_id: int, origin: str,
+                   fipa: fipa_pb2.Fipa.Message) -> 'InboundFipaMessage':
+        """Decode the FIPA payload of a message from another agent."""
+
+    def _payload_to_pb(self, content: agent_pb2.Server.AgentMessage.Content) -> None:
+        content.fipa.target = self.target
+        self._fipa_to_pb(content.fipa)
+
+    @abstractmethod
+    def _fipa_to_pb(self, fipa: fipa_pb2.Fipa.Message) -> None:
+        """Encode the FIPA payload of the message, except the target."""
+
+
+class InboundCFP(InboundFipaMessage):
+    """
+    A `Call For Proposals`. See :class:`.CFP`.
+    A query is decoded as a :class:`~oef.query.LazyQuery`, i.e. only when it is accessed.
+    """
+
+    __slots__ = ("query", )
+
+    case = "fipa.cfp"
+
+    def __init__(self, msg_id: int, dialogue_id: int, origin: str, target: int, query: CFP_TYPES):
+        self.msg_id = msg_id
+        self.dialogue_id = dialogue_id
+        self.origin = origin
+        self.target = target
+        self.query = query
+
+    @classmethod
+    def _from_fipa(cls, msg_id: int, dialogue_id: int, origin: str, fipa: fipa_pb2.Fipa.Message) -> 'InboundCFP':
+        cfp_case = fipa.cfp.WhichOneof("payload")
+        if cfp_case == "nothing":
+            query = None
+        elif cfp_case == "content":
+            query = fipa.cfp.content
+        elif cfp_case == "query":
+            query = LazyQuery(fipa.cfp.query)
+        else:
+            raise Exception("Query type not valid.")
+        return cls(msg_id, dialogue_id, origin, fipa.target, query)
+
+    def _fipa_to_pb(self, fipa: fipa_pb2.Fipa.Message) -> None:
+        CFP.fipa_pb(self.target, self.query, fipa)
+
+
+class InboundPropose(InboundFipaMessage):
+    """
+    A `Propose`. See :class:`.Propose`.
+    The proposals are decoded as :class:`~oef.schema.LazyDescription`, i.e. only when they are accessed,
+    or taken from the :data:`~oef.schema.description_cache` if it is enabled.
+    """
+
+    __slots__ = ("proposals", )
+
+    case = "fipa.propose"
+
+    def __init__(self, msg_id: int, dialogue_id: int, origin: str, target: int, proposals: PROPOSE_TYPES):
+        self.msg_id = msg_id
+        self.dialogue_id = dialogue_id
+        self.origin = origin
+        self.target = target
+        self.proposals = proposals
+
+    @classmethod
+    def _from_fipa(cls, msg_id: int, dialogue_id: int, origin: str,
+                   fipa: fipa_pb2.Fipa.Message) -> 'InboundPropose':
+        if fipa.propose.WhichOneof("payload") == "content":
+            proposals = fipa.propose.content
+        elif description_cache.enabled:
+            proposals = [description_cache.from_pb(proposal) for proposal in fipa.propose.proposals.objects]
+        else:
+            proposals = [LazyDescription(proposal) for proposal in fipa.propose.proposals.objects]
+        return cls(msg_id, dialogue_id, origin, fipa.target, proposals)
+
+    def _fipa_to_pb(self, fipa: fipa_pb2.Fipa.Message) -> None:
+        Propose.fipa_pb(self.target, self.proposals, fipa)
+
+
+class InboundAccept(InboundFipaMessage):
+    """An `Accept`. See :class:`.Accept`."""
+
+    __slots__ = ()
+
+    case = "fipa.accept"
+
+    @classmethod
+    def _from_fipa(cls, msg_id: int, dialogue_id: int, origin: str,
+                   fipa: fipa_pb2.Fipa.Message) -> 'InboundAccept':
+        return cls(msg_id, dialogue_id, origin, fipa.target)
+
+    def _fipa_to_pb(self, fipa: fipa_pb2.Fipa.Message) -> None:
+        fipa.accept.SetInParent()
+
+
+class InboundDecline(InboundFipaMessage):
+    """A `Decline`. See :class:`.Decline`."""
+
+    __slots__ = ()
+
+    case = "fipa.decline"
+
+    @classmethod
+    def _from_fipa(cls, msg_id: int, dialogue_id: int, origin: str,
+                   fipa: fipa_pb2.Fipa.Message) -> 'InboundDecline':
+        return cls(msg_id, dialogue_id, origin, fipa.target)
+
+    def _fipa_to_pb(self, fipa: fipa_pb2.Fipa.Message) -> None:
+        fipa.decline.SetInParent()
+
+
+class InboundUnknown(InboundMessage):
+    """
+    A message of a type this SDK does not know, e.g. from a newer OEF Node.
+    It keeps the Protobuf message, so that a fallback handler can still inspect it.
+    """
+
+    __slots__ = ("case", "pb")
+
+    def __init__(self, msg_id: int, case: Optional[str], pb: agent_pb2.Server.AgentMessage):
+        super().__init__(msg_id)
+        self.case = case
+        self.pb = pb
+
+    @classmethod
+    def from_pb(cls, msg: agent_pb2.Server.AgentMessage) -> 'InboundUnknown':
+        return cls(msg.answer_id, _dispatch_case(msg), msg)
+
+    def to_pb(self, target: Optional[agent_pb2.Server.AgentMessage] = None) -> agent_pb2.Server.AgentMessage:
+        if target is None:
+            return self.pb
+        target.CopyFrom(self.pb)
+        return target
+
+
+_MESSAGE_CLASSES = {
+    cls.case: cls for cls in (InboundSearchResult, InboundSearchResultWide, InboundOEFError, InboundDialogueError)
+}
+
+_AGENT_MESSAGE_CLASSES = {
+    cls.case: cls for cls in (InboundMessageContent, InboundCFP, InboundPropose, InboundAccept, InboundDecline)
+}
+
+_FIPA_CLASSES = {cls.case[len("fipa."):]: cls for cls in (InboundCFP, InboundPropose, InboundAccept, InboundDecline)}
+
+
+def _payload_case(payload) -> Optional[str]:
+    """
+    Get the type of the payload of a message from another agent.
+
+    :param payload: a :class:`~oef.agent_pb2.Server.AgentMessage.Content` or a :class:`~oef.agent_pb2.Agent.Message`.
+    :return: the type of the message, e.g. ``"content"`` or ``"fipa.cfp"``.
+    """
+    case = payload.WhichOneof("payload")
+    if case == "fipa":
+        fipa_case = payload.fipa.WhichOneof("msg")
+        return "fipa." + fipa_case if fipa_case is not None else None
+    return case
+
+
+def _dispatch_case(msg: agent_pb2.Server.AgentMessage) -> Optional[str]:
+    """
+    Get the type of a message received from the OEF Node.
+
+    :param msg: the message.
+    :return: the type of the message. See :func:`~oef.core.OEFProxy.register_handler`.
+    """
+    case = msg.WhichOneof("payload")
+    if case == "content":
+        return _payload_case(msg.content)
+    return case
+
+
+def decode_pb(msg: agent_pb2.Server.AgentMessage) -> InboundMessage:
+    """
+    Decode a message received from the OEF Node. This is the single decoder of the incoming messages,
+    used by :func:`~oef.core.OEFProxy.loop`, so every field is read only once.
+
+    :param msg: the Protobuf message.
+    :return: the decoded message, an :class:`.InboundUnknown` if its type is not known.
+    """
+    case = msg.WhichOneof("payload")
+    if case != "content":
+        return _MESSAGE_CLASSES.get(case, InboundUnknown).from_pb(msg)
+    content = msg.content
+    payload_case = content.WhichOneof("payload")
+    if payload_case == "content":
+        return InboundMessageContent(msg.answer_id, content.dialogue_id, content.origin, content.content)
+    if payload_case == "fipa":
+        fipa = content.fipa
+        cls = _FIPA_CLASSES.get(fipa.WhichOneof("msg"))
+        if cls is not None:
+            return cls._from_fipa(msg.answer_id, content.dialogue_id, content.origin, fipa)
+    return InboundUnknown.from_pb(msg)
+
+
+def decode(data: bytes) -> InboundMessage:
+    """
+    Decode a serialized message received from the OEF Node.
+
+    :param data: the serialized Protobuf message.
+    :return: the decoded message. See :func:`~oef.messages.decode_pb`.
+    """
+    msg = agent_pb2.Server.AgentMessage()
+    msg.ParseFromString(data)
+    return decode_pb(msg)
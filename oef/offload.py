@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+
+oef.offload
+~~~~~~~~~~~
+
+This module implements the execution of CPU-bound message handlers outside of the event loop.
+
+A handler decorated with :func:`~oef.offload.offload` runs in the executor of its agent, so that the event loop
+keeps reading and dispatching the other messages in the meantime. The handler is awaited by the agent loop,
+hence the messages of the same dialogue are still handled in order. The messages sent by the handler with the
+(synchronous) ``send_*`` methods of the agent are passed back to the event loop with
+:meth:`~asyncio.AbstractEventLoop.call_soon_threadsafe`.
+
+Handlers that use the agent must run in threads, i.e. with a :class:`~concurrent.futures.ThreadPoolExecutor`.
+To use a :class:`~concurrent.futures.ProcessPoolExecutor`, move the computation into a module-level function,
+run it with :func:`~oef.offload.Offloader.run` and send the answer from the event loop, e.g.::
+
+    async def async_on_cfp(self, msg_id, dialogue_id, origin, target, query):
+        price = await self.offloader.run(compute_price, query)
+        self.send_propose(msg_id + 1, dialogue_id, origin, msg_id, [Description({"price": price})])
+
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+_worker_state = threading.local()
+
+
+def in_worker() -> bool:
+    """
+    Check whether the caller is running in a worker of an :class:`~oef.offload.Offloader`.
+
+    :return: ``True`` if the caller runs in a worker, ``False`` otherwise.
+    """
+    return getattr(_worker_state, "active", False)
+
+
+def _timed_call(fn: Callable, args: Tuple) -> Tuple[bool, Any, float, float]:
+    """
+    Run a function in a worker, and time it.
+
+    :param fn: the function.
+    :param args: the positional arguments of the function.
+    :return: whether the function returned, its result or exception, the start and end times.
+    """
+    _worker_state.active = True
+    start = time.monotonic()
+    try:
+        return True, fn(*args), start, time.monotonic()
+    except Exception as e:
+        return False, e, start, time.monotonic()
+    finally:
+        _worker_state.active = False
+
+
+class OffloadStats:
+    """Latency and utilisation metrics of the functions run by an :class:`~oef.offload.Offloader`."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        """The number of workers of the executor."""
+        self.submitted = 0
+        """The number of functions submitted."""
+        self.completed = 0
+        """The number of functions that returned."""
+        self.failed = 0
+        """The number of functions that raised an exception."""
+        self.in_flight = 0
+        """The number of functions submitted and not finished yet."""
+        self.peak_in_flight = 0
+        """The maximum number of functions in flight at the same time."""
+        self.total_wait = 0.0
+        """The total time (in seconds) spent by the functions waiting for a worker."""
+        self.max_wait = 0.0
+        """The maximum time (in seconds) spent by a function waiting for a worker."""
+        self.total_run = 0.0
+        """The total time (in seconds) spent running the functions."""
+        self.max_run = 0.0
+        """The maximum time (in seconds) spent running a function."""
+        self.started = time.monotonic()
+        """When the metrics have been reset."""
+
+    @property
+    def mean_wait(self) -> float:
+        """The mean time (in seconds) spent by a function waiting for a worker."""
+        finished = self.completed + self.failed
+        return self.total_wait / finished if finished else 0.0
+
+    @property
+    def mean_run(self) -> float:
+        """The mean time (in seconds) spent running a function."""
+        finished = self.completed + self.failed
+        return self.total_run / finished if finished else 0.0
+
+    @property
+    def utilisation(self) -> float:
+        """The fraction of the worker time spent running functions, since the metrics have been reset."""
+        elapsed = (time.monotonic() - self.started) * self.workers
+        return min(self.total_run / elapsed, 1.0) if elapsed > 0 else 0.0
+
+    def reset(self) -> None:
+        """
+        Reset the metrics, e.g. at the beginning of a measurement window.
+
+        :return: ``None``
+        """
+        self.__init__(self.workers)
+
+    def __repr__(self):
+        return "OffloadStats(submitted={}, completed={}, failed={}, in_flight={}, mean_wait={:.6f}, " \
+               "mean_run={:.6f}, utilisation={:.2f})".format(self.submitted, self.completed, self.failed,
+                                                             self.in_flight, self.mean_wait, self.mean_run,
+                                                             self.utilisation)
+
+
+class Offloader:
+    """
+    Run functions in an executor, out of the event loop, and collect their metrics.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, max_workers: Optional[int] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Initialize the offloader.
+
+        :param executor: the executor that runs the functions. If ``None``, a
+                       | :class:`~concurrent.futures.ThreadPoolExecutor` is created when first needed,
+                       | and shut down by :func:`~oef.offload.Offloader.close`.
+        :param max_workers: the number of threads of the executor created by default. By default, the number of CPUs.
+        :param loop: the event loop.
+        """
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._loop = loop if loop is not None else asyncio.get_event_loop()
+        workers = getattr(executor, "_max_workers", None) if executor is not None else max_workers
+        self.stats = OffloadStats(workers or os.cpu_count() or 1)
+
+    @property
+    def executor(self) -> Executor:
+        """The executor that runs the functions."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.stats.workers)
+        return self._executor
+
+    @property
+    def runs_in_processes(self) -> bool:
+        """Whether the functions run in other processes, so they cannot use the agent."""
+        return isinstance(self._executor, ProcessPoolExecutor)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        Run a function in the executor.
+
+        :param fn: the function. With a :class:`~concurrent.futures.ProcessPoolExecutor`, it must be picklable,
+                 | e.g. a module-level function.
+        :param args: the positional arguments of the function.
+        :return: the result of the function.
+        :raises Exception: the exception raised by the function, if any.
+        """
+        stats = self.stats
+        stats.submitted += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        submitted = time.monotonic()
+        try:
+            returned, value, start, end = await self._loop.run_in_executor(self.executor, _timed_call, fn, args)
+        finally:
+            stats.in_flight -= 1
+
+        wait, run = max(start - submitted, 0.0), end - start
+        stats.total_wait += wait
+        stats.max_wait = max(stats.max_wait, wait)
+        stats.total_run += run
+        stats.max_run = max(stats.max_run, run)
+        if not returned:
+            stats.failed += 1
+            raise value
+        stats.completed += 1
+        return value
+
+    def call_in_loop(self, fn: Callable, *args) -> None:
+        """
+        Call a function in the event loop: immediately if the caller is in the event loop,
+        later if it is in a worker.
+
+        :param fn: the function.
+        :param args: the positional arguments of the function.
+        :return: ``None``
+        """
+        if in_worker():
+            self._loop.call_soon_threadsafe(fn, *args)
+        else:
+            fn(*args)
+
+    def close(self) -> None:
+        """
+        Shut down the executor created by default, if any. It is created again when needed.
+
+        :return: ``None``
+        """
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def offload(handler: Callable) -> Callable:
+    """
+    Decorator for the message handlers (e.g. ``on_cfp``) of an agent or of a dialogue,
+    to run them in the executor of the agent (see :attr:`~oef.agents.Agent.offloader`).
+
+    Called from the event loop, the decorated handler returns an :class:`asyncio.Future`, which is awaited
+    by the agent loop. Called from a worker, it runs the handler directly.
+
+    :param handler: the handler.
+    :return: the decorated handler.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(self, *args):
+        if in_worker():
+            return handler(self, *args)
+        # dialogues use the offloader of their agent.
+        offloader = getattr(self, "agent", self).offloader  # type: Offloader
+        if offloader.runs_in_processes:
+            raise TypeError("The handler {} uses the agent, so it cannot run in another process. "
+                            "Use a ThreadPoolExecutor, or Offloader.run.".format(handler.__name__))
+        return asyncio.ensure_future(offloader.run(handler, self, *args), loop=offloader._loop)
+
+    wrapper.offloaded = True
+    return wrapper
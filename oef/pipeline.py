@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+
+oef.pipeline
+~~~~~~~~~~~~
+
+This module implements the bounded queue between the reader stage and the dispatcher stage
+of :func:`~oef.core.OEFProxy.loop`.
+
+The reader stage pulls the frames off the connection and puts them in a :class:`~oef.pipeline.FramePipeline`,
+while the dispatcher stage takes them out, parses them and runs their handlers. When the dispatcher
+falls behind, the queue fills up to its depth, and the :class:`~oef.pipeline.PipelineOverflowPolicy`
+decides what happens to the frames read next.
+
+"""
+
+import asyncio
+import collections
+import logging
+from enum import Enum
+from typing import Deque, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineOverflowPolicy(Enum):
+    """What the reader stage does when the queue of a :class:`~oef.pipeline.FramePipeline` is full."""
+
+    BLOCK = "block"
+    """Stop reading until the dispatcher has taken the queued frames. The frames received meanwhile stay in the
+    connection, which stops reading from the socket above the high-water mark of its ``read_buffer_limits``."""
+    DROP_NEWEST = "drop_newest"
+    """Drop the frames just read that do not fit in the queue, with a warning."""
+    DROP_OLDEST = "drop_oldest"
+    """Drop the oldest frames in the queue to make room for the frames just read, with a warning."""
+
+
+class PipelineStats:
+    """Metrics about the stages of a :class:`~oef.pipeline.FramePipeline`. Times are in seconds."""
+
+    def __init__(self):
+        self.frames_read = 0
+        """The number of frames read by the reader stage."""
+        self.read_time = 0.0
+        """The time spent by the reader stage waiting for frames from the connection."""
+        self.blocked_time = 0.0
+        """The time spent by the reader stage waiting for room in the queue."""
+        self.depth = 0
+        """The number of frames in the queue."""
+        self.peak_depth = 0
+        """The maximum number of frames in the queue at the same time."""
+        self.dropped = 0
+        """The number of frames dropped because the queue was full."""
+        self.queue_time = 0.0
+        """The total time spent by the frames in the queue."""
+        self.frames_dispatched = 0
+        """The number of frames taken by the dispatcher stage."""
+        self.idle_time = 0.0
+        """The time spent by the dispatcher stage waiting for frames."""
+        self.dispatch_time = 0.0
+        """The time spent by the dispatcher stage parsing the frames and running their handlers."""
+
+    @property
+    def mean_queue_latency(self) -> float:
+        """The mean time spent by a frame in the queue."""
+        return self.queue_time / self.frames_dispatched if self.frames_dispatched else 0.0
+
+    def __repr__(self):
+        return "PipelineStats(frames_read={}, frames_dispatched={}, dropped={}, peak_depth={}, read_time={:.6f}, " \
+               "blocked_time={:.6f}, idle_time={:.6f}, dispatch_time={:.6f}, mean_queue_latency={:.6f})"\
+            .format(self.frames_read, self.frames_dispatched, self.dropped, self.peak_depth, self.read_time,
+                    self.blocked_time, self.idle_time, self.dispatch_time, self.mean_queue_latency)
+
+
+class FramePipeline:
+    """
+    A bounded queue of frames, between the reader stage and the dispatcher stage of an agent loop.
+    """
+
+    def __init__(self, depth: int, policy: PipelineOverflowPolicy = PipelineOverflowPolicy.BLOCK,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Initialize the pipeline.
+
+        :param depth: the maximum number of frames in the queue. With :attr:`~PipelineOverflowPolicy.BLOCK`,
+                    | the frames read at once are queued together as soon as the queue is below its depth,
+                    | so the queue can exceed it by the frames of one read.
+        :param policy: what to do with the frames read when the queue is full.
+        :param loop: the event loop.
+        """
+        if depth < 1:
+            raise ValueError("The depth of the pipeline must be positive.")
+        self.depth = depth
+        self.policy = policy
+        self._loop = loop if loop is not None else asyncio.get_event_loop()
+        self._bursts = collections.deque()  # type: Deque[Tuple[float, List[bytes]]]
+        self._getter = None  # type: Optional[asyncio.Future]
+        self._putter = None  # type: Optional[asyncio.Future]
+        self._exception = None  # type: Optional[BaseException]
+        self._last_get = None  # type: Optional[float]
+        self.stats = PipelineStats()
+
+    async def put(self, frames: List[bytes]) -> None:
+        """
+        Queue the frames read from the connection, applying the overflow policy if the queue is full.
+
+        :param frames: the frames.
+        :return: ``None``, once the frames have been queued or dropped.
+        """
+        stats = self.stats
+        stats.frames_read += len(frames)
+        if self.policy == PipelineOverflowPolicy.BLOCK:
+            start = self._loop.time()
+            while stats.depth >= self.depth:
+                self._putter = self._loop.create_future()
+                await self._putter
+            stats.blocked_time += self._loop.time() - start
+        else:
+            frames = self._make_room(frames)
+        if not frames:
+            return
+        self._bursts.append((self._loop.time(), frames))
+        stats.depth += len(frames)
+        stats.peak_depth = max(stats.peak_depth, stats.depth)
+        self._wake(self._getter)
+
+    def _make_room(self, frames: List[bytes]) -> List[bytes]:
+        """
+        Drop frames, according to the overflow policy, so that the frames just read fit in the queue.
+
+        :param frames: the frames just read.
+        :return: the frames just read to be queued.
+        """
+        overflow = self.stats.depth + len(frames) - self.depth
+        if overflow <= 0:
+            return frames
+        logger.warning("Pipeline full: dropping {} frames ({}).".format(overflow, self.policy.value))
+        self.stats.dropped += overflow
+        if self.policy == PipelineOverflowPolicy.DROP_NEWEST:
+            return frames[:len(frames) - overflow]
+        while overflow > 0 and self._bursts:
+            queued_at, burst = self._bursts.popleft()
+            dropped = min(overflow, len(burst))
+            if dropped < len(burst):
+                self._bursts.appendleft((queued_at, burst[dropped:]))
+            self.stats.depth -= dropped
+            overflow -= dropped
+        return frames[overflow:]
+
+    async def get_many(self) -> List[bytes]:
+        """
+        Take all the frames in the queue, waiting for at least one.
+
+        :return: the frames, in order of arrival.
+        :raises Exception: the exception that stopped the reader stage, once the queue is empty.
+        """
+        stats = self.stats
+        start = self._loop.time()
+        if self._last_get is not None:
+            stats.dispatch_time += start - self._last_get
+            self._last_get = None
+        while not self._bursts:
+            if self._exception is not None:
+                raise self._exception
+            self._getter = self._loop.create_future()
+            await self._getter
+        end = self._loop.time()
+        stats.idle_time += end - start
+
+        frames = []  # type: List[bytes]
+        for queued_at, burst in self._bursts:
+            stats.queue_time += (end - queued_at) * len(burst)
+            frames.extend(burst)
+        self._bursts.clear()
+        stats.depth = 0
+        stats.frames_dispatched += len(frames)
+        self._last_get = end
+        self._wake(self._putter)
+        return frames
+
+    def close(self, exception: BaseException) -> None:
+        """
+        Stop the pipeline: once the queue is empty, :func:`~oef.pipeline.FramePipeline.get_many` raises
+        the exception.
+
+        :param exception: the exception that stopped the reader stage.
+        :return: ``None``
+        """
+        self._exception = exception
+        self._wake(self._getter)
+
+    @staticmethod
+    def _wake(waiter: Optional[asyncio.Future]) -> None:
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
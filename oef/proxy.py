@@ -30,30 +30,88 @@ This module defines the proxies classes used by agents to interact with an OEF N
 
 import asyncio
 import logging
-import struct
-from collections import defaultdict
-from typing import Optional, Awaitable, Tuple, List, Dict
+import random
+from collections import defaultdict, deque
+from typing import Optional, Awaitable, Tuple, List, Dict, Deque
 
 import oef.agent_pb2 as agent_pb2
-from oef.core import OEFProxy
-from oef.messages import Message, CFP_TYPES, PROPOSE_TYPES, CFP, Propose, Accept, Decline, BaseMessage, \
-    AgentMessage, RegisterDescription, RegisterService, UnregisterDescription, \
+from oef.chunking import DEFAULT_MAX_CONTENT_SIZE
+from oef.core import OEFProxy, DEFAULT_MAX_BATCH_SIZE
+from oef.messages import Message, CFP_TYPES, PROPOSE_TYPES, RECIPIENTS_TYPES, CFP, Propose, Accept, Decline, \
+    BaseMessage, AgentMessage, Broadcast, CFPBroadcast, ProposeBroadcast, RegisterDescription, RegisterService, UnregisterDescription, \
     UnregisterService, SearchAgents, SearchServices, SearchServicesWide, OEFErrorOperation, SearchResult, \
-    OEFErrorMessage, DialogueErrorMessage
+    OEFErrorMessage, DialogueErrorMessage, InboundAgentMessage
+from oef.pipeline import PipelineOverflowPolicy
 from oef.query import Query
 from oef.schema import Description
+from oef.transport import OEFConnectionError, OEFProtocol, OverflowPolicy, OEFWriteBufferFullError, SocketOptions, \
+    OEFFrameTooLargeError, DEFAULT_READ_BUFFER_LIMITS
 
 logger = logging.getLogger(__name__)
 
 
 DEFAULT_OEF_NODE_PORT = 3333
+UNIX_SOCKET_SCHEME = "unix://"
 
 
-class OEFConnectionError(ConnectionError):
+class ReconnectPolicy:
     """
-    This exception is used whenever an error occurs during the connection to the OEF Node.
+    The policy used by :class:`~oef.proxy.OEFNetworkProxy` to reconnect automatically
+    when the connection with the OEF Node drops.
+
+    The delay before the n-th attempt grows exponentially, i.e. ``min(max_delay, base_delay * 2 ** n)``,
+    and it is randomly reduced by up to a ``jitter`` fraction, so that many agents do not reconnect all at once.
     """
 
+    def __init__(self, max_attempts: Optional[int] = None,
+                 base_delay: float = 0.1,
+                 max_delay: float = 30.0,
+                 jitter: float = 0.5,
+                 replay_buffer_size: int = 1024):
+        """
+        Initialize a reconnect policy.
+
+        :param max_attempts: the maximum number of attempts before giving up. ``None`` means no limit.
+        :param base_delay: the delay (in seconds) before the first attempt.
+        :param max_delay: the maximum delay (in seconds) between two attempts.
+        :param jitter: the maximum fraction of the delay that is randomly removed, between 0 and 1.
+        :param replay_buffer_size: the maximum number of messages sent while disconnected that are kept,
+                                 | and sent once the connection has been reestablished.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.replay_buffer_size = replay_buffer_size
+
+    def delay(self, attempt: int) -> float:
+        """
+        Compute the delay before an attempt.
+
+        :param attempt: the number of the attempt, starting from 0.
+        :return: the delay, in seconds.
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return delay * (1 - self.jitter * random.random())
+
+
+class ReconnectStats:
+    """Metrics about the automatic reconnections of a :class:`~oef.proxy.OEFNetworkProxy`."""
+
+    def __init__(self):
+        self.reconnects = 0
+        """The number of successful reconnections."""
+        self.failed_attempts = 0
+        """The number of failed connection attempts."""
+        self.last_latency = None  # type: Optional[float]
+        """The time (in seconds) between the loss of the connection and the last successful reconnection."""
+        self.total_latency = 0.0
+        """The total time (in seconds) spent reconnecting."""
+        self.replayed_frames = 0
+        """The number of messages sent while disconnected, and replayed after a reconnection."""
+        self.dropped_frames = 0
+        """The number of messages sent while disconnected, and dropped because the replay buffer was full."""
+
 
 class OEFNetworkProxy(OEFProxy):
     """
@@ -67,24 +125,91 @@ class OEFNetworkProxy(OEFProxy):
     """
 
     def __init__(self, public_key: str, oef_addr: str, port: int = DEFAULT_OEF_NODE_PORT,
-                 loop: asyncio.AbstractEventLoop = None) -> None:
+                 loop: asyncio.AbstractEventLoop = None,
+                 batch_writes: bool = False,
+                 write_buffer_limits: Optional[Tuple[int, int]] = None,
+                 read_buffer_limits: Optional[Tuple[int, int]] = DEFAULT_READ_BUFFER_LIMITS,
+                 overflow_policy: Optional[OverflowPolicy] = None,
+                 reconnect_policy: Optional[ReconnectPolicy] = None,
+                 socket_options: Optional[SocketOptions] = None,
+                 max_frame_size: Optional[int] = None,
+                 max_concurrent_handlers: Optional[int] = None,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_linger: float = 0.0,
+                 pipeline_depth: Optional[int] = None,
+                 pipeline_policy: PipelineOverflowPolicy = PipelineOverflowPolicy.BLOCK,
+                 max_content_size: Optional[int] = DEFAULT_MAX_CONTENT_SIZE) -> None:
         """
         Initialize the proxy to the OEF Node.
 
         :param public_key: the public key used in the protocols.
-        :param oef_addr: the IP address of the OEF node.
-        :param port: port number for the connection.
+        :param oef_addr: the IP address of the OEF node, or ``unix://<path>`` to connect to a
+                       | co-located OEF Node through a Unix domain socket.
+        :param port: port number for the connection. Ignored for Unix domain sockets.
         :param loop: the event loop.
+        :param batch_writes: if ``True``, the messages sent during one iteration of the event loop
+                           | are written to the socket all together, at the end of the iteration.
+        :param write_buffer_limits: the high-water and low-water marks (in bytes) of the write buffer.
+                                  | If ``None``, the defaults of the transport are used.
+        :param read_buffer_limits: the high-water and low-water marks (in bytes) of the messages received
+                                 | but not handled yet. Above the high-water mark, the proxy stops reading
+                                 | from the connection until they are handled. ``None`` means no limit.
+        :param overflow_policy: what the synchronous send methods do when the write buffer is above
+                              | its high-water mark. If ``None``, the messages are buffered anyway.
+        :param reconnect_policy: if provided, when the connection drops the proxy reconnects automatically,
+                               | registers again the last registered descriptions, and sends the messages
+                               | sent in the meanwhile. See :class:`~oef.proxy.ReconnectPolicy`.
+        :param socket_options: the options to set on the socket after connecting.
+                             | The values in effect are available in ``effective_socket_options``.
+        :param max_frame_size: the maximum size (in bytes) of a message, sent or received. Sending a larger message
+                             | raises :class:`~oef.transport.OEFFrameTooLargeError`; receiving one closes the
+                             | connection. ``None`` means no limit. Large contents can be sent in chunks
+                             | with :func:`~oef.core.OEFProxy.send_message_chunked`.
+        :param max_concurrent_handlers: the maximum number of message handlers running concurrently.
+                                      | If ``None``, the messages are handled one at a time.
+                                      | See :func:`~oef.core.OEFProxy.loop`.
+        :param max_batch_size: the maximum number of simple messages delivered in a batch,
+                             | to the agents that implement :attr:`~oef.core.DialogueInterface.on_message_batch`.
+        :param max_linger: how long (in seconds) a batch waits for more messages before being delivered.
+        :param pipeline_depth: if provided, the frames are read from the connection while the handlers run,
+                             | and up to this number of frames are queued for the handlers.
+        :param pipeline_policy: what to do with the frames read when the queue is full.
+        :param max_content_size: the maximum size (in bytes) of a content received in chunks, and of the chunks
+                               | buffered by the pending transfers of every sender. Larger transfers are
+                               | discarded. ``None`` means no limit.
         """
-        super().__init__(public_key, loop=loop)
+        super().__init__(public_key, loop=loop, max_concurrent_handlers=max_concurrent_handlers,
+                         max_batch_size=max_batch_size, max_linger=max_linger,
+                         pipeline_depth=pipeline_depth, pipeline_policy=pipeline_policy,
+                         max_content_size=max_content_size)
 
         self.oef_addr = oef_addr
         self.port = port
+        self.unix_path = oef_addr[len(UNIX_SOCKET_SCHEME):] if oef_addr.startswith(UNIX_SOCKET_SCHEME) else None
+        self.batch_writes = batch_writes
+        self.write_buffer_limits = write_buffer_limits
+        self.read_buffer_limits = read_buffer_limits
+        self.overflow_policy = overflow_policy
+        self.dropped_messages = 0
+        self.reconnect_policy = reconnect_policy
+        self.reconnect_stats = ReconnectStats()
+        self.reconnect_error = None  # type: Optional[OEFConnectionError]
+        """Why the last reconnection failed, if it did. It is cleared by :func:`~oef.proxy.OEFNetworkProxy.connect`."""
+        self.socket_options = socket_options
+        self.max_frame_size = max_frame_size
+        self.effective_socket_options = {}  # type: Dict[str, int]
+
+        # the last registered descriptions, registered again after a reconnection.
+        self._registered_agent = None  # type: Optional[RegisterDescription]
+        self._registered_services = []  # type: List[RegisterService]
+        self._replay_buffer = deque()  # type: Deque[bytes]
+        self._reconnect_task = None  # type: Optional[asyncio.Task]
+        self._established = False
 
         # these are setup in _connect_to_server
         self._connection = None
-        self._server_reader = None
-        self._server_writer = None
+        self._transport = None  # type: Optional[asyncio.Transport]
+        self._protocol = None  # type: Optional[OEFProtocol]
 
     def is_connected(self) -> bool:
         """
@@ -94,14 +219,30 @@ class OEFNetworkProxy(OEFProxy):
         """
         return self._connection is not None
 
-    async def _connect_to_server(self, event_loop) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    async def _connect_to_server(self, event_loop) -> Tuple[asyncio.Transport, OEFProtocol]:
         """
-        Connect to the OEF Node.
+        Connect to the OEF Node, over TCP or, if the address is ``unix://<path>``, over a Unix domain socket.
 
         :param event_loop: the event loop to use for the connection.
-        :return: A stream reader and a stream writer for the connection.
+        :return: the transport and the protocol instance of the connection.
+        """
+        if self.unix_path is not None:
+            return await event_loop.create_unix_connection(self._make_protocol, self.unix_path)
+        return await event_loop.create_connection(self._make_protocol, self.oef_addr, self.port)
+
+    def _make_protocol(self) -> OEFProtocol:
+        return OEFProtocol(self._loop, self.batch_writes, on_connection_lost=self._on_connection_lost,
+                           max_frame_size=self.max_frame_size, read_buffer_limits=self.read_buffer_limits)
+
+    def _not_connected_error(self) -> OEFConnectionError:
+        """
+        The error raised when the proxy is used while it is not connected.
+
+        :return: the error, telling whether the connection has never been established or the reconnection failed.
         """
-        return await asyncio.open_connection(self.oef_addr, self.port, loop=event_loop)
+        if self.reconnect_error is not None:
+            return OEFConnectionError("Connection lost: {}".format(self.reconnect_error))
+        return OEFConnectionError("Connection not established yet. Please use 'connect()'.")
 
     def _send(self, protobuf_msg) -> None:
         """
@@ -111,46 +252,277 @@ class OEFNetworkProxy(OEFProxy):
         :return: ``None``
         :raises OEFConnectionError: if the connection has not been established yet.
         """
+        self._send_frame(protobuf_msg.SerializeToString())
+
+    def _send_frame(self, data: bytes) -> None:
+        """
+        Send a serialized message to a previously established connection.
+
+        :param data: the serialized message.
+        :return: ``None``
+        :raises OEFConnectionError: if the connection has not been established yet.
+        """
         if not self.is_connected():
-            raise OEFConnectionError("Connection not established yet. Please use 'connect()'.")
-        serialized_msg = protobuf_msg.SerializeToString()
-        nbytes = struct.pack("I", len(serialized_msg))
-        self._server_writer.write(nbytes)
-        self._server_writer.write(serialized_msg)
+            raise self._not_connected_error()
+        if self.max_frame_size is not None and len(data) > self.max_frame_size:
+            raise OEFFrameTooLargeError("Message of {} bytes not sent, the maximum is {}."
+                                        .format(len(data), self.max_frame_size))
+        if self._reconnect_task is not None:
+            self._buffer_for_replay(data)
+            return
+        if self._protocol.writing_paused and self.overflow_policy is not None and not self._handle_overflow():
+            return
+        self._protocol.write_frame(data)
+
+    def _buffer_for_replay(self, data: bytes) -> None:
+        """
+        Keep a message sent while reconnecting, to send it once the connection has been reestablished.
+        If the replay buffer is full, the oldest message is dropped.
+
+        :param data: the serialized message.
+        :return: ``None``
+        """
+        if len(self._replay_buffer) >= self.reconnect_policy.replay_buffer_size:
+            self._replay_buffer.popleft()
+            self.reconnect_stats.dropped_frames += 1
+        self._replay_buffer.append(data)
 
-    async def _receive(self):
+    def _on_connection_lost(self, protocol: OEFProtocol, exc: Optional[Exception], unsent: List[bytes]) -> None:
         """
-        Receive a Protobuf message.
+        Start the reconnection, if a reconnect policy has been provided and the connection dropped unexpectedly.
+        The messages batched or corked but not written yet are sent once the connection has been reestablished.
+
+        :param protocol: the protocol of the connection that has been lost.
+        :param exc: the exception that caused the loss of the connection, if any.
+        :param unsent: the messages queued by the protocol but not written yet.
+        :return: ``None``
+        """
+        if self.reconnect_policy is None or not self._established or protocol is not self._protocol \
+                or self._reconnect_task is not None:
+            if unsent:
+                logger.warning("Proxy {}: connection closed, {} messages not sent.".format(self.public_key, len(unsent)))
+            return
+        logger.warning("Proxy {}: connection with the OEF Node lost, reconnecting...".format(self.public_key))
+        for data in unsent:
+            self._buffer_for_replay(data)
+        self._reconnect_task = asyncio.ensure_future(self._reconnect(), loop=self._loop)
+
+    async def _reconnect(self) -> None:
+        """
+        Reconnect to the OEF Node, following the reconnect policy. Then, register again
+        the last registered descriptions, and send the messages buffered while disconnected.
+
+        If the maximum number of attempts is reached, or the reconnection fails unexpectedly, the failure
+        is recorded in ``reconnect_error``, and raised by the next send, receive or connect, rather than
+        by this task, which nobody awaits.
+
+        :return: ``None``
+        """
+        start = self._loop.time()
+        attempt = 0
+        reconnected = False
+        try:
+            while True:
+                await asyncio.sleep(self.reconnect_policy.delay(attempt))
+                try:
+                    reconnected = await self._open_connection()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.debug("Proxy {}: reconnection attempt failed: {!r}".format(self.public_key, e))
+                if reconnected:
+                    break
+                self._transport.close()
+                attempt += 1
+                self.reconnect_stats.failed_attempts += 1
+                if self.reconnect_policy.max_attempts is not None and attempt >= self.reconnect_policy.max_attempts:
+                    logger.error("Proxy {}: unable to reconnect to the OEF Node.".format(self.public_key))
+                    self.reconnect_error = OEFConnectionError("Unable to reconnect to the OEF Node after {} attempts."
+                                                              .format(attempt))
+                    break
+
+            if reconnected:
+                registrations = ([self._registered_agent] if self._registered_agent is not None else []) \
+                    + self._registered_services
+                for msg in registrations:
+                    self._protocol.write_frame(msg.to_pb().SerializeToString())
+                replayed = len(self._replay_buffer)
+                while self._replay_buffer:
+                    self._protocol.write_frame(self._replay_buffer.popleft())
+        except asyncio.CancelledError:
+            # stopped by stop(), which tears down the connection itself.
+            raise
+        except Exception as e:
+            logger.exception("Proxy {}: reconnection failed.".format(self.public_key))
+            reconnected = False
+            self.reconnect_error = OEFConnectionError("Unable to reconnect to the OEF Node: {!r}".format(e))
+        finally:
+            self._reconnect_task = None
+        if not reconnected:
+            self._established = False
+            if self._transport is not None:
+                self._transport.close()
+            self._connection = self._transport = self._protocol = None
+            self._replay_buffer.clear()
+            return
+
+        latency = self._loop.time() - start
+        self.reconnect_stats.reconnects += 1
+        self.reconnect_stats.replayed_frames += replayed
+        self.reconnect_stats.last_latency = latency
+        self.reconnect_stats.total_latency += latency
+        logger.info("Proxy {}: reconnected in {:.3f}s, {} messages replayed.".format(self.public_key, latency, replayed))
+
+    async def _wait_reconnection(self) -> None:
+        """
+        Wait for the reconnection in progress.
+
+        :return: ``None``
+        :raises OEFConnectionError: if there is no reconnection in progress, or if it failed.
+        """
+        if self._reconnect_task is None and self.reconnect_error is None:
+            raise OEFConnectionError("Connection closed by the OEF Node.")
+        if self._reconnect_task is not None:
+            await asyncio.shield(self._reconnect_task)
+        if self.reconnect_error is not None:
+            raise self._not_connected_error()
+
+    def _handle_overflow(self) -> bool:
+        """
+        Apply the overflow policy, when a message is sent while the write buffer is above its high-water mark.
+
+        :return: ``True`` if the message has to be written, ``False`` if it has to be dropped.
+        :raises OEFWriteBufferFullError: if the overflow policy is :attr:`~oef.transport.OverflowPolicy.RAISE`.
+        """
+        if self.overflow_policy == OverflowPolicy.RAISE:
+            raise OEFWriteBufferFullError("The write buffer of the connection is full.")
+        elif self.overflow_policy == OverflowPolicy.DROP:
+            self.dropped_messages += 1
+            logger.warning("Proxy {}: write buffer full, message dropped.".format(self.public_key))
+            return False
+        elif self._loop.is_running():
+            logger.warning("Proxy {}: write buffer full, but cannot block inside the event loop."
+                           .format(self.public_key))
+        else:
+            self._loop.run_until_complete(self._protocol.drain())
+        return True
+
+    async def drain(self) -> None:
+        """
+        Wait until the write buffer of the connection is below its low-water mark.
 
         :return: ``None``
         :raises OEFConnectionError: if the connection has not been established yet.
         """
         if not self.is_connected():
-            raise OEFConnectionError("Connection not established yet. Please use 'connect()'.")
-        nbytes_packed = await self._server_reader.read(len(struct.pack("I", 0)))
-        logger.debug("received ${0}".format(nbytes_packed))
-        nbytes = struct.unpack("I", nbytes_packed)[0]
-        logger.debug("received unpacked ${0}".format(nbytes))
-        logger.debug("Preparing to receive ${0} bytes ...".format(nbytes))
-        data = b""
-        while len(data) < nbytes:
-            data += await self._server_reader.read(nbytes - len(data))
-            logger.debug("Read bytes: {}".format(len(data)))
-        return data
+            raise self._not_connected_error()
+        await self._protocol.drain()
+
+    def flush(self) -> None:
+        """
+        Write the messages queued by the batching mode, or by :func:`~oef.proxy.OEFNetworkProxy.cork`, immediately.
+
+        :return: ``None``
+        :raises OEFConnectionError: if the connection has not been established yet.
+        """
+        if not self.is_connected():
+            raise self._not_connected_error()
+        self._protocol.flush()
+
+    def cork(self):
+        """
+        Context manager that holds back all the messages sent inside its block,
+        and writes them to the socket at once when the block is exited.
+
+            >>> with proxy.cork():  # doctest: +SKIP
+            ...     for i, station in enumerate(stations):
+            ...         proxy.send_cfp(1, i, station, 0, query)
+
+        :raises OEFConnectionError: if the connection has not been established yet.
+        """
+        if not self.is_connected():
+            raise self._not_connected_error()
+        return self._protocol.cork()
+
+    async def _receive(self) -> bytes:
+        """
+        Receive a Protobuf message.
+
+        :return: the serialized message.
+        :raises OEFConnectionError: if the connection has not been established yet, or if it has been closed.
+        """
+        if not self.is_connected():
+            raise self._not_connected_error()
+        while True:
+            try:
+                return await self._protocol.receive()
+            except OEFConnectionError:
+                if self.reconnect_policy is None:
+                    raise
+                await self._wait_reconnection()
+
+    async def _receive_many(self) -> List[bytes]:
+        """
+        Receive all the messages already split out of the connection, waiting for at least one.
+
+        :return: the list of serialized messages, in order of arrival.
+        :raises OEFConnectionError: if the connection has not been established yet, or if it has been closed.
+        """
+        if not self.is_connected():
+            raise self._not_connected_error()
+        while True:
+            try:
+                return await self._protocol.receive_many()
+            except OEFConnectionError:
+                if self.reconnect_policy is None:
+                    raise
+                await self._wait_reconnection()
 
     async def connect(self) -> bool:
-        if self.is_connected() and not self._server_writer.transport.is_closing():
+        """
+        Connect to the OEF Node. If a reconnection is in progress, wait for it.
+
+        :return: ``True`` if the proxy is connected, ``False`` if the handshake failed.
+        :raises OEFConnectionError: if the reconnection in progress failed.
+        """
+        if self._reconnect_task is not None:
+            await self._wait_reconnection()
             return True
+        if self.is_connected() and not self._transport.is_closing():
+            return True
+
+        self.reconnect_error = None
+        self._established = False
+        try:
+            self._established = await self._open_connection()
+        finally:
+            # also if the handshake is interrupted, e.g. by a timeout or a malformed message.
+            if not self._established and self._transport is not None:
+                self._transport.close()
+                self._connection = self._transport = self._protocol = None
+        return self._established
+
+    async def _open_connection(self) -> bool:
+        """
+        Open the connection to the OEF Node, and perform the handshake.
 
+        :return: ``True`` if the handshake succeeded, ``False`` otherwise.
+        """
         event_loop = self._loop
         self._connection = await self._connect_to_server(event_loop)
-        self._server_reader, self._server_writer = self._connection
+        self._transport, self._protocol = self._connection
+        if self.write_buffer_limits is not None:
+            high, low = self.write_buffer_limits
+            self._transport.set_write_buffer_limits(high=high, low=low)
+        if self.socket_options is not None:
+            self.effective_socket_options = self.socket_options.apply(self._transport.get_extra_info("socket"))
+        protocol = self._protocol
         # Step 1: Agent --(ID)--> OEFCore
         pb_public_key = agent_pb2.Agent.Server.ID()
         pb_public_key.public_key = self.public_key
-        self._send(pb_public_key)
+        protocol.write_frame(pb_public_key.SerializeToString())
         # Step 2: OEFCore --(Phrase)--> Agent
-        data = await self._receive()
+        data = await protocol.receive()
         pb_phrase = agent_pb2.Server.Phrase()
         pb_phrase.ParseFromString(data)
         case = pb_phrase.WhichOneof("payload")
@@ -159,28 +531,47 @@ class OEFNetworkProxy(OEFProxy):
         # Step 3: Agent --(Answer)--> OEFCore
         pb_answer = agent_pb2.Agent.Server.Answer()
         pb_answer.answer = pb_phrase.phrase[::-1]
-        self._send(pb_answer)
+        protocol.write_frame(pb_answer.SerializeToString())
         # Step 4: OEFCore --(Connected)--> Agent
-        data = await self._receive()
+        data = await protocol.receive()
         pb_status = agent_pb2.Server.Connected()
         pb_status.ParseFromString(data)
         return pb_status.status
 
+    def _send_registration(self, msg: BaseMessage) -> None:
+        """
+        Send a (un)registration. While reconnecting, it is not buffered for replay: the registrations
+        recorded when the connection is reestablished are sent anyway.
+
+        :param msg: the message.
+        :return: ``None``
+        """
+        if self._reconnect_task is None:
+            self._send(msg.to_pb())
+
     def register_agent(self, msg_id: int, agent_description: Description):
         msg = RegisterDescription(msg_id, agent_description)
-        self._send(msg.to_pb())
+        self._send_registration(msg)
+        self._registered_agent = msg
 
     def register_service(self, msg_id: int, service_description: Description):
         msg = RegisterService(msg_id, service_description)
-        self._send(msg.to_pb())
+        self._send_registration(msg)
+        if all(registered.service_description != service_description for registered in self._registered_services):
+            self._registered_services.append(msg)
 
     def unregister_agent(self, msg_id: int):
         msg = UnregisterDescription(msg_id)
-        self._send(msg.to_pb())
+        self._send_registration(msg)
+        self._registered_agent = None
 
     def unregister_service(self, msg_id: int, service_description: Description):
         msg = UnregisterService(msg_id, service_description)
-        self._send(msg.to_pb())
+        self._send_registration(msg)
+        for registered in self._registered_services:
+            if registered.service_description == service_description:
+                self._registered_services.remove(registered)
+                break
 
     def search_agents(self, search_id: int, query: Query) -> None:
         msg = SearchAgents(search_id, query)
@@ -206,6 +597,17 @@ class OEFNetworkProxy(OEFProxy):
         msg = Propose(msg_id, dialogue_id, destination, target, proposals)
         self._send(msg.to_pb())
 
+    def send_cfp_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int, query: CFP_TYPES) -> None:
+        msg = CFPBroadcast(msg_id, recipients, target, query)
+        for data in msg.frames():
+            self._send_frame(data)
+
+    def send_propose_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int,
+                          proposals: PROPOSE_TYPES) -> None:
+        msg = ProposeBroadcast(msg_id, recipients, target, proposals)
+        for data in msg.frames():
+            self._send_frame(data)
+
     def send_accept(self, msg_id: int, dialogue_id: int, destination: str, target: int):
         msg = Accept(msg_id, dialogue_id, destination, target)
         self._send(msg.to_pb())
@@ -218,13 +620,144 @@ class OEFNetworkProxy(OEFProxy):
         """
         Tear down resources associated with this Proxy, i.e. the writing connection with the server.
         """
-        await self._server_writer.drain()
-        self._server_writer.close()
-        self._server_writer = None
-        self._server_reader = None
+        self._established = False
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._protocol is None:
+            return
+        self._protocol.flush()
+        await self._protocol.drain()
+        self._transport.close()
+        self._transport = None
+        self._protocol = None
         self._connection = None
 
 
+class ConnectResult:
+    """The outcome of the connection of a proxy, as reported by :func:`~oef.proxy.connect_many`."""
+
+    def __init__(self, proxy: OEFProxy, connected: bool, attempts: int, elapsed: float,
+                 error: Optional[Exception] = None):
+        """
+        Initialize a connection result.
+
+        :param proxy: the proxy.
+        :param connected: whether the proxy is connected.
+        :param attempts: the number of connection attempts.
+        :param elapsed: the time (in seconds) spent connecting, including the delays between the attempts.
+        :param error: the error raised by the last attempt, if any.
+        """
+        self.proxy = proxy
+        self.connected = connected
+        self.attempts = attempts
+        self.elapsed = elapsed
+        self.error = error
+
+    def __repr__(self):
+        return "ConnectResult(public_key={!r}, connected={}, attempts={}, elapsed={:.3f})"\
+            .format(self.proxy.public_key, self.connected, self.attempts, self.elapsed)
+
+
+class ConnectStats:
+    """Statistics about the connection of many proxies, as returned by :func:`~oef.proxy.connect_many`."""
+
+    def __init__(self, results: List[ConnectResult], elapsed: float):
+        """
+        Initialize the statistics.
+
+        :param results: the result of every proxy, in the same order of the proxies.
+        :param elapsed: the total time (in seconds) taken to connect all the proxies.
+        """
+        self.results = results
+        self.elapsed = elapsed
+
+    @property
+    def connected(self) -> int:
+        """The number of proxies connected."""
+        return sum(1 for r in self.results if r.connected)
+
+    @property
+    def failed(self) -> List[ConnectResult]:
+        """The results of the proxies that could not connect."""
+        return [r for r in self.results if not r.connected]
+
+    @property
+    def retries(self) -> int:
+        """The total number of attempts beyond the first one."""
+        return sum(r.attempts - 1 for r in self.results)
+
+    @property
+    def min_time(self) -> float:
+        """The shortest connection time, in seconds."""
+        return min((r.elapsed for r in self.results), default=0.0)
+
+    @property
+    def mean_time(self) -> float:
+        """The average connection time, in seconds."""
+        return sum(r.elapsed for r in self.results) / len(self.results) if self.results else 0.0
+
+    @property
+    def max_time(self) -> float:
+        """The longest connection time, in seconds."""
+        return max((r.elapsed for r in self.results), default=0.0)
+
+    def __repr__(self):
+        return "ConnectStats(connected={}/{}, retries={}, elapsed={:.3f}, min={:.3f}, mean={:.3f}, max={:.3f})"\
+            .format(self.connected, len(self.results), self.retries, self.elapsed,
+                    self.min_time, self.mean_time, self.max_time)
+
+
+async def connect_many(proxies: List[OEFProxy],
+                       concurrency: int = 100,
+                       retry_policy: Optional[ReconnectPolicy] = None,
+                       timeout: Optional[float] = None,
+                       loop: Optional[asyncio.AbstractEventLoop] = None) -> ConnectStats:
+    """
+    Connect many proxies concurrently, running at most ``concurrency`` handshakes at the same time.
+
+    A proxy that cannot connect (because the connection is refused, the handshake fails or times out,
+    or the OEF Node answers with a malformed message) is retried according to ``retry_policy``,
+    using the same backoff of the automatic reconnection. Without a policy, every proxy is tried once.
+    The failures do not interrupt the other connections: the last error of each proxy is in its result.
+
+    :param proxies: the proxies to connect.
+    :param concurrency: the maximum number of connections in progress at the same time.
+    :param retry_policy: how to retry the failed connections. Only the attempts and the delays are considered,
+                       | and the number of attempts must be limited.
+    :param timeout: the maximum time (in seconds) of every connection attempt. If ``None``, wait indefinitely.
+    :param loop: the event loop.
+    :return: the result of every proxy, and the connection time statistics.
+    :raises ValueError: if the retry policy does not limit the number of attempts.
+    """
+    if retry_policy is not None and retry_policy.max_attempts is None:
+        raise ValueError("The retry policy of connect_many must limit the number of attempts.")
+    loop = asyncio.get_event_loop() if loop is None else loop
+    semaphore = asyncio.Semaphore(concurrency)
+    max_attempts = 1 if retry_policy is None else retry_policy.max_attempts
+
+    async def _connect(proxy: OEFProxy) -> ConnectResult:
+        start = loop.time()
+        attempts = 0
+        while True:
+            error = None
+            async with semaphore:
+                attempts += 1
+                try:
+                    connected = await asyncio.wait_for(proxy.connect(), timeout)
+                except Exception as e:
+                    connected, error = False, e
+            if connected or attempts >= max_attempts:
+                break
+            logger.debug("Proxy {}: connection attempt {} failed.".format(proxy.public_key, attempts))
+            await asyncio.sleep(retry_policy.delay(attempts - 1))
+        return ConnectResult(proxy, connected, attempts, loop.time() - start, error)
+
+    start = loop.time()
+    results = await asyncio.gather(*[_connect(proxy) for proxy in proxies])
+    return ConnectStats(list(results), loop.time() - start)
+
+
 class OEFLocalProxy(OEFProxy):
     """
     Proxy to the functionality of the OEF.
@@ -283,6 +816,9 @@ class OEFLocalProxy(OEFProxy):
                     break
 
                 public_key, msg = data
+                if isinstance(msg, Broadcast):
+                    self._send_broadcast(public_key, msg)
+                    continue
                 assert isinstance(msg, AgentMessage)
                 self._send_agent_message(public_key, msg)
 
@@ -359,12 +895,13 @@ class OEFLocalProxy(OEFProxy):
             """
             self.loop.run_until_complete(self._lock.acquire())
 
-            if public_key not in self.services:
+            services = self.services.get(public_key, [])
+            if service_description not in services:
                 msg = OEFErrorMessage(msg_id, OEFErrorOperation.UNREGISTER_SERVICE)
                 self._send(public_key, msg.to_pb())
             else:
-                self.services[public_key].remove(service_description)
-                if len(self.services[public_key]) == 0:
+                services.remove(service_description)
+                if len(services) == 0:
                     self.services.pop(public_key)
             self._lock.release()
 
@@ -423,32 +960,62 @@ class OEFLocalProxy(OEFProxy):
                 self._send(origin, msg.to_pb())
                 return
 
+            inbound = InboundAgentMessage.from_send_message(msg.msg_id, origin, e.send_message)
+            self._send(destination, inbound.to_pb())
+
+        def _send_broadcast(self, origin: str, msg: Broadcast) -> None:
+            """
+            Send a :class:`~oef.messages.Broadcast` to its recipients. The FIPA payload is copied once,
+            and only the dialogue id is changed for every recipient.
+
+            :param origin: the public key of the sender agent.
+            :param msg: the message.
+            :return: ``None``
+            """
             new_msg = agent_pb2.Server.AgentMessage()
             new_msg.answer_id = msg.msg_id
             new_msg.content.origin = origin
-            new_msg.content.dialogue_id = e.send_message.dialogue_id
-
-            payload = e.send_message.WhichOneof("payload")
-            if payload == "content":
-                new_msg.content.content = e.send_message.content
-            elif payload == "fipa":
-                new_msg.content.fipa.CopyFrom(e.send_message.fipa)
-
-            self._queues[destination].put_nowait(new_msg.SerializeToString())
+            new_msg.content.fipa.CopyFrom(msg.fipa)
+            for dialogue_id, destination in msg.recipients:
+                if destination not in self._queues:
+                    self._send(origin, DialogueErrorMessage(msg.msg_id, dialogue_id, destination).to_pb())
+                    continue
+                new_msg.content.dialogue_id = dialogue_id
+                self._queues[destination].put_nowait(new_msg.SerializeToString())
 
         def _send(self, public_key: str, msg):
             self._queues[public_key].put_nowait(msg.SerializeToString())
 
-    def __init__(self, public_key: str, local_node: LocalNode, loop: asyncio.AbstractEventLoop = None):
+    def __init__(self, public_key: str, local_node: LocalNode, loop: asyncio.AbstractEventLoop = None,
+                 max_concurrent_handlers: Optional[int] = None,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_linger: float = 0.0,
+                 pipeline_depth: Optional[int] = None,
+                 pipeline_policy: PipelineOverflowPolicy = PipelineOverflowPolicy.BLOCK,
+                 max_content_size: Optional[int] = DEFAULT_MAX_CONTENT_SIZE):
         """
         Initialize a OEF proxy for a local OEF Node (that is, :class:`~oef.proxy.OEFLocalProxy.LocalNode`
 
         :param public_key: the public key used in the protocols.
         :param local_node: the Local OEF Node object. This reference must be the same across the agents of interest.
         :param loop: the event loop.
+        :param max_concurrent_handlers: the maximum number of message handlers running concurrently.
+                                      | If ``None``, the messages are handled one at a time.
+        :param max_batch_size: the maximum number of simple messages delivered in a batch,
+                             | to the agents that implement :attr:`~oef.core.DialogueInterface.on_message_batch`.
+        :param max_linger: how long (in seconds) a batch waits for more messages before being delivered.
+        :param pipeline_depth: if provided, the frames are read from the connection while the handlers run,
+                             | and up to this number of frames are queued for the handlers.
+        :param pipeline_policy: what to do with the frames read when the queue is full.
+        :param max_content_size: the maximum size (in bytes) of a content received in chunks, and of the chunks
+                               | buffered by the pending transfers of every sender. Larger transfers are
+                               | discarded. ``None`` means no limit.
         """
 
-        super().__init__(public_key, loop)
+        super().__init__(public_key, loop, max_concurrent_handlers=max_concurrent_handlers,
+                         max_batch_size=max_batch_size, max_linger=max_linger,
+                         pipeline_depth=pipeline_depth, pipeline_policy=pipeline_policy,
+                         max_content_size=max_content_size)
         self.local_node = local_node
         self._connection = None
         self._read_queue = None
@@ -488,6 +1055,15 @@ class OEFLocalProxy(OEFProxy):
         msg = Propose(msg_id, dialogue_id, destination, target, proposals)
         self._send(msg)
 
+    def send_cfp_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int, query: CFP_TYPES) -> None:
+        msg = CFPBroadcast(msg_id, recipients, target, query)
+        self._send(msg)
+
+    def send_propose_many(self, msg_id: int, recipients: RECIPIENTS_TYPES, target: int,
+                          proposals: PROPOSE_TYPES) -> None:
+        msg = ProposeBroadcast(msg_id, recipients, target, proposals)
+        self._send(msg)
+
     def send_accept(self, msg_id: int, dialogue_id: int, destination: str, target: int) -> None:
         msg = Accept(msg_id, dialogue_id, destination, target)
         self._send(msg)
@@ -512,6 +1088,14 @@ class OEFLocalProxy(OEFProxy):
         data = await self._read_queue.get()
         return data
 
+    async def _receive_many(self) -> List[bytes]:
+        if not self.is_connected():
+            raise OEFConnectionError("Connection not established yet. Please use 'connect()'.")
+        data = [await self._read_queue.get()]
+        while not self._read_queue.empty():
+            data.append(self._read_queue.get_nowait())
+        return data
+
     def _send(self, msg: BaseMessage) -> None:
         if not self.is_connected():
             raise OEFConnectionError("Connection not established yet. Please use 'connect()'.")
@@ -22,7 +22,8 @@ from abc import ABC, abstractmethod
 from typing import Union, Tuple, List, Optional, Type
 
 import oef.query_pb2 as query_pb2
-from oef.schema import ATTRIBUTE_TYPES, AttributeSchema, DataModel, ProtobufSerializable, Description, Location
+from oef.schema import ATTRIBUTE_TYPES, AttributeSchema, DataModel, ProtobufSerializable, Description, Location, \
+    data_model_registry, unfrozen_type
 
 RANGE_TYPES = Union[Tuple[str, str], Tuple[int, int], Tuple[float, float], Tuple[Location, Location]]
 ORDERED_TYPES = Union[int, str, float]
@@ -64,17 +65,16 @@ class ConstraintExpr(ProtobufSerializable, ABC):
         return
 
     @staticmethod
-    def _to_pb(expression):
-        constraint_expr_pb = query_pb2.Query.ConstraintExpr()
-        expression_pb = expression.to_pb()
+    def _to_pb(expression, target: Optional[query_pb2.Query.ConstraintExpr] = None):
+        constraint_expr_pb = query_pb2.Query.ConstraintExpr() if target is None else target
         if isinstance(expression, And):
-            constraint_expr_pb.and_.CopyFrom(expression_pb)
+            expression.to_pb(constraint_expr_pb.and_)
         elif isinstance(expression, Or):
-            constraint_expr_pb.or_.CopyFrom(expression_pb)
+            expression.to_pb(constraint_expr_pb.or_)
         elif isinstance(expression, Not):
-            constraint_expr_pb.not_.CopyFrom(expression_pb)
+            expression.to_pb(constraint_expr_pb.not_)
         elif isinstance(expression, Constraint):
-            constraint_expr_pb.constraint.CopyFrom(expression_pb)
+            expression.to_pb(constraint_expr_pb.constraint)
 
         return constraint_expr_pb
 
@@ -119,15 +119,16 @@ class And(ConstraintExpr):
 
         self._check_validity()
 
-    def to_pb(self):
+    def to_pb(self, target: Optional[query_pb2.Query.ConstraintExpr.And] = None):
         """
         From an instance of :class:`~oef.query.And` to its associated Protobuf object.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the ConstraintExpr Protobuf object that contains the :class:`~oef.query.And` constraint.
         """
-        and_pb = query_pb2.Query.ConstraintExpr.And()
-        constraint_expr_pbs = [ConstraintExpr._to_pb(constraint) for constraint in self.constraints]
-        and_pb.expr.extend(constraint_expr_pbs)
+        and_pb = query_pb2.Query.ConstraintExpr.And() if target is None else target
+        for constraint in self.constraints:
+            ConstraintExpr._to_pb(constraint, and_pb.expr.add())
         return and_pb
 
     @classmethod
@@ -161,12 +162,19 @@ class And(ConstraintExpr):
         for c in self.constraints:
             c._check_validity()
 
+    def _structure(self) -> Tuple:
+        return "And", tuple(constraint._structure() for constraint in self.constraints)
+
     def __eq__(self, other):
-        if type(other) != And:
+        if unfrozen_type(other) != And:
             return False
+        elif self._frozen and other._frozen:
+            return self.fingerprint == other.fingerprint
         else:
             return self.constraints == other.constraints
 
+    __hash__ = ConstraintExpr.__hash__
+
 
 class Or(ConstraintExpr):
     """
@@ -198,16 +206,17 @@ class Or(ConstraintExpr):
 
         self._check_validity()
 
-    def to_pb(self):
+    def to_pb(self, target: Optional[query_pb2.Query.ConstraintExpr.Or] = None):
         """
         From an instance of :class:`~oef.query.Or` to its associated Protobuf object.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the Protobuf object that contains the :class:`~oef.query.Or` constraint.
         """
 
-        or_pb = query_pb2.Query.ConstraintExpr.Or()
-        constraint_expr_pbs = [ConstraintExpr._to_pb(constraint) for constraint in self.constraints]
-        or_pb.expr.extend(constraint_expr_pbs)
+        or_pb = query_pb2.Query.ConstraintExpr.Or() if target is None else target
+        for constraint in self.constraints:
+            ConstraintExpr._to_pb(constraint, or_pb.expr.add())
         return or_pb
 
     @classmethod
@@ -240,12 +249,19 @@ class Or(ConstraintExpr):
         for c in self.constraints:
             c._check_validity()
 
+    def _structure(self) -> Tuple:
+        return "Or", tuple(constraint._structure() for constraint in self.constraints)
+
     def __eq__(self, other):
-        if type(other) != Or:
+        if unfrozen_type(other) != Or:
             return False
+        elif self._frozen and other._frozen:
+            return self.fingerprint == other.fingerprint
         else:
             return self.constraints == other.constraints
 
+    __hash__ = ConstraintExpr.__hash__
+
 
 class Not(ConstraintExpr):
     """
@@ -275,15 +291,15 @@ class Not(ConstraintExpr):
         """
         return not self.constraint.check(description)
 
-    def to_pb(self):
+    def to_pb(self, target: Optional[query_pb2.Query.ConstraintExpr.Not] = None):
         """
         From an instance of :class:`~oef.query.Not` to its associated Protobuf object.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the Protobuf object that contains the :class:`~oef.query.Not` constraint.
         """
-        not_pb = query_pb2.Query.ConstraintExpr.Not()
-        constraint_expr_pb = ConstraintExpr._to_pb(self.constraint)
-        not_pb.expr.CopyFrom(constraint_expr_pb)
+        not_pb = query_pb2.Query.ConstraintExpr.Not() if target is None else target
+        ConstraintExpr._to_pb(self.constraint, not_pb.expr)
         return not_pb
 
     @classmethod
@@ -300,12 +316,19 @@ class Not(ConstraintExpr):
     def is_valid(self, data_model: DataModel) -> bool:
         return self.constraint.is_valid(data_model)
 
+    def _structure(self) -> Tuple:
+        return "Not", self.constraint._structure()
+
     def __eq__(self, other):
-        if type(other) != Not:
+        if unfrozen_type(other) != Not:
             return False
+        elif self._frozen and other._frozen:
+            return self.fingerprint == other.fingerprint
         else:
             return self.constraint == other.constraint
 
+    __hash__ = ConstraintExpr.__hash__
+
 
 class ConstraintType(ProtobufSerializable, ABC):
     """
@@ -393,15 +416,16 @@ class Relation(ConstraintType, ABC):
         elif value_case == "l":
             return relation_class(Location.from_pb(relation.val.l))
 
-    def to_pb(self) -> query_pb2.Query.Relation:
+    def to_pb(self, target: Optional[query_pb2.Query.Relation] = None) -> query_pb2.Query.Relation:
         """
         From an instance of Relation to its associated Protobuf object.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the Protobuf object that contains the relation.
         """
-        relation = query_pb2.Query.Relation()
+        relation = query_pb2.Query.Relation() if target is None else target
         relation.op = self._operator()
-        query_value = query_pb2.Query.Value()
+        query_value = relation.val
         if isinstance(self.value, bool):
             query_value.b = self.value
         elif isinstance(self.value, int):
@@ -411,19 +435,23 @@ class Relation(ConstraintType, ABC):
         elif isinstance(self.value, str):
             query_value.s = self.value
         elif isinstance(self.value, Location):
-            query_value.l.CopyFrom(self.value.to_pb())
-        relation.val.CopyFrom(query_value)
+            self.value.to_pb(query_value.l)
         return relation
 
     def _get_type(self) -> Type[ATTRIBUTE_TYPES]:
-        return type(self.value)
+        return unfrozen_type(self.value)
+
+    def _structure(self) -> Tuple:
+        return type(self).__name__, self._structure_of(self.value)
 
     def __eq__(self, other):
-        if type(other) != type(self):
+        if unfrozen_type(other) != unfrozen_type(self):
             return False
         else:
             return self.value == other.value
 
+    __hash__ = ConstraintType.__hash__
+
 
 class OrderingRelation(Relation, ABC):
     """A specialization of the :class:`~oef.query.Relation` class to represent ordering relation (e.g. greater-than)."""
@@ -432,7 +460,7 @@ class OrderingRelation(Relation, ABC):
         super().__init__(value)
 
     def _get_type(self) -> Type[ORDERED_TYPES]:
-        return type(self.value)
+        return unfrozen_type(self.value)
 
 
 class Eq(Relation):
@@ -634,33 +662,26 @@ class Range(ConstraintType):
         """
         self.values = values
 
-    def to_pb(self) -> query_pb2.Query:
+    def to_pb(self, target: Optional[query_pb2.Query.Range] = None) -> query_pb2.Query.Range:
         """
         From an instance of Range to its associated Protobuf object.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the Protobuf object that contains the range.
         """
-        range_ = query_pb2.Query.Range()
+        range_ = query_pb2.Query.Range() if target is None else target
         if type(self.values[0]) == str:
-            values = query_pb2.Query.StringPair()
-            values.first = self.values[0]
-            values.second = self.values[1]
-            range_.s.CopyFrom(values)
+            range_.s.first = self.values[0]
+            range_.s.second = self.values[1]
         elif type(self.values[0]) == int:
-            values = query_pb2.Query.IntPair()
-            values.first = self.values[0]
-            values.second = self.values[1]
-            range_.i.CopyFrom(values)
+            range_.i.first = self.values[0]
+            range_.i.second = self.values[1]
         elif type(self.values[0]) == float:
-            values = query_pb2.Query.DoublePair()
-            values.first = self.values[0]
-            values.second = self.values[1]
-            range_.d.CopyFrom(values)
-        elif type(self.values[0]) == Location:
-            values = query_pb2.Query.LocationPair()
-            values.first.CopyFrom(self.values[0].to_pb())
-            values.second.CopyFrom(self.values[1].to_pb())
-            range_.l.CopyFrom(values)
+            range_.d.first = self.values[0]
+            range_.d.second = self.values[1]
+        elif unfrozen_type(self.values[0]) == Location:
+            self.values[0].to_pb(range_.l.first)
+            self.values[1].to_pb(range_.l.second)
         return range_
 
     @classmethod
@@ -693,14 +714,19 @@ class Range(ConstraintType):
         return left <= value <= right
 
     def _get_type(self) -> Type[Union[int, str, float, Location]]:
-        return type(self.values[0])
+        return unfrozen_type(self.values[0])
+
+    def _structure(self) -> Tuple:
+        return "Range", tuple(self._structure_of(value) for value in self.values)
 
     def __eq__(self, other):
-        if type(other) != Range:
+        if unfrozen_type(other) != Range:
             return False
         else:
             return self.values == other.values
 
+    __hash__ = ConstraintType.__hash__
+
 
 class Set(ConstraintType, ABC):
     """
@@ -722,38 +748,38 @@ class Set(ConstraintType, ABC):
     def _operator(self) -> query_pb2.Query.Set:
         """The operator over the set."""
 
-    def to_pb(self):
+    def to_pb(self, target: Optional[query_pb2.Query.Set] = None) -> query_pb2.Query.Set:
         """
         From an instance of one of the subclasses of :class:`~oef.query.Set` to its associated Protobuf object.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the Protobuf object that contains the set constraint.
         """
-        set_ = query_pb2.Query.Set()
+        set_ = query_pb2.Query.Set() if target is None else target
         set_.op = self._operator()
 
-        value_type = type(self.values[0]) if len(self.values) > 0 else str
+        value_type = unfrozen_type(self.values[0]) if len(self.values) > 0 else str
 
         if value_type == str:
-            values = query_pb2.Query.Set.Values.Strings()
-            values.vals.extend(self.values)
-            set_.vals.s.CopyFrom(values)
+            values = set_.vals.s
         elif value_type == bool:
-            values = query_pb2.Query.Set.Values.Bools()
-            values.vals.extend(self.values)
-            set_.vals.b.CopyFrom(values)
+            values = set_.vals.b
         elif value_type == int:
-            values = query_pb2.Query.Set.Values.Ints()
-            values.vals.extend(self.values)
-            set_.vals.i.CopyFrom(values)
+            values = set_.vals.i
         elif value_type == float:
-            values = query_pb2.Query.Set.Values.Doubles()
-            values.vals.extend(self.values)
-            set_.vals.d.CopyFrom(values)
+            values = set_.vals.d
         elif value_type == Location:
-            values = query_pb2.Query.Set.Values.Locations()
-            values.vals.extend([value.to_pb() for value in self.values])
-            set_.vals.l.CopyFrom(values)
+            values = set_.vals.l
+        else:
+            return set_
 
+        # the values can be empty: mark the field as set anyway.
+        values.SetInParent()
+        if value_type == Location:
+            for value in self.values:
+                value.to_pb(values.vals.add())
+        else:
+            values.vals.extend(self.values)
         return set_
 
     @classmethod
@@ -783,13 +809,18 @@ class Set(ConstraintType, ABC):
             return set_class(locations)
 
     def _get_type(self) -> Optional[Type[ATTRIBUTE_TYPES]]:
-        return type(next(iter(self.values))) if len(self.values) > 0 else None
+        return unfrozen_type(next(iter(self.values))) if len(self.values) > 0 else None
+
+    def _structure(self) -> Tuple:
+        return type(self).__name__, tuple(self._structure_of(value) for value in self.values)
 
     def __eq__(self, other):
-        if type(other) != type(self):
+        if unfrozen_type(other) != unfrozen_type(self):
             return False
         return self.values == other.values
 
+    __hash__ = ConstraintType.__hash__
+
 
 class In(Set):
     """
@@ -896,15 +927,16 @@ class Distance(ConstraintType):
     def check(self, value: Location) -> bool:
         return self.center.distance(value) <= self.distance
 
-    def to_pb(self) -> query_pb2.Query.Distance:
+    def to_pb(self, target: Optional[query_pb2.Query.Distance] = None) -> query_pb2.Query.Distance:
         """
         From an instance :class:`~oef.query.Distance` to its associated Protobuf object.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the Protobuf object that contains the :class:`~oef.query.Distance` constraint.
         """
-        distance_pb = query_pb2.Query.Distance()
+        distance_pb = query_pb2.Query.Distance() if target is None else target
         distance_pb.distance = self.distance
-        distance_pb.center.CopyFrom(self.center.to_pb())
+        self.center.to_pb(distance_pb.center)
         return distance_pb
 
     @classmethod
@@ -922,11 +954,16 @@ class Distance(ConstraintType):
     def _get_type(self) -> Optional[Type[ATTRIBUTE_TYPES]]:
         return Location
 
+    def _structure(self) -> Tuple:
+        return "Distance", self.center._structure(), self._structure_of(self.distance)
+
     def __eq__(self, other):
-        if type(other) != Distance:
+        if unfrozen_type(other) != Distance:
             return False
         return self.center == other.center and self.distance == other.distance
 
+    __hash__ = ConstraintType.__hash__
+
 
 class Constraint(ConstraintExpr):
     """
@@ -939,23 +976,24 @@ class Constraint(ConstraintExpr):
         self.attribute_name = attribute_name
         self.constraint = constraint
 
-    def to_pb(self):
+    def to_pb(self, target: Optional[query_pb2.Query.ConstraintExpr.Constraint] = None):
         """
         Return the associated Protobuf object.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: a Protobuf object equivalent to the caller object.
         """
-        constraint = query_pb2.Query.ConstraintExpr.Constraint()
+        constraint = query_pb2.Query.ConstraintExpr.Constraint() if target is None else target
         constraint.attribute_name = self.attribute_name
 
         if isinstance(self.constraint, Relation):
-            constraint.relation.CopyFrom(self.constraint.to_pb())
+            self.constraint.to_pb(constraint.relation)
         elif isinstance(self.constraint, Range):
-            constraint.range_.CopyFrom(self.constraint.to_pb())
+            self.constraint.to_pb(constraint.range_)
         elif isinstance(self.constraint, Set):
-            constraint.set_.CopyFrom(self.constraint.to_pb())
+            self.constraint.to_pb(constraint.set_)
         elif isinstance(self.constraint, Distance):
-            constraint.distance.CopyFrom(self.constraint.to_pb())
+            self.constraint.to_pb(constraint.distance)
         else:
             raise ValueError("The constraint type is not valid: {}".format(self.constraint))
         return constraint
@@ -1029,7 +1067,8 @@ class Constraint(ConstraintExpr):
 
         # if the type of the value is different from the type of the attribute schema, return false.
         value = description.values[name]
-        if type(value) != self.constraint._get_type():
+        value_type = self.constraint._get_type()
+        if type(value) != value_type and unfrozen_type(value) != value_type:
             return False
 
         # dispatch the check to the right implementation for the concrete constraint type.
@@ -1043,12 +1082,19 @@ class Constraint(ConstraintExpr):
         attribute = data_model.attributes_by_name[self.attribute_name]
         return self.constraint.is_valid(attribute)
 
+    def _structure(self) -> Tuple:
+        return "Constraint", self.attribute_name, self._structure_of(self.constraint)
+
     def __eq__(self, other):
-        if type(other) != Constraint:
+        if unfrozen_type(other) != Constraint:
             return False
+        elif self._frozen and other._frozen:
+            return self.fingerprint == other.fingerprint
         else:
             return self.attribute_name == other.attribute_name and self.constraint == other.constraint
 
+    __hash__ = ConstraintExpr.__hash__
+
 
 class Query(ProtobufSerializable):
     """
@@ -1090,30 +1136,39 @@ class Query(ProtobufSerializable):
 
         self._check_validity()
 
-    def to_pb(self) -> query_pb2.Query.Model:
+    _pb_class = query_pb2.Query.Model
+
+    def to_pb(self, target: Optional[query_pb2.Query.Model] = None) -> query_pb2.Query.Model:
         """
         Return the associated Protobuf object.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: a Protobuf object equivalent to the caller object.
         """
-        query = query_pb2.Query.Model()
-        constraint_expr_pbs = [ConstraintExpr._to_pb(constraint) for constraint in self.constraints]
-        query.constraints.extend(constraint_expr_pbs)
+        if self._frozen:
+            return self._cached_pb(target)
+        return self._build_pb(target)
+
+    def _build_pb(self, target: Optional[query_pb2.Query.Model]) -> query_pb2.Query.Model:
+        query = query_pb2.Query.Model() if target is None else target
+        for constraint in self.constraints:
+            ConstraintExpr._to_pb(constraint, query.constraints.add())
 
         if self.model is not None:
-            query.model.CopyFrom(self.model.to_pb())
+            self.model.to_pb(query.model)
         return query
 
     @classmethod
     def from_pb(cls, query: query_pb2.Query.Model):
         """
         From the ``Query`` Protobuf object to the associated instance of :class:`~oef.query.Query`.
+        The data model is interned in :data:`~oef.schema.data_model_registry`, so it is frozen and shared.
 
         :param query: the Protobuf object that represents the :class:`~oef.query.Query` object.
         :return: an instance of :class:`~oef.query.Query` equivalent to the Protobuf object provided in input.
         """
         constraints = [ConstraintExpr._from_pb(c) for c in query.constraints]
-        return cls(constraints, DataModel.from_pb(query.model) if query.HasField("model") else None)
+        return cls(constraints, data_model_registry.from_pb(query.model) if query.HasField("model") else None)
 
     def check(self, description: Description) -> bool:
         """
@@ -1149,11 +1204,83 @@ class Query(ProtobufSerializable):
             raise ValueError("Invalid input value for type '{}': the query is not valid "
                              "for the given data model.".format(type(self).__name__))
 
+    def _structure(self) -> Tuple:
+        model = self.model.fingerprint if self.model is not None else None
+        return "Query", tuple(constraint._structure() for constraint in self.constraints), model
+
     def __eq__(self, other):
-        if type(other) != Query:
+        if not isinstance(other, Query):
             return False
+        if self._frozen and other._frozen:
+            return self.fingerprint == other.fingerprint
         return self.constraints == other.constraints and self.model == other.model
 
+    __hash__ = ProtobufSerializable.__hash__
+
+
+class LazyQuery(Query):
+    """
+    A :class:`~oef.query.Query` decoded from its Protobuf object only when its constraints or its data model
+    are accessed for the first time. Until then, :func:`~oef.query.LazyQuery.to_pb` returns
+    the original Protobuf object, so a query can be forwarded without being decoded.
+
+    Since the decoding is deferred, an invalid query raises :class:`ValueError` on first access,
+    rather than when it is received.
+    """
+
+    def __init__(self, query: query_pb2.Query.Model) -> None:
+        """
+        Initialize a lazy query.
+
+        :param query: the Protobuf object that represents the query.
+        """
+        self._pb = query
+        self._constraints = None  # type: Optional[List[ConstraintExpr]]
+        self._model = None  # type: Optional[DataModel]
+
+    @property
+    def is_decoded(self) -> bool:
+        """Whether the query has been decoded."""
+        return self._constraints is not None
+
+    def _decode(self) -> None:
+        """Decode the query, if it has not been decoded yet."""
+        if self._constraints is None:
+            query = Query.from_pb(self._pb)
+            self._constraints, self._model = query.constraints, query.model
+
+    def freeze(self) -> 'LazyQuery':
+        self._decode()
+        return super().freeze()
+
+    @property
+    def constraints(self) -> List[ConstraintExpr]:
+        self._decode()
+        return self._constraints
+
+    @constraints.setter
+    def constraints(self, constraints: List[ConstraintExpr]) -> None:
+        self._decode()
+        self._constraints = constraints
+
+    @property
+    def model(self) -> Optional[DataModel]:
+        self._decode()
+        return self._model
+
+    @model.setter
+    def model(self, model: Optional[DataModel]) -> None:
+        self._decode()
+        self._model = model
+
+    def to_pb(self, target: Optional[query_pb2.Query.Model] = None) -> query_pb2.Query.Model:
+        if self._constraints is None:
+            if target is None:
+                return self._pb
+            target.CopyFrom(self._pb)
+            return target
+        return super().to_pb(target)
+
 class SearchResultItem:
     def __init__(self, public_key: str,
                  core_key : str,
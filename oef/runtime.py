@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+
+oef.runtime
+~~~~~~~~~~~
+
+This module contains helpers to choose the event loop implementation used by the agents.
+
+The proxies and the agents use the loop given to them or, by default, the current event loop.
+Hence, the implementation can be changed without touching the agent code, by calling
+:func:`~oef.runtime.install` at the start of the program, or by setting the ``OEF_EVENT_LOOP``
+environment variable to one of :data:`~oef.runtime.LOOP_IMPLEMENTATIONS` and calling
+:func:`~oef.runtime.install` with no arguments.
+
+uvloop is an optional dependency, installed with ``pip install oef[uvloop]``.
+
+"""
+
+import asyncio
+import logging
+import os
+from typing import List, Optional
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+"""The name of the environment variable that selects the event loop implementation."""
+OEF_EVENT_LOOP_ENV = "OEF_EVENT_LOOP"
+
+"""The supported event loop implementations."""
+LOOP_IMPLEMENTATIONS = ("asyncio", "uvloop")
+
+
+def available_loops() -> List[str]:
+    """
+    Get the event loop implementations that can be used in this environment.
+
+    :return: the names of the available implementations.
+    """
+    return [name for name in LOOP_IMPLEMENTATIONS if name != "uvloop" or uvloop is not None]
+
+
+def _resolve(implementation: Optional[str]) -> str:
+    """
+    Resolve the name of the event loop implementation to use.
+
+    :param implementation: the requested implementation. If ``None``, the value of the ``OEF_EVENT_LOOP``
+                         | environment variable is used or, if not set, uvloop when installed and asyncio otherwise.
+    :return: the name of the implementation.
+    :raises ValueError: if the implementation is unknown, or if it is not available.
+    """
+    if implementation is None:
+        implementation = os.environ.get(OEF_EVENT_LOOP_ENV)
+    if implementation is None:
+        return "uvloop" if uvloop is not None else "asyncio"
+    if implementation not in LOOP_IMPLEMENTATIONS:
+        raise ValueError("Unknown event loop implementation '{}'. Expected one of: {}"
+                         .format(implementation, ", ".join(LOOP_IMPLEMENTATIONS)))
+    if implementation not in available_loops():
+        raise ValueError("Event loop implementation '{}' not available. Install it with 'pip install {}'."
+                         .format(implementation, implementation))
+    return implementation
+
+
+def new_event_loop_policy(implementation: Optional[str] = None) -> asyncio.AbstractEventLoopPolicy:
+    """
+    Create an event loop policy for an event loop implementation.
+
+    :param implementation: the implementation, one of :data:`~oef.runtime.LOOP_IMPLEMENTATIONS`.
+                         | See :func:`~oef.runtime.new_event_loop` for the default.
+    :return: the event loop policy.
+    """
+    if _resolve(implementation) == "uvloop":
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+def new_event_loop(implementation: Optional[str] = None) -> asyncio.AbstractEventLoop:
+    """
+    Create a new event loop.
+
+    :param implementation: the implementation, one of :data:`~oef.runtime.LOOP_IMPLEMENTATIONS`.
+                         | If ``None``, the value of the ``OEF_EVENT_LOOP`` environment variable is used or,
+                         | if not set, uvloop when installed and asyncio otherwise.
+    :return: the new event loop.
+    :raises ValueError: if the implementation is unknown, or if it is not available.
+    """
+    return new_event_loop_policy(implementation).new_event_loop()
+
+
+def install(implementation: Optional[str] = None) -> asyncio.AbstractEventLoop:
+    """
+    Make an event loop implementation the default one, and set a new loop as the current event loop.
+    The proxies created afterwards without an explicit loop will use it.
+
+    :param implementation: the implementation. See :func:`~oef.runtime.new_event_loop` for the default.
+    :return: the new current event loop.
+    """
+    asyncio.set_event_loop_policy(new_event_loop_policy(implementation))
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    logger.debug("Installed the '{}' event loop.".format(_resolve(implementation)))
+    return loop
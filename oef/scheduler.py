@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+
+oef.scheduler
+~~~~~~~~~~~~~
+
+This module implements the concurrent execution of the message handlers of an agent.
+
+Every message belongs to a lane: the messages of the same dialogue, i.e. with the same origin and dialogue id,
+share a lane and are handled one after the other, in order of arrival. Different lanes run concurrently,
+up to a maximum number of handlers in flight.
+
+"""
+
+import asyncio
+import collections
+import logging
+from typing import Awaitable, Callable, Deque, Dict, Hashable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPES = Callable[[], Awaitable[None]]
+
+
+class HandlerStats:
+    """Metrics about the message handlers run by a :class:`~oef.scheduler.HandlerScheduler`."""
+
+    def __init__(self):
+        self.in_flight = 0
+        """The number of handlers running."""
+        self.queued = 0
+        """The number of messages waiting for their handler to start."""
+        self.peak_in_flight = 0
+        """The maximum number of handlers running at the same time."""
+        self.peak_queued = 0
+        """The maximum number of messages waiting at the same time."""
+        self.completed = 0
+        """The number of handlers completed successfully."""
+        self.failed = 0
+        """The number of handlers that raised an exception."""
+        self.lanes = 0
+        """The number of dialogues with messages running or waiting."""
+
+    def __repr__(self):
+        return "HandlerStats(in_flight={}, queued={}, peak_in_flight={}, peak_queued={}, completed={}, failed={})"\
+            .format(self.in_flight, self.queued, self.peak_in_flight, self.peak_queued, self.completed, self.failed)
+
+
+class HandlerScheduler:
+    """
+    Run message handlers concurrently, keeping the order of the handlers submitted in the same lane.
+    """
+
+    def __init__(self, max_in_flight: int, max_queued: Optional[int] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Initialize the scheduler.
+
+        :param max_in_flight: the maximum number of handlers running at the same time.
+        :param max_queued: the maximum number of messages waiting to be handled. When reached,
+                         | :func:`~oef.scheduler.HandlerScheduler.submit` waits, so the agent stops taking
+                         | the messages received, and the connection stops reading from the socket once they
+                         | exceed its ``read_buffer_limits``. By default, 16 times ``max_in_flight``.
+        :param loop: the event loop.
+        """
+        if max_in_flight < 1:
+            raise ValueError("At least one handler must be allowed to run.")
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued if max_queued is not None else 16 * max_in_flight
+        self._loop = loop if loop is not None else asyncio.get_event_loop()
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._lanes = {}  # type: Dict[Hashable, Deque[JOB_TYPES]]
+        self._tasks = set()  # type: Set[asyncio.Future]
+        self._space_waiter = None  # type: Optional[asyncio.Future]
+        self._idle_waiter = None  # type: Optional[asyncio.Future]
+        self.stats = HandlerStats()
+
+    async def submit(self, lane: Hashable, job: JOB_TYPES) -> None:
+        """
+        Schedule a handler. It starts after the handlers previously submitted in the same lane have completed,
+        as soon as fewer than ``max_in_flight`` handlers are running.
+
+        :param lane: the lane of the handler, e.g. the origin and the id of the dialogue.
+        :param job: a function that returns the awaitable running the handler.
+        :return: ``None``, once the handler has been queued.
+        """
+        while self.stats.queued >= self.max_queued:
+            self._space_waiter = self._loop.create_future()
+            await self._space_waiter
+
+        self.stats.queued += 1
+        self.stats.peak_queued = max(self.stats.peak_queued, self.stats.queued)
+        jobs = self._lanes.get(lane)
+        if jobs is not None:
+            jobs.append(job)
+            return
+        self._lanes[lane] = collections.deque([job])
+        self.stats.lanes = len(self._lanes)
+        task = asyncio.ensure_future(self._run_lane(lane), loop=self._loop)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_lane(self, lane: Hashable) -> None:
+        """
+        Run the handlers of a lane, one after the other, until the lane is empty.
+
+        :param lane: the lane.
+        :return: ``None``
+        """
+        jobs = self._lanes[lane]
+        try:
+            while jobs:
+                async with self._semaphore:
+                    self._started()
+                    try:
+                        await jobs[0]()
+                        self.stats.completed += 1
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception:
+                        logger.exception("Error in the handler of a message of {}.".format(lane))
+                        self.stats.failed += 1
+                    finally:
+                        self.stats.in_flight -= 1
+                jobs.popleft()
+        finally:
+            del self._lanes[lane]
+            self.stats.lanes = len(self._lanes)
+            if not self._lanes and self._idle_waiter is not None and not self._idle_waiter.done():
+                self._idle_waiter.set_result(None)
+
+    def _started(self) -> None:
+        """Update the metrics when a handler starts, and wake up the submitter waiting for space, if any."""
+        self.stats.queued -= 1
+        self.stats.in_flight += 1
+        self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.stats.in_flight)
+        if self._space_waiter is not None and not self._space_waiter.done():
+            self._space_waiter.set_result(None)
+
+    async def join(self) -> None:
+        """
+        Wait until all the handlers submitted have completed.
+
+        :return: ``None``
+        """
+        while self._lanes:
+            self._idle_waiter = self._loop.create_future()
+            await self._idle_waiter
+
+    def close(self) -> None:
+        """
+        Cancel all the handlers running or waiting.
+
+        :return: ``None``
+        """
+        for task in list(self._tasks):
+            task.cancel()
+        self.stats.queued = 0
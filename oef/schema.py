@@ -29,23 +29,286 @@ This module defines classes to deal with data models and their instances.
 """
 
 
+import collections
 import copy
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Union, Type, Optional, List, Dict
+from typing import Any, Union, Type, Optional, List, Dict, Tuple, MutableMapping
 
 import oef.agent_pb2 as agent_pb2
 import oef.query_pb2 as query_pb2
 from oef.helpers import haversine
 
 
+class FrozenList(list):
+    """A list that cannot be changed. It is equal to a ``list`` with the same items."""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("'{}' object is immutable.".format(type(self).__name__))
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+class FrozenDict(dict):
+    """A dictionary that cannot be changed. It is equal to a ``dict`` with the same items."""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("'{}' object is immutable.".format(type(self).__name__))
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+class CacheStats:
+    """Hits, misses and evictions of a cache."""
+
+    def __init__(self):
+        self.hits = 0
+        """The number of lookups that found the entry in the cache."""
+        self.misses = 0
+        """The number of lookups that did not find the entry in the cache."""
+        self.evictions = 0
+        """The number of entries removed from a bounded cache to make room for new ones."""
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of the lookups that found the entry in the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def reset(self) -> None:
+        """Set the counters to zero."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return "{}(hits={}, misses={}, evictions={}, hit_rate={:.3f})"\
+            .format(type(self).__name__, self.hits, self.misses, self.evictions, self.hit_rate)
+
+
+serialization_cache_stats = CacheStats()
+"""The hits and misses of the cache of the serialized frozen objects. See :func:`~ProtobufSerializable.freeze`."""
+
+
+def _freeze_value(value: Any) -> Any:
+    """
+    Freeze a value: the :class:`~oef.schema.ProtobufSerializable` objects are frozen in place,
+    and the lists, dictionaries and tuples are replaced by immutable copies with their items frozen.
+
+    :param value: the value.
+    :return: the frozen value.
+    """
+    if isinstance(value, ProtobufSerializable):
+        return value.freeze()
+    elif isinstance(value, list):
+        return FrozenList(_freeze_value(item) for item in value)
+    elif isinstance(value, dict):
+        return FrozenDict((key, _freeze_value(item)) for key, item in value.items())
+    elif isinstance(value, tuple):
+        return tuple(_freeze_value(item) for item in value)
+    return value
+
+
+def unfrozen_type(value: Any) -> type:
+    """
+    The type of a value, or for a frozen object, the type it had before being frozen.
+    Use it instead of :func:`type` to compare the exact type of an object that may be frozen.
+
+    :param value: the value.
+    :return: the type.
+    """
+    value_type = type(value)
+    return getattr(value_type, "_unfrozen_type", value_type)
+
+
+"""The subclasses that the frozen objects are switched to, by original class. See _frozen_class()."""
+_FROZEN_CLASSES = {}  # type: Dict[type, type]
+
+
+def _frozen_setattr(self, name: str, value: Any) -> None:
+    if not name.startswith("_"):
+        raise AttributeError("Cannot set '{}': the {} is frozen.".format(name, type(self).__name__))
+    object.__setattr__(self, name, value)
+
+
+def _frozen_delattr(self, name: str) -> None:
+    if not name.startswith("_"):
+        raise AttributeError("Cannot delete '{}': the {} is frozen.".format(name, type(self).__name__))
+    object.__delattr__(self, name)
+
+
+def _frozen_reduce_ex(self, protocol: int) -> Tuple:
+    return _restore_frozen, (self._unfrozen_type, vars(self))
+
+
+def _restore_frozen(cls: type, state: Dict[str, Any]) -> 'ProtobufSerializable':
+    """
+    Recreate a frozen object, when unpickled or copied.
+
+    :param cls: the class of the object before it was frozen.
+    :param state: the attributes of the object.
+    :return: the frozen object.
+    """
+    obj = cls.__new__(cls)
+    obj.__dict__.update(state)
+    obj.__class__ = _frozen_class(cls)
+    return obj
+
+
+def _frozen_class(cls: type) -> type:
+    """
+    Get the subclass that the objects of a class are switched to when they are frozen. It has the same name,
+    and it refuses to set or delete the public attributes. Only the frozen objects pay for this check.
+
+    :param cls: the class of the object to freeze.
+    :return: the frozen subclass.
+    """
+    frozen = _FROZEN_CLASSES.get(cls)
+    if frozen is None:
+        frozen = type(cls)(cls.__name__, (cls,), {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__doc__": cls.__doc__,
+            "__setattr__": _frozen_setattr,
+            "__delattr__": _frozen_delattr,
+            "__reduce_ex__": _frozen_reduce_ex,
+            "_frozen": True,
+            "_unfrozen_type": cls,
+        })
+        _FROZEN_CLASSES[cls] = frozen
+    return frozen
+
+
 class ProtobufSerializable(ABC):
     """
     Interface that includes method for packing/unpacking to/from Protobuf objects.
+
+    An object can be frozen with :func:`~oef.schema.ProtobufSerializable.freeze`, so that it cannot be changed
+    anymore. The objects that are sent over and over, i.e. descriptions, data models and queries,
+    then keep their serialized Protobuf object, and :func:`~oef.schema.ProtobufSerializable.to_pb` parses it
+    rather than building the Protobuf object again.
+
+    Every object has a :attr:`~oef.schema.ProtobufSerializable.fingerprint`, and the frozen objects can be hashed,
+    so that they can be put in sets and used as keys of dictionaries.
     """
 
+    _frozen = False
+    _pb_class = None  # type: Optional[type]
+    """The class of the Protobuf object, for the classes whose frozen objects cache their serialized form."""
+    _serialized = None  # type: Optional[bytes]
+    _fingerprint = None  # type: Optional[str]
+
+    @property
+    def is_frozen(self) -> bool:
+        """Whether the object has been frozen."""
+        return self._frozen
+
+    def freeze(self) -> 'ProtobufSerializable':
+        """
+        Make the object immutable: its attributes cannot be set anymore, and its lists and dictionaries
+        are replaced by a :class:`~oef.schema.FrozenList` and a :class:`~oef.schema.FrozenDict`.
+        The nested objects, e.g. the data model of a description, are frozen too.
+
+        The object is switched to a subclass with the same name that refuses to set its attributes,
+        so that the objects that are never frozen do not pay for the check. Hence, use ``isinstance``
+        rather than ``type(obj) == cls`` to check the class of an object that may be frozen.
+
+        :return: the object itself.
+        """
+        if not self._frozen:
+            for name, value in vars(self).items():
+                setattr(self, name, _freeze_value(value))
+            self.__class__ = _frozen_class(type(self))
+        return self
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        A digest of what the object is compared by with ``==``: equal objects have the same fingerprint.
+        Unlike :func:`hash`, it is the same in every process, so it can be stored or sent to other agents.
+        The fingerprint of a frozen object is computed only once.
+        """
+        if self._fingerprint is not None:
+            return self._fingerprint
+        fingerprint = hashlib.sha1(repr(self._structure()).encode("utf-8")).hexdigest()
+        if self._frozen:
+            self._fingerprint = fingerprint
+        return fingerprint
+
+    def _structure(self) -> Tuple:
+        """
+        What the object is compared by with ``==``, as nested tuples of strings and numbers,
+        starting with the name of the class. See :attr:`~oef.schema.ProtobufSerializable.fingerprint`.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _structure_of(value: Any) -> Any:
+        """
+        The structure of a value: the structure of an object, or the value itself. The numbers equal with ``==``,
+        e.g. ``1``, ``1.0`` and ``True``, have the same structure, like they have the same hash.
+
+        :param value: the value.
+        :return: the structure of the value.
+        """
+        value_type = type(value)
+        if value_type is str or value_type is int:
+            return value
+        elif value_type is bool or (value_type is float and value.is_integer()):
+            return int(value)
+        elif isinstance(value, ProtobufSerializable):
+            return value._structure()
+        return value
+
+    def __hash__(self):
+        if not self._frozen:
+            raise TypeError("unhashable type: '{}': freeze it first.".format(type(self).__name__))
+        return hash(self.fingerprint)
+
+    def _cached_pb(self, target):
+        """
+        Fill in the Protobuf object from the cached serialized form of a frozen object,
+        serializing it on the first call.
+
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
+        :return: the Protobuf object.
+        """
+        if self._serialized is None:
+            serialization_cache_stats.misses += 1
+            self._serialized = self._build_pb(None).SerializeToString()
+        else:
+            serialization_cache_stats.hits += 1
+        pb = self._pb_class() if target is None else target
+        pb.MergeFromString(self._serialized)
+        return pb
+
+    def _build_pb(self, target):
+        """
+        Build the Protobuf object, for the classes that cache the serialized form of their frozen objects.
+
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
+        :return: the Protobuf object.
+        """
+        raise NotImplementedError
+
     @abstractmethod
-    def to_pb(self):
-        """Convert the object into a Protobuf object"""
+    def to_pb(self, target=None):
+        """
+        Convert the object into a Protobuf object.
+
+        :param target: the Protobuf object to fill in, e.g. a field of the enclosing message,
+                     | so that the object is written in place rather than built apart and copied.
+                     | If ``None``, a new Protobuf object is created.
+        :return: the Protobuf object, i.e. ``target`` if provided.
+        """
 
     @classmethod
     @abstractmethod
@@ -84,13 +347,14 @@ class Location(ProtobufSerializable):
         longitude = obj.lon
         return cls(latitude, longitude)
 
-    def to_pb(self) -> query_pb2.Query.Location:
+    def to_pb(self, target: Optional[query_pb2.Query.Location] = None) -> query_pb2.Query.Location:
         """
         From an instance of :class:`~oef.schema.Location` to its associated Protobuf object.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the Location Protobuf object that contains the :class:`~oef.schema.Location` constraint.
         """
-        location_pb = query_pb2.Query.Location()
+        location_pb = query_pb2.Query.Location() if target is None else target
         location_pb.lat = self.latitude
         location_pb.lon = self.longitude
         return location_pb
@@ -98,12 +362,17 @@ class Location(ProtobufSerializable):
     def distance(self, other) -> float:
         return haversine(self.latitude, self.longitude, other.latitude, other.longitude)
 
+    def _structure(self) -> Tuple:
+        return "Location", self._structure_of(self.latitude), self._structure_of(self.longitude)
+
     def __eq__(self, other):
-        if type(other) != Location:
+        if unfrozen_type(other) != Location:
             return False
         else:
             return self.latitude == other.latitude and self.longitude == other.longitude
 
+    __hash__ = ProtobufSerializable.__hash__
+
 
 """
 The allowable types that an Attribute can have
@@ -137,6 +406,9 @@ class AttributeSchema(ProtobufSerializable):
         Location: query_pb2.Query.Attribute.LOCATION
     }
 
+    """mapping from the pb of attribute types to the attribute types"""
+    _pb_to_attribute_type = {pb: attribute_type for attribute_type, pb in _attribute_type_to_pb.items()}
+
     def __init__(self,
                  attribute_name: str,
                  attribute_type: Type[ATTRIBUTE_TYPES],
@@ -155,13 +427,14 @@ class AttributeSchema(ProtobufSerializable):
         self.required = is_attribute_required
         self.description = attribute_description
 
-    def to_pb(self) -> query_pb2.Query.Attribute:
+    def to_pb(self, target: Optional[query_pb2.Query.Attribute] = None) -> query_pb2.Query.Attribute:
         """
         Convert the attribute into a Protobuf object
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the associated Attribute protobuf object.
         """
-        attribute = query_pb2.Query.Attribute()
+        attribute = query_pb2.Query.Attribute() if target is None else target
         attribute.name = self.name
         attribute.type = self._attribute_type_to_pb[self.type]
         attribute.required = self.required
@@ -178,16 +451,21 @@ class AttributeSchema(ProtobufSerializable):
         :return: the attribute.
         """
         return cls(attribute.name,
-                   dict(map(reversed, cls._attribute_type_to_pb.items()))[attribute.type],
+                   cls._pb_to_attribute_type[attribute.type],
                    attribute.required,
-                   attribute.description if attribute.description else None)
+                   attribute.description if attribute.HasField("description") else None)
+
+    def _structure(self) -> Tuple:
+        return "AttributeSchema", self.name, self.type.__name__, self._structure_of(self.required)
 
     def __eq__(self, other):
-        if type(other) != AttributeSchema:
+        if unfrozen_type(other) != AttributeSchema:
             return False
         else:
             return self.name == other.name and self.type == other.type and self.required == other.required
 
+    __hash__ = ProtobufSerializable.__hash__
+
 
 class AttributeInconsistencyException(Exception):
     """
@@ -226,39 +504,115 @@ class DataModel(ProtobufSerializable):
         :param attribute_schemas: the list of attributes that constitutes the data model.
         :param description: a short description for the data model.
         """
+        self._init(name, copy.deepcopy(attribute_schemas), description)
+
+    def _init(self, name: str, attribute_schemas: List[AttributeSchema], description: Optional[str]) -> None:
+        """Initialize the data model with attribute schemas it owns, i.e. that are not copied."""
         self.name = name
-        self.attribute_schemas = sorted(copy.deepcopy(attribute_schemas), key=lambda x: x.name)
+        self.attribute_schemas = sorted(attribute_schemas, key=lambda x: x.name)
         self.description = description
         self.attributes_by_name = {a.name: a for a in self.attribute_schemas}
         self._check_validity()
+        # the validator of the descriptions, see validate().
+        self._required_names = frozenset(a.name for a in self.attribute_schemas if a.required)
+        self._attribute_types = {a.name: a.type for a in self.attribute_schemas}
+        # the attribute types need not be classes, e.g. typing.List[int]: issubclass() would raise on them.
+        self._unallowed_names = frozenset(a.name for a in self.attribute_schemas
+                                          if not (isinstance(a.type, type) and issubclass(a.type, ATTRIBUTE_TYPES.__args__)))
+
+    @classmethod
+    def _from_schemas(cls, name: str, attribute_schemas: List[AttributeSchema],
+                      description: Optional[str] = None) -> 'DataModel':
+        """
+        Create a data model from attribute schemas just created for it, without copying them.
+
+        :param name: the name of the data model.
+        :param attribute_schemas: the attribute schemas, not referenced by anything else.
+        :param description: a short description for the data model.
+        :return: the data model.
+        """
+        data_model = cls.__new__(cls)
+        data_model._init(name, attribute_schemas, description)
+        return data_model
 
     @classmethod
     def from_pb(cls, model: query_pb2.Query.DataModel):
         """
-        Unpack the data model Protobuf object.
+        Unpack the data model Protobuf object into a new data model, that is not interned.
+
+        The data models of the descriptions and the queries that are decoded, instead, are interned in
+        :data:`~oef.schema.data_model_registry`: they share the same frozen instance, that must not be changed.
+        Use :func:`~oef.schema.DataModelRegistry.from_pb` to get that instance.
 
         :param model: the Protobuf object associated with the data model.
         :return: the data model.
         """
-
         name = model.name
         attributes = [AttributeSchema.from_pb(attr_pb) for attr_pb in model.attributes]
-        description = model.description
-        return cls(name, attributes, description)
+        description = model.description if model.HasField("description") else None
+        return cls._from_schemas(name, attributes, description)
+
+    @property
+    def _interning_key(self) -> Tuple:
+        """
+        The name and the description of the data model, and the name, type, requirement and description
+        of every attribute. Unlike the :attr:`~oef.schema.ProtobufSerializable.fingerprint`, it includes
+        the descriptions: two data models with the same key are serialized the same way.
+        """
+        return (self.name, self.description,
+                tuple((a.name, a.type, a.required, a.description) for a in self.attribute_schemas))
+
+    def _structure(self) -> Tuple:
+        return "DataModel", self.name, tuple(attribute._structure() for attribute in self.attribute_schemas)
+
+    _pb_class = query_pb2.Query.DataModel
 
-    def to_pb(self):
+    def to_pb(self, target: Optional[query_pb2.Query.DataModel] = None) -> query_pb2.Query.DataModel:
         """
         Convert the data model into a Protobuf object
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the associated DataModel Protobuf object.
         """
-        model = query_pb2.Query.DataModel()
+        if self._frozen:
+            return self._cached_pb(target)
+        return self._build_pb(target)
+
+    def _build_pb(self, target: Optional[query_pb2.Query.DataModel]) -> query_pb2.Query.DataModel:
+        model = query_pb2.Query.DataModel() if target is None else target
         model.name = self.name
-        model.attributes.extend([attr.to_pb() for attr in self.attribute_schemas])
+        for attr in self.attribute_schemas:
+            attr.to_pb(model.attributes.add())
         if self.description is not None:
             model.description = self.description
         return model
 
+    def validate(self, attribute_values: Dict[str, ATTRIBUTE_TYPES]) -> None:
+        """
+        Check the values of a description against the data model.
+
+        The sets of the required and of the allowed attribute names, and the type of every attribute,
+        are computed once, when the data model is created, so the attribute schemas must not be changed afterwards.
+
+        :param attribute_values: the values of the description.
+        :return: ``None``
+        :raises AttributeInconsistencyException: if the values do not meet the data model.
+        """
+        names = attribute_values.keys()
+        if not self._required_names <= names:
+            raise AttributeInconsistencyException("Missing required attribute.")
+        attribute_types = self._attribute_types
+        if not names <= attribute_types.keys():
+            raise AttributeInconsistencyException("Have extra attribute not in schema")
+        for name, value in attribute_values.items():
+            if type(value) is not attribute_types[name] and unfrozen_type(value) is not attribute_types[name]:
+                raise AttributeInconsistencyException(
+                    "Attribute {} has incorrect type: {}".format(name, attribute_types[name]))
+        if self._unallowed_names:
+            unallowed = self._unallowed_names & names
+            if unallowed:
+                raise AttributeInconsistencyException("Attribute {} has unallowed type".format(min(unallowed)))
+
     def _check_validity(self):
         # check if there are duplicated attribute names
         attribute_names = [attribute.name for attribute in self.attribute_schemas]
@@ -267,11 +621,93 @@ class DataModel(ProtobufSerializable):
                              .format(type(self).__name__))
 
     def __eq__(self, other):
-        if type(other) != DataModel:
+        if unfrozen_type(other) != DataModel:
             return False
+        elif self._frozen and other._frozen:
+            return self.fingerprint == other.fingerprint
         else:
             return self.name == other.name and self.attribute_schemas == other.attribute_schemas
 
+    __hash__ = ProtobufSerializable.__hash__
+
+
+"""The default maximum number of data models in a :class:`~oef.schema.DataModelRegistry`."""
+DEFAULT_MAX_INTERNED_DATA_MODELS = 1024
+
+
+class DataModelRegistry:
+    """
+    An intern table of data models, keyed by their structure, descriptions included.
+
+    The data models in the table are frozen, so they can be shared by all the descriptions and queries that
+    use them, and they serialize their Protobuf object only once, see :func:`~oef.schema.ProtobufSerializable.freeze`.
+    :func:`~oef.schema.DataModelRegistry.from_pb` also remembers the serialized data models it has decoded,
+    so the same data model received again is neither decoded nor checked.
+
+    The table holds at most ``max_size`` data models, and as many serialized forms: once full,
+    the new data models are returned as they are, without being interned.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_INTERNED_DATA_MODELS):
+        """
+        Initialize the registry.
+
+        :param max_size: the maximum number of data models in the table.
+        """
+        self.max_size = max_size
+        self.stats = CacheStats()
+        self._by_key = {}  # type: Dict[Tuple, DataModel]
+        self._by_serialized = {}  # type: Dict[bytes, DataModel]
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def intern(self, data_model: DataModel) -> DataModel:
+        """
+        Get the interned data model with the same structure, interning this one if there is none.
+        Like :func:`sys.intern`, keep the returned data model, e.g. ``MODEL = data_model_registry.intern(MODEL)``.
+
+        :param data_model: the data model. It is frozen if it is interned.
+        :return: the interned data model, or the data model itself if the table is full.
+        """
+        key = data_model._interning_key
+        interned = self._by_key.get(key)
+        if interned is not None:
+            self.stats.hits += 1
+            return interned
+        self.stats.misses += 1
+        if len(self._by_key) >= self.max_size:
+            return data_model
+        self._by_key[key] = data_model.freeze()
+        return data_model
+
+    def from_pb(self, model: query_pb2.Query.DataModel) -> DataModel:
+        """
+        Unpack the data model Protobuf object into the interned data model.
+
+        :param model: the Protobuf object associated with the data model.
+        :return: the interned data model.
+        """
+        serialized = model.SerializeToString()
+        interned = self._by_serialized.get(serialized)
+        if interned is not None:
+            self.stats.hits += 1
+            return interned
+        interned = self.intern(DataModel.from_pb(model))
+        if interned.is_frozen and len(self._by_serialized) < self.max_size:
+            self._by_serialized[serialized] = interned
+        return interned
+
+    def clear(self) -> None:
+        """Remove all the data models from the table, and reset the counters."""
+        self._by_key.clear()
+        self._by_serialized.clear()
+        self.stats.reset()
+
+
+data_model_registry = DataModelRegistry()
+"""The process-wide intern table of the data models, used when decoding the descriptions and the queries."""
+
 
 def generate_schema(model_name: str, attribute_values: Dict[str, ATTRIBUTE_TYPES]) -> DataModel:
     """
@@ -284,7 +720,7 @@ def generate_schema(model_name: str, attribute_values: Dict[str, ATTRIBUTE_TYPES
     :return: the schema compliant with the values specified.
     """
 
-    return DataModel(model_name, [AttributeSchema(k, type(v), True) for k, v in attribute_values.items()])
+    return DataModel._from_schemas(model_name, [AttributeSchema(k, unfrozen_type(v), True) for k, v in attribute_values.items()])
 
 
 class Description(ProtobufSerializable):
@@ -340,6 +776,30 @@ class Description(ProtobufSerializable):
 
         self._check_consistency()
 
+    @classmethod
+    def trusted(cls, attribute_values: Dict[str, ATTRIBUTE_TYPES],
+                data_model: DataModel = None,
+                data_model_name: str = "") -> 'Description':
+        """
+        Create a description from values already known to be consistent with the data model,
+        e.g. values just checked, or built by the agent itself from a fixed data model.
+
+        Unlike the constructor, the values are neither copied nor checked against the data model:
+        the description takes the dictionary as it is, so it must not be changed afterwards by the caller.
+        Use the constructor for the values that come from outside the agent.
+
+        :param attribute_values: the values of each attribute in the description.
+        :param data_model: the schema of the description. If none is provided, it is generated from the values.
+        :param data_model_name: the name of the generated data model. If a data model is provided,
+               | this parameter is ignored.
+        :return: the description.
+        """
+        description = cls.__new__(cls)
+        description.values = attribute_values
+        description.data_model = data_model if data_model is not None \
+            else generate_schema(data_model_name, attribute_values)
+        return description
+
     @staticmethod
     def _extract_value(value: query_pb2.Query.Value) -> ATTRIBUTE_TYPES:
         """
@@ -364,25 +824,49 @@ class Description(ProtobufSerializable):
     def from_pb(cls, query_instance: query_pb2.Query.Instance):
         """
         Unpack the data model Protobuf object.
+        The values are decoded into a new dictionary, so they are checked against the data model, but not copied.
+        The data model is interned in :data:`~oef.schema.data_model_registry`, so it is frozen and shared.
+
+        If the :data:`~oef.schema.description_cache` is enabled, the description is looked up there first,
+        and it is frozen and shared with the other descriptions decoded from the same bytes.
+        See :class:`~oef.schema.DescriptionCache`.
 
         :param query_instance: the Protobuf object associated with the data model.
         :return: the data model.
+        :raises AttributeInconsistencyException: if the values do not meet the data model.
+        """
+        if cls is Description and description_cache.enabled:
+            return description_cache.from_pb(query_instance)
+        return cls._decode(query_instance)
+
+    @classmethod
+    def _decode(cls, query_instance: query_pb2.Query.Instance) -> 'Description':
+        """
+        Unpack the description Protobuf object into a new description, bypassing the description cache.
+
+        :param query_instance: the Protobuf object associated with the description.
+        :return: the description.
+        :raises AttributeInconsistencyException: if the values do not meet the data model.
         """
-        model = DataModel.from_pb(query_instance.model)
-        values = dict([(attr.key, cls._extract_value(attr.value)) for attr in query_instance.values])
-        return cls(values, model)
+        model = data_model_registry.from_pb(query_instance.model)
+        values = {attr.key: cls._extract_value(attr.value) for attr in query_instance.values}
+        description = cls.trusted(values, model)
+        description._check_consistency()
+        return description
 
     @staticmethod
-    def _to_key_value_pb(key: str, value: ATTRIBUTE_TYPES) -> query_pb2.Query.KeyValue:
+    def _to_key_value_pb(key: str, value: ATTRIBUTE_TYPES,
+                         target: Optional[query_pb2.Query.KeyValue] = None) -> query_pb2.Query.KeyValue:
         """
         From a (key, attribute value) pair to the associated Protobuf object.
 
         :param key: the key of the attribute.
         :param value: the value of the attribute.
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the associated Protobuf object.
         """
 
-        kv = query_pb2.Query.KeyValue()
+        kv = query_pb2.Query.KeyValue() if target is None else target
         kv.key = key
         if type(value) == bool:
             kv.value.b = value
@@ -392,30 +876,41 @@ class Description(ProtobufSerializable):
             kv.value.d = value
         elif type(value) == str:
             kv.value.s = value
-        elif type(value) == Location:
-            kv.value.l.CopyFrom(value.to_pb())
+        elif unfrozen_type(value) == Location:
+            value.to_pb(kv.value.l)
 
         return kv
 
-    def to_pb(self) -> query_pb2.Query.Instance:
+    _pb_class = query_pb2.Query.Instance
+
+    def to_pb(self, target: Optional[query_pb2.Query.Instance] = None) -> query_pb2.Query.Instance:
         """
         Return the description object as a Protobuf query instance.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the Protobuf query instance object associated to the description.
         """
-        instance = query_pb2.Query.Instance()
-        instance.model.CopyFrom(self.data_model.to_pb())
-        instance.values.extend([self._to_key_value_pb(key, value) for key, value in self.values.items()])
+        if self._frozen:
+            return self._cached_pb(target)
+        return self._build_pb(target)
+
+    def _build_pb(self, target: Optional[query_pb2.Query.Instance]) -> query_pb2.Query.Instance:
+        instance = query_pb2.Query.Instance() if target is None else target
+        self.data_model.to_pb(instance.model)
+        for key, value in self.values.items():
+            self._to_key_value_pb(key, value, instance.values.add())
         return instance
 
-    def to_agent_description_pb(self) -> agent_pb2.AgentDescription:
+    def to_agent_description_pb(self, target: Optional[agent_pb2.AgentDescription] = None) \
+            -> agent_pb2.AgentDescription:
         """
         Convert the description into the Protobuf object associated to the AgentDescription message.
 
+        :param target: the Protobuf object to fill in. If ``None``, a new one is created.
         :return: the associated AgentDescription Protobuf object.
         """
-        description = agent_pb2.AgentDescription()
-        description.description.CopyFrom(self.to_pb())
+        description = agent_pb2.AgentDescription() if target is None else target
+        self.to_pb(description.description)
         return description
 
     def _check_consistency(self):
@@ -429,31 +924,164 @@ class Description(ProtobufSerializable):
         :raises AttributeInconsistencyException: if values do not meet the schema, or if no schema is present
                                                | if they have disallowed types.
         """
+        self.data_model.validate(self.values)
 
-        # check that all required attributes in the schema are contained in the description
-        required_attributes = [s.name for s in self.data_model.attribute_schemas if s.required]
-        if not all(a in self.values for a in required_attributes):
-            raise AttributeInconsistencyException("Missing required attribute.")
-
-        # check that all values are defined in the schema
-        all_schema_attributes = [s.name for s in self.data_model.attribute_schemas]
-        if not all(k in all_schema_attributes for k in self.values):
-            raise AttributeInconsistencyException("Have extra attribute not in schema")
-
-        # check that each of the values are consistent with that specified in the schema
-        for schema in self.data_model.attribute_schemas:
-            if schema.name in self.values:
-                if type(self.values[schema.name]) != schema.type:
-                    # values does not match type in schema
-                    raise AttributeInconsistencyException(
-                        "Attribute {} has incorrect type: {}".format(schema.name, schema.type))
-                elif not isinstance(self.values[schema.name], ATTRIBUTE_TYPES.__args__):
-                    # value type matches schema, but it is not an allowed type
-                    raise AttributeInconsistencyException(
-                        "Attribute {} has unallowed type".format(schema.name))
+    def _structure(self) -> Tuple:
+        values = self.values
+        names = sorted(values)
+        structure_of = self._structure_of
+        return "Description", tuple(names), tuple(structure_of(values[name]) for name in names), \
+            self.data_model.fingerprint
 
     def __eq__(self, other):
-        if type(other) != Description:
+        if not isinstance(other, Description):
             return False
+        elif self._frozen and other._frozen:
+            return self.fingerprint == other.fingerprint
         else:
             return self.values == other.values and self.data_model == other.data_model
+
+    __hash__ = ProtobufSerializable.__hash__
+
+
+class DescriptionCache:
+    """
+    A bounded cache of decoded descriptions, keyed by their serialized Protobuf object, for the agents
+    that receive the same descriptions over and over, e.g. the proposals of many sellers.
+
+    The descriptions in the cache are frozen, so that they can be shared, and they keep the bytes they were
+    decoded from as their serialized form, see :func:`~oef.schema.ProtobufSerializable.freeze`.
+    When the cache is full, the least recently used description is evicted.
+    A cache with capacity ``0`` is disabled.
+    """
+
+    def __init__(self, capacity: int = 0):
+        """
+        Initialize the cache.
+
+        :param capacity: the maximum number of descriptions in the cache.
+        """
+        self.capacity = capacity
+        self.stats = CacheStats()
+        self._descriptions = collections.OrderedDict()  # type: MutableMapping[bytes, Description]
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is enabled, i.e. whether its capacity is positive."""
+        return self.capacity > 0
+
+    def __len__(self) -> int:
+        return len(self._descriptions)
+
+    def resize(self, capacity: int) -> None:
+        """
+        Change the capacity of the cache, evicting the least recently used descriptions that do not fit.
+
+        :param capacity: the maximum number of descriptions in the cache. ``0`` disables the cache.
+        :return: ``None``
+        """
+        self.capacity = capacity
+        self._evict()
+
+    def from_pb(self, query_instance: query_pb2.Query.Instance) -> Description:
+        """
+        Get the description of the Protobuf object from the cache, decoding it if it is not there.
+
+        :param query_instance: the Protobuf object associated with the description.
+        :return: the frozen description.
+        :raises AttributeInconsistencyException: if the values do not meet the data model.
+        """
+        serialized = query_instance.SerializeToString()
+        description = self._descriptions.get(serialized)
+        if description is not None:
+            self.stats.hits += 1
+            self._descriptions.move_to_end(serialized)
+            return description
+        self.stats.misses += 1
+        description = Description._decode(query_instance).freeze()
+        description._serialized = serialized
+        if self.enabled:
+            self._descriptions[serialized] = description
+            self._evict()
+        return description
+
+    def _evict(self) -> None:
+        while len(self._descriptions) > self.capacity:
+            self._descriptions.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all the descriptions from the cache, and reset the counters."""
+        self._descriptions.clear()
+        self.stats.reset()
+
+
+description_cache = DescriptionCache()
+"""
+The cache used by :func:`~oef.schema.Description.from_pb` and by the agents to decode the proposals.
+It is disabled by default: enable it with :func:`~oef.schema.DescriptionCache.resize`.
+"""
+
+
+class LazyDescription(Description):
+    """
+    A :class:`~oef.schema.Description` decoded from its Protobuf object only when its values or its data model
+    are accessed for the first time. Until then, :func:`~oef.schema.LazyDescription.to_pb` returns
+    the original Protobuf object, so a description can be forwarded without being decoded.
+
+    Since the decoding is deferred, an inconsistent description raises
+    :class:`~oef.schema.AttributeInconsistencyException` on first access, rather than when it is received.
+    """
+
+    def __init__(self, query_instance: query_pb2.Query.Instance) -> None:
+        """
+        Initialize a lazy description.
+
+        :param query_instance: the Protobuf object associated with the description.
+        """
+        self._pb = query_instance
+        self._values = None  # type: Optional[Dict[str, ATTRIBUTE_TYPES]]
+        self._data_model = None  # type: Optional[DataModel]
+
+    @property
+    def is_decoded(self) -> bool:
+        """Whether the description has been decoded."""
+        return self._values is not None
+
+    def _decode(self) -> None:
+        """Decode the description, if it has not been decoded yet."""
+        if self._values is None:
+            description = Description.from_pb(self._pb)
+            self._values, self._data_model = description.values, description.data_model
+
+    def freeze(self) -> 'LazyDescription':
+        self._decode()
+        return super().freeze()
+
+    @property
+    def values(self) -> Dict[str, ATTRIBUTE_TYPES]:
+        self._decode()
+        return self._values
+
+    @values.setter
+    def values(self, values: Dict[str, ATTRIBUTE_TYPES]) -> None:
+        self._decode()
+        self._values = values
+
+    @property
+    def data_model(self) -> DataModel:
+        self._decode()
+        return self._data_model
+
+    @data_model.setter
+    def data_model(self, data_model: DataModel) -> None:
+        self._decode()
+        self._data_model = data_model
+
+    def to_pb(self, target: Optional[query_pb2.Query.Instance] = None) -> query_pb2.Query.Instance:
+        if self._values is None:
+            if target is None:
+                return self._pb
+            target.CopyFrom(self._pb)
+            return target
+        return super().to_pb(target)
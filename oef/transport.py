@@ -0,0 +1,490 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+
+oef.transport
+~~~~~~~~~~~~~
+
+This module implements the transport layer used to talk with an OEF Node over the network,
+that is an :class:`asyncio.Protocol` that splits the incoming byte stream into length-prefixed frames.
+
+"""
+
+import asyncio
+import collections
+import contextlib
+import logging
+import socket
+import struct
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Deque, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+"""The struct used to pack/unpack the length prefix of every frame exchanged with the OEF Node."""
+_HEADER = struct.Struct("I")
+_HEADER_SIZE = _HEADER.size
+
+FRAME_TYPES = Union[bytes, bytearray]
+
+"""The default high-water and low-water marks (in bytes) of the frames received but not consumed yet."""
+DEFAULT_READ_BUFFER_LIMITS = (1024 * 1024, 256 * 1024)
+
+
+class OEFConnectionError(ConnectionError):
+    """
+    This exception is used whenever an error occurs during the connection to the OEF Node.
+    """
+
+
+class OEFWriteBufferFullError(OEFConnectionError):
+    """
+    This exception is raised when a message is sent while the write buffer of the connection
+    is above its high-water mark, and the overflow policy is :attr:`~oef.transport.OverflowPolicy.RAISE`.
+    """
+
+
+class OEFFrameTooLargeError(OEFConnectionError):
+    """
+    This exception is raised when a frame exceeds the maximum frame size of the connection.
+    When it happens on a received frame, the connection is closed, since the rest of the stream cannot be trusted.
+    """
+
+
+class OverflowPolicy(Enum):
+    """
+    What the synchronous send methods of :class:`~oef.proxy.OEFNetworkProxy` do
+    when the write buffer of the connection is above its high-water mark.
+    """
+
+    BLOCK = "block"
+    """Wait until the buffer is drained below the low-water mark. Only possible when the event loop is not running;
+    inside the loop (e.g. in a handler) the message is buffered, use the ``async_send_*`` methods instead."""
+    DROP = "drop"
+    """Drop the message, with a warning."""
+    RAISE = "raise"
+    """Raise :class:`~oef.transport.OEFWriteBufferFullError`."""
+
+
+class SocketOptions:
+    """
+    Options of the socket used by :class:`~oef.proxy.OEFNetworkProxy`, set once the connection is established.
+
+    Every option left to ``None`` keeps the system default. Notice that :mod:`asyncio` already enables
+    ``TCP_NODELAY`` on TCP connections, so ``nodelay=False`` is needed to go back to Nagle's algorithm.
+    The TCP options are ignored on Unix domain sockets, and the keepalive parameters
+    are ignored on the platforms that do not support them.
+    """
+
+    def __init__(self, nodelay: Optional[bool] = True,
+                 send_buffer_size: Optional[int] = None,
+                 receive_buffer_size: Optional[int] = None,
+                 keepalive: Optional[bool] = None,
+                 keepalive_idle: Optional[int] = None,
+                 keepalive_interval: Optional[int] = None,
+                 keepalive_count: Optional[int] = None):
+        """
+        Initialize the socket options.
+
+        :param nodelay: whether to set ``TCP_NODELAY``, that is, to disable Nagle's algorithm.
+        :param send_buffer_size: the size of the kernel send buffer (``SO_SNDBUF``), in bytes.
+        :param receive_buffer_size: the size of the kernel receive buffer (``SO_RCVBUF``), in bytes.
+        :param keepalive: whether to enable TCP keepalive (``SO_KEEPALIVE``).
+        :param keepalive_idle: the idle time (in seconds) before the first keepalive probe (``TCP_KEEPIDLE``).
+        :param keepalive_interval: the time (in seconds) between two keepalive probes (``TCP_KEEPINTVL``).
+        :param keepalive_count: the number of unanswered probes before dropping the connection (``TCP_KEEPCNT``).
+        """
+        self.nodelay = nodelay
+        self.send_buffer_size = send_buffer_size
+        self.receive_buffer_size = receive_buffer_size
+        self.keepalive = keepalive
+        self.keepalive_idle = keepalive_idle
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count = keepalive_count
+
+    def _options(self, sock: socket.socket):
+        """
+        Yield the options that apply to a socket.
+
+        :param sock: the socket.
+        :return: tuples ``(name, level, option, value)``, where ``value`` is ``None`` if the option is not set.
+        """
+        yield "send_buffer_size", socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size
+        yield "receive_buffer_size", socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer_size
+        if sock.family not in (socket.AF_INET, socket.AF_INET6):
+            return
+        yield "nodelay", socket.IPPROTO_TCP, socket.TCP_NODELAY, self.nodelay
+        yield "keepalive", socket.SOL_SOCKET, socket.SO_KEEPALIVE, self.keepalive
+        for name, option_name in (("keepalive_idle", "TCP_KEEPIDLE"),
+                                  ("keepalive_interval", "TCP_KEEPINTVL"),
+                                  ("keepalive_count", "TCP_KEEPCNT")):
+            if hasattr(socket, option_name):
+                yield name, socket.IPPROTO_TCP, getattr(socket, option_name), getattr(self, name)
+
+    def apply(self, sock: socket.socket) -> Dict[str, int]:
+        """
+        Set the options on a connected socket.
+
+        :param sock: the socket.
+        :return: the effective values of the options, as reported by the operating system,
+               | which can differ from the requested ones (e.g. Linux doubles the buffer sizes).
+        """
+        effective = {}
+        for name, level, option, value in self._options(sock):
+            if value is not None:
+                try:
+                    sock.setsockopt(level, option, int(value))
+                except OSError as e:
+                    logger.warning("Unable to set the socket option {}={}: {}".format(name, value, e))
+            effective[name] = sock.getsockopt(level, option)
+        return effective
+
+
+class OEFProtocol(asyncio.Protocol):
+    """
+    The protocol used by :class:`~oef.proxy.OEFNetworkProxy` to communicate with an OEF Node.
+
+    Every message is framed by a 4-byte length prefix. :func:`~oef.transport.OEFProtocol.data_received`
+    splits all the complete frames out of the received data at once, and keeps them until
+    they are consumed with :func:`~oef.transport.OEFProtocol.receive`
+    or :func:`~oef.transport.OEFProtocol.receive_many`.
+
+    Frames that are split across several reads are filled into a buffer preallocated with the size
+    announced by the length prefix, so they are reassembled in linear time and delivered without further copies.
+
+    When the frames received but not consumed yet exceed the high-water mark of ``read_buffer_limits``,
+    reading from the connection is paused, so the peer is slowed down by TCP flow control.
+    It is resumed once they are consumed below the low-water mark.
+
+    Outgoing frames are written with a single :func:`asyncio.WriteTransport.writelines` call each.
+    In batching mode, the frames written during one iteration of the event loop are queued and written
+    together at the end of it. Writes can also be corked manually with :func:`~oef.transport.OEFProtocol.cork`.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, batch_writes: bool = False,
+                 on_connection_lost: Optional[Callable[["OEFProtocol", Optional[Exception], List[bytes]], None]] = None,
+                 max_frame_size: Optional[int] = None,
+                 read_buffer_limits: Optional[Tuple[int, int]] = DEFAULT_READ_BUFFER_LIMITS):
+        """
+        Initialize the protocol.
+
+        :param loop: the event loop.
+        :param batch_writes: whether the outgoing frames are queued and flushed once per event loop iteration.
+        :param on_connection_lost: a callback, called when the connection is lost or closed with the protocol,
+                                 | the exception (if any), and the content of the frames queued by the batching
+                                 | mode or by a cork but not written yet.
+        :param max_frame_size: the maximum size (in bytes) of a frame, in both directions. ``None`` means no limit.
+        :param read_buffer_limits: the high-water and low-water marks (in bytes) of the frames received
+                                 | but not consumed yet. ``None`` means that reading is never paused.
+        """
+        self._loop = loop
+        self.transport = None  # type: Optional[asyncio.Transport]
+        self.on_connection_lost = on_connection_lost
+        self.max_frame_size = max_frame_size
+
+        self.batch_writes = batch_writes
+        self._write_queue = []  # type: List[bytes]
+        self._flush_handle = None  # type: Optional[asyncio.Handle]
+        self._corked = 0
+
+        self._buffer = bytearray()
+        self._partial = None  # type: Optional[bytearray]
+        self._partial_view = None  # type: Optional[memoryview]
+        self._partial_pos = 0
+        self._frames = collections.deque()  # type: Deque[FRAME_TYPES]
+        self._frames_size = 0
+        self._waiter = None  # type: Optional[asyncio.Future]
+        if read_buffer_limits is not None and not read_buffer_limits[0] >= read_buffer_limits[1] >= 0:
+            raise ValueError("The read buffer limits must be (high, low), with high >= low >= 0, not {}."
+                             .format(read_buffer_limits))
+        self.read_buffer_limits = read_buffer_limits
+        self._reading_paused = False
+
+        self._closed = False
+        self._exception = None  # type: Optional[Exception]
+
+        self._paused = False
+        self._drain_waiter = None  # type: Optional[asyncio.Future]
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        logger.debug("Connection with the OEF Node lost: {}".format(exc))
+        self._closed = True
+        if exc is not None or self._exception is None:
+            self._exception = exc
+        # the queue alternates the length prefixes and the contents of the frames.
+        unsent = self._write_queue[1::2]
+        self._write_queue = []
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._wake_up(self._waiter)
+        self._waiter = None
+        if self._paused:
+            self._paused = False
+            self._wake_up(self._drain_waiter)
+            self._drain_waiter = None
+        if self.on_connection_lost is not None:
+            self.on_connection_lost(self, exc, unsent)
+
+    def eof_received(self) -> bool:
+        # close the transport
+        return False
+
+    def data_received(self, data: bytes) -> None:
+        """
+        Split all the complete frames out of the received data.
+
+        :param data: the bytes received from the connection.
+        :return: ``None``
+        """
+        if self._closed:
+            return
+        if self._partial is not None:
+            data = self._fill_partial(data)
+        if self._buffer:
+            self._buffer.extend(data)
+            data, self._buffer = self._buffer, bytearray()
+        if len(data) > 0:
+            self._split_frames(data)
+        if self._frames:
+            self._wake_up(self._waiter)
+            self._waiter = None
+            if self.read_buffer_limits is not None and not self._reading_paused and not self._closed \
+                    and self._frames_size > self.read_buffer_limits[0]:
+                self._reading_paused = True
+                self.transport.pause_reading()
+
+    def _fill_partial(self, data: bytes) -> memoryview:
+        """
+        Copy the received data into the preallocated buffer of the frame being received.
+
+        :param data: the received data.
+        :return: the data that do not belong to the current frame.
+        """
+        view = memoryview(data)
+        n = min(len(self._partial) - self._partial_pos, len(view))
+        self._partial_view[self._partial_pos:self._partial_pos + n] = view[:n]
+        self._partial_pos += n
+        if self._partial_pos == len(self._partial):
+            self._partial_view.release()
+            self._frames.append(self._partial)
+            self._frames_size += len(self._partial)
+            self._partial, self._partial_view, self._partial_pos = None, None, 0
+        return view[n:]
+
+    def _split_frames(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        """
+        Extract every complete frame from the data. The trailing incomplete frame (if any)
+        is copied into a preallocated buffer, or kept aside if not even its length prefix is complete.
+
+        :param data: the data to split, starting at the beginning of a frame.
+        :return: ``None``
+        """
+        with memoryview(data) as view:
+            end = len(view)
+            offset = 0
+            while end - offset >= _HEADER_SIZE:
+                nbytes = _HEADER.unpack_from(view, offset)[0]
+                if self.max_frame_size is not None and nbytes > self.max_frame_size:
+                    self._abort(OEFFrameTooLargeError("Received a frame of {} bytes, the maximum is {}."
+                                                      .format(nbytes, self.max_frame_size)))
+                    return
+                start = offset + _HEADER_SIZE
+                stop = start + nbytes
+                if stop <= end:
+                    self._frames.append(bytes(view[start:stop]))
+                    self._frames_size += nbytes
+                    offset = stop
+                else:
+                    self._partial = bytearray(nbytes)
+                    self._partial_view = memoryview(self._partial)
+                    self._partial_pos = end - start
+                    self._partial_view[:self._partial_pos] = view[start:end]
+                    offset = end
+            if offset < end:
+                self._buffer.extend(view[offset:end])
+
+    def _abort(self, exc: Exception) -> None:
+        """
+        Stop receiving and close the connection. The frames already received can still be consumed,
+        then the receiving methods raise the exception.
+
+        :param exc: the reason.
+        :return: ``None``
+        """
+        logger.error("Closing the connection with the OEF Node: {}".format(exc))
+        self._closed = True
+        self._exception = exc
+        self._buffer = bytearray()
+        self._wake_up(self._waiter)
+        self._waiter = None
+        self.transport.close()
+
+    def _wake_up(self, waiter: Optional[asyncio.Future]) -> None:
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def _wait_for_frames(self) -> None:
+        """
+        Wait until at least one frame is available.
+
+        :return: ``None``
+        :raises OEFConnectionError: if the connection is closed and no frame is left.
+        """
+        while not self._frames:
+            if isinstance(self._exception, OEFFrameTooLargeError):
+                raise self._exception
+            if self._closed:
+                raise OEFConnectionError("Connection closed by the OEF Node.") from self._exception
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    async def receive(self) -> FRAME_TYPES:
+        """
+        Receive the next frame.
+
+        :return: the content of the frame.
+        :raises OEFConnectionError: if the connection is closed and no frame is left.
+        """
+        await self._wait_for_frames()
+        frame = self._frames.popleft()
+        self._frames_size -= len(frame)
+        if self._reading_paused:
+            self._maybe_resume_reading()
+        return frame
+
+    async def receive_many(self) -> List[FRAME_TYPES]:
+        """
+        Receive all the frames received so far, waiting for at least one.
+
+        :return: the list of frames, in order of arrival.
+        :raises OEFConnectionError: if the connection is closed and no frame is left.
+        """
+        await self._wait_for_frames()
+        frames = list(self._frames)
+        self._frames.clear()
+        self._frames_size = 0
+        if self._reading_paused:
+            self._maybe_resume_reading()
+        return frames
+
+    @property
+    def reading_paused(self) -> bool:
+        """Whether reading from the connection is paused, because too many frames are waiting to be consumed."""
+        return self._reading_paused
+
+    def _maybe_resume_reading(self) -> None:
+        """
+        Resume reading from the connection, if the frames waiting to be consumed are below the low-water mark.
+
+        :return: ``None``
+        """
+        if self._frames_size <= self.read_buffer_limits[1]:
+            self._reading_paused = False
+            if not self._closed:
+                self.transport.resume_reading()
+
+    def write_frame(self, data: bytes) -> None:
+        """
+        Write a frame, i.e. the length prefix followed by the data.
+
+        If the writes are batched or corked, the frame is queued until the next flush.
+
+        :param data: the content of the frame.
+        :return: ``None``
+        :raises OEFFrameTooLargeError: if the frame exceeds the maximum frame size.
+        """
+        if self.max_frame_size is not None and len(data) > self.max_frame_size:
+            raise OEFFrameTooLargeError("Frame of {} bytes not sent, the maximum is {}."
+                                        .format(len(data), self.max_frame_size))
+        if self._corked or self.batch_writes:
+            self._write_queue.append(_HEADER.pack(len(data)))
+            self._write_queue.append(data)
+            if not self._corked and self._flush_handle is None:
+                self._flush_handle = self._loop.call_soon(self.flush)
+        else:
+            self.transport.writelines((_HEADER.pack(len(data)), data))
+
+    def flush(self) -> None:
+        """
+        Write all the queued frames to the transport, with a single call.
+
+        :return: ``None``
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._closed:
+            # keep the frames, they are handed to the connection lost callback.
+            return
+        if self._write_queue:
+            self.transport.writelines(self._write_queue)
+        self._write_queue = []
+
+    @contextlib.contextmanager
+    def cork(self):
+        """
+        Context manager that queues all the frames written inside its block,
+        and flushes them at once when the outermost block is exited.
+
+            >>> with protocol.cork():  # doctest: +SKIP
+            ...     protocol.write_frame(b"first")
+            ...     protocol.write_frame(b"second")
+        """
+        self._corked += 1
+        try:
+            yield self
+        finally:
+            self._corked -= 1
+            if not self._corked:
+                self.flush()
+
+    @property
+    def writing_paused(self) -> bool:
+        """Whether the write buffer of the transport is above its high-water mark."""
+        return self._paused
+
+    def pause_writing(self) -> None:
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        self._wake_up(self._drain_waiter)
+        self._drain_waiter = None
+
+    async def drain(self) -> None:
+        """
+        Wait until the write buffer of the transport is below its low-water mark.
+
+        :return: ``None``
+        """
+        if self._closed or not self._paused:
+            return
+        if self._drain_waiter is None:
+            self._drain_waiter = self._loop.create_future()
+        await asyncio.shield(self._drain_waiter)
@@ -134,6 +134,7 @@ setup(
         'Programming Language :: Python :: 3.7',
     ],
     install_requires=["protobuf"],
+    extras_require={"uvloop": ["uvloop"]},
     tests_require=["tox"],
     python_requires='>=3.5',
     license=about['__license__'],
@@ -19,14 +19,16 @@
 # ------------------------------------------------------------------------------
 import asyncio
 import contextlib
+import os
 
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Optional
 
 from oef import agent_pb2
 from oef.agents import Agent
 from oef.core import OEFProxy
 from oef.messages import CFP_TYPES, PROPOSE_TYPES
 from oef.proxy import OEFLocalProxy, OEFNetworkProxy
+from oef.transport import OEFProtocol, OEFConnectionError
 from test.conftest import NetworkOEFNode
 
 
@@ -147,3 +149,116 @@ def _stop_agents(agents):
     tasks = asyncio.Task.all_tasks(asyncio.get_event_loop())
     for t in tasks:
         asyncio.get_event_loop().run_until_complete(t)
+
+
+class _FakeOEFNodeConnection(OEFProtocol):
+    """The server side of a connection to a :class:`FakeOEFNode`."""
+
+    def __init__(self, node: "FakeOEFNode"):
+        super().__init__(node.loop)
+        self.node = node
+        self.public_key = None
+        self._task = None
+
+    def connection_made(self, transport):
+        super().connection_made(transport)
+        self._task = asyncio.ensure_future(self._serve(), loop=self.node.loop)
+
+    async def _serve(self):
+        try:
+            if await self._handshake():
+                while True:
+                    envelope = agent_pb2.Envelope()
+                    envelope.ParseFromString(await self.receive())
+                    self.node.received.append((self.public_key, envelope))
+                    self._route(envelope)
+        except OEFConnectionError:
+            pass
+        finally:
+            if self.node.connections.get(self.public_key) is self:
+                self.node.connections.pop(self.public_key)
+
+    async def _handshake(self) -> bool:
+        pb_id = agent_pb2.Agent.Server.ID()
+        pb_id.ParseFromString(await self.receive())
+        phrase = agent_pb2.Server.Phrase()
+        if pb_id.public_key in self.node.connections:
+            phrase.failure.CopyFrom(agent_pb2.Server.Phrase.Failure())
+            self.write_frame(phrase.SerializeToString())
+            return False
+        phrase.phrase = "fake-phrase"
+        self.write_frame(phrase.SerializeToString())
+        answer = agent_pb2.Agent.Server.Answer()
+        answer.ParseFromString(await self.receive())
+        connected = agent_pb2.Server.Connected()
+        connected.status = answer.answer == phrase.phrase[::-1]
+        self.write_frame(connected.SerializeToString())
+        self.public_key = pb_id.public_key
+        self.node.connections[self.public_key] = self
+        return connected.status
+
+    def _route(self, envelope):
+        if envelope.WhichOneof("payload") != "send_message":
+            return
+        destination = envelope.send_message.destination
+        msg = agent_pb2.Server.AgentMessage()
+        msg.answer_id = envelope.msg_id
+        if destination not in self.node.connections:
+            msg.dialogue_error.dialogue_id = envelope.send_message.dialogue_id
+            msg.dialogue_error.origin = destination
+            self.write_frame(msg.SerializeToString())
+            return
+        msg.content.origin = self.public_key
+        msg.content.dialogue_id = envelope.send_message.dialogue_id
+        if envelope.send_message.WhichOneof("payload") == "content":
+            msg.content.content = envelope.send_message.content
+        else:
+            msg.content.fipa.CopyFrom(envelope.send_message.fipa)
+        self.node.connections[destination].write_frame(msg.SerializeToString())
+
+
+class FakeOEFNode:
+    """
+    A minimal, in-process OEF Node that listens on a random local port.
+    It performs the connection handshake and routes the agent messages, and records every envelope it receives.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, path: Optional[str] = None):
+        """
+        :param loop: the event loop.
+        :param path: if provided, the node listens on a Unix domain socket at this path, instead of TCP.
+        """
+        self.loop = loop
+        self.path = path
+        self.connections = {}  # type: Dict[str, _FakeOEFNodeConnection]
+        self.received = []  # type: List[Tuple[str, agent_pb2.Envelope]]
+        self.server = None
+        self.port = None
+
+    @property
+    def addr(self) -> str:
+        """The address to give to the proxies."""
+        return "127.0.0.1" if self.path is None else "unix://" + self.path
+
+    def __enter__(self):
+        if self.path is None:
+            self.server = self.loop.run_until_complete(
+                self.loop.create_server(lambda: _FakeOEFNodeConnection(self), "127.0.0.1", 0))
+            self.port = self.server.sockets[0].getsockname()[1]
+        else:
+            self.server = self.loop.run_until_complete(
+                self.loop.create_unix_server(lambda: _FakeOEFNodeConnection(self), self.path))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.drop_connections()
+        self.server.close()
+        self.loop.run_until_complete(self.server.wait_closed())
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def drop_connections(self) -> None:
+        """Close the connections of all the agents, as if the node went down."""
+        for connection in list(self.connections.values()):
+            connection.transport.close()
+        self.connections.clear()
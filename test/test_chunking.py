@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains tests for the chunked transfer of large message contents."""
+
+import mmap
+import random
+import time
+
+import pytest
+
+from oef.chunking import ChunkAssembler, OEFChunkError, split_content, is_chunk, DEFAULT_MAX_CONTENT_SIZE, \
+    _CHUNK_HEADER, CHUNK_MAGIC
+
+
+@pytest.mark.parametrize("size", [0, 1, 999, 1000, 12345])
+def test_split_and_assemble_out_of_order(size):
+    """Test that a content split in chunks is reassembled, whatever the order of the chunks."""
+    content = bytes(random.getrandbits(8) for _ in range(size))
+    chunks = list(split_content(7, content, chunk_size=1000))
+    assert all(is_chunk(chunk) for chunk in chunks)
+    random.shuffle(chunks)
+
+    assembler = ChunkAssembler()
+    results = [assembler.feed("origin", 0, chunk) for chunk in chunks]
+    assert all(result is None for result in results[:-1])
+    assert bytes(results[-1]) == content
+    assert assembler.pending == 0
+
+
+def test_assemble_into_a_memory_mapped_file(tmp_path):
+    """Test that a content can be reassembled into a memory-mapped temporary file."""
+    content = b"abc" * 10000
+    assembler = ChunkAssembler(spool_dir=str(tmp_path))
+    for chunk in split_content(0, content, chunk_size=4096):
+        result = assembler.feed("origin", 0, chunk)
+
+    assert isinstance(result, mmap.mmap)
+    assert result[:] == content
+    assembler.release(result)
+    assert result.closed
+
+
+def test_content_too_large_is_refused():
+    """Test that the transfers larger than the maximum content size are discarded."""
+    assembler = ChunkAssembler(max_content_size=100)
+    with pytest.raises(OEFChunkError):
+        assembler.feed("origin", 0, next(split_content(0, b"x" * 101, chunk_size=10)))
+    assert assembler.pending == 0
+
+
+@pytest.mark.parametrize("total_size", [DEFAULT_MAX_CONTENT_SIZE + 1, 2 ** 64 - 1])
+def test_declared_size_is_bounded_by_default(total_size):
+    """Test that a chunk declaring a huge content is refused before any buffer is allocated."""
+    assembler = ChunkAssembler()
+    with pytest.raises(OEFChunkError, match="exceeds the maximum size"):
+        assembler.feed("origin", 0, _CHUNK_HEADER.pack(CHUNK_MAGIC, 0, total_size, 0) + b"x")
+    assert assembler.pending == 0
+
+
+def test_repeated_chunk_is_refused():
+    """Test that a chunk received twice does not complete the transfer with the missing bytes set to zero."""
+    chunks = list(split_content(0, b"abcd", chunk_size=2))
+    assembler = ChunkAssembler()
+    assert assembler.feed("origin", 0, chunks[0]) is None
+    with pytest.raises(OEFChunkError, match="overlaps"):
+        assembler.feed("origin", 0, chunks[0])
+    assert assembler.pending == 0
+
+
+def test_overlapping_chunk_is_refused():
+    """Test that a chunk overlapping a chunk already received is refused."""
+    assembler = ChunkAssembler()
+    assembler.feed("origin", 0, _CHUNK_HEADER.pack(CHUNK_MAGIC, 0, 6, 2) + b"cd")
+    with pytest.raises(OEFChunkError, match="overlaps"):
+        assembler.feed("origin", 0, _CHUNK_HEADER.pack(CHUNK_MAGIC, 0, 6, 0) + b"abc")
+
+
+def test_pending_size_is_bounded_per_sender():
+    """Test that a sender cannot buffer more than the maximum pending size in its transfers."""
+    assembler = ChunkAssembler(max_pending_size=10)
+    assembler.feed("origin", 0, _CHUNK_HEADER.pack(CHUNK_MAGIC, 0, 8, 0) + b"x" * 6)
+    assembler.feed("other", 0, _CHUNK_HEADER.pack(CHUNK_MAGIC, 0, 8, 0) + b"x" * 6)
+    with pytest.raises(OEFChunkError, match="pending transfers of origin"):
+        assembler.feed("origin", 0, _CHUNK_HEADER.pack(CHUNK_MAGIC, 1, 8, 0) + b"x" * 6)
+    assert assembler.pending == 2
+
+    assert assembler.feed("origin", 0, _CHUNK_HEADER.pack(CHUNK_MAGIC, 0, 8, 6) + b"x" * 2) == b"x" * 8
+    assert assembler.feed("origin", 0, _CHUNK_HEADER.pack(CHUNK_MAGIC, 1, 8, 0) + b"x" * 6) is None
+
+
+def test_buffer_grows_with_the_chunks():
+    """Test that the buffer of a transfer is not allocated with the declared size, but grows with the chunks."""
+    assembler = ChunkAssembler(max_pending_size=None)
+    assembler.feed("origin", 0, _CHUNK_HEADER.pack(CHUNK_MAGIC, 0, DEFAULT_MAX_CONTENT_SIZE, 0) + b"x" * 10)
+    assert len(assembler._transfers["origin", 0, 0].buffer) == 10
+
+
+def test_idle_transfers_expire():
+    """Test that the transfers that receive no chunk for the timeout are discarded."""
+    assembler = ChunkAssembler(transfer_timeout=0.05)
+    chunks = list(split_content(0, b"abcd", chunk_size=2))
+    assembler.feed("origin", 0, chunks[0])
+    assert assembler.expire() == 0
+
+    time.sleep(0.1)
+    assert assembler.expire() == 1
+    assert assembler.pending == 0
+    assert assembler.feed("origin", 0, chunks[1]) is None
@@ -69,11 +69,13 @@ class ClientSingleDialogueTest(SimpleSingleDialogueTest):
     def __init__(self, agent: DialogueAgent,
                  destination: str,
                  id_: Optional[int] = None,
-                 notify: Callable = None):
+                 notify: Callable = None,
+                 send_cfp: bool = True):
         super().__init__(agent, destination, id_)
         self.notify = notify
         self.received_msg = []
-        self.agent.send_cfp(1, self.id, destination, 0, None)
+        if send_cfp:
+            self.agent.send_cfp(1, self.id, destination, 0, None)
 
     def on_propose(self, msg_id: int, target: int, proposals: PROPOSE_TYPES):
         assert type(proposals) == list and len(proposals) == 1
@@ -83,13 +85,16 @@ class ClientSingleDialogueTest(SimpleSingleDialogueTest):
 
 class GroupDialogueTest(GroupDialogues):
 
-    def __init__(self, agent: DialogueAgent, agents: List[str]):
+    def __init__(self, agent: DialogueAgent, agents: List[str], broadcast: bool = False):
         super().__init__(agent)
 
         dialogues = [ClientSingleDialogueTest(agent, a,
-                                              notify=lambda from_, price: self.update(from_, price))
+                                              notify=lambda from_, price: self.update(from_, price),
+                                              send_cfp=not broadcast)
                      for a in agents]
         self.add_agents(dialogues)
+        if broadcast:
+            self.send_cfp_many(1, 0, None)
 
     def better(self, price1: int, price2: int) -> bool:
         return price1 < price2
@@ -119,13 +124,14 @@ class AgentSingleDialogueTest(DialogueAgent):
 
 class ClientAgentGroupDialogueTest(DialogueAgent):
 
-    def __init__(self, oef_proxy: OEFProxy):
+    def __init__(self, oef_proxy: OEFProxy, broadcast: bool = False):
         super().__init__(oef_proxy)
         self.group = None
+        self.broadcast = broadcast
 
     def on_search_result(self, search_id: int, agents: List[str]):
         """For every agent returned in the service search, send a CFP to obtain resources from them."""
-        self.group = GroupDialogueTest(self, agents)
+        self.group = GroupDialogueTest(self, agents, self.broadcast)
 
     def on_new_cfp(self, from_: str, dialogue_id: int, msg_id: int, target: int, query: CFP_TYPES) -> None:
         pass
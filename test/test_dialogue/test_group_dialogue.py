@@ -24,6 +24,8 @@ This module contains tests on the usage of :class:`~oef.dialogue.GroupDialogues`
 import asyncio
 import random
 
+import pytest
+
 from oef.proxy import OEFNetworkProxy, OEFLocalProxy
 from oef.query import Query, Eq, Constraint
 from oef.schema import Description, DataModel, AttributeSchema
@@ -74,10 +76,11 @@ class TestGroupDialogues:
             for s in servers:
                 s.disconnect()
 
-    def test_group_dialogue_one_client_n_servers_local(self):
+    @pytest.mark.parametrize("broadcast", [False, True])
+    def test_group_dialogue_one_client_n_servers_local(self, broadcast):
         with OEFLocalProxy.LocalNode() as node:
             client_proxy = OEFLocalProxy("client", node)
-            client = ClientAgentGroupDialogueTest(client_proxy)
+            client = ClientAgentGroupDialogueTest(client_proxy, broadcast)
             client.connect()
 
             N = 10
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""This module contains tests for the decoding of the messages received from the OEF Node."""
+
+import pytest
+
+from oef import agent_pb2
+from oef.messages import CFP, Message, InboundAccept, InboundAgentMessage, InboundCFP, InboundDecline, \
+    InboundDialogueError, InboundMessage, InboundMessageContent, InboundOEFError, InboundPropose, InboundSearchResult, \
+    InboundSearchResultWide, InboundUnknown, OEFErrorOperation, decode
+from oef.query import Constraint, Eq, LazyQuery, Query, SearchResultItem
+from oef.schema import Description, LazyDescription, description_cache
+
+INBOUND_MESSAGES = [
+    InboundSearchResult(1, ["agent_1", "agent_2"]),
+    InboundSearchResultWide(1, [SearchResultItem("agent_1", "core_1", "127.0.0.1", 3333, 1.0),
+                                SearchResultItem("agent_2", "core_1", "127.0.0.1", 3333, 1.0),
+                                SearchResultItem("agent_3", "core_2", "127.0.0.2", 3334, 2.0)]),
+    InboundOEFError(1, OEFErrorOperation.REGISTER_SERVICE),
+    InboundDialogueError(1, 2, "origin"),
+    InboundMessageContent(1, 2, "origin", b"hello"),
+    InboundCFP(1, 2, "origin", 3, None),
+    InboundCFP(1, 2, "origin", 3, b"query"),
+    InboundPropose(1, 2, "origin", 3, b"proposals"),
+    InboundAccept(1, 2, "origin", 3),
+    InboundDecline(1, 2, "origin", 3),
+]
+
+
+@pytest.mark.parametrize("msg", INBOUND_MESSAGES, ids=lambda msg: msg.case)
+def test_inbound_messages_round_trip(msg: InboundMessage):
+    """Test that an inbound message is decoded as it was encoded, by every decoder."""
+    data = msg.to_pb().SerializeToString()
+
+    if isinstance(msg, InboundSearchResultWide):
+        assert [vars(item) for item in decode(data).items] == [vars(item) for item in msg.items]
+        return
+    assert decode(data) == msg
+    assert InboundMessage.from_bytes(data) == msg
+    assert type(msg).from_bytes(data) == msg
+    assert not hasattr(msg, "__dict__")
+
+
+def test_inbound_cfp_and_propose_are_lazy():
+    """Test that the queries and the proposals are decoded only when accessed, and re-encoded unchanged."""
+    query = Query([Constraint("price", Eq(10))])
+    proposals = [Description({"price": 10}), Description({"price": 20})]
+    cfp = decode(InboundCFP(1, 2, "origin", 3, query).to_pb().SerializeToString())
+    propose = decode(InboundPropose(1, 2, "origin", 3, proposals).to_pb().SerializeToString())
+
+    assert isinstance(cfp.query, LazyQuery) and not cfp.query.is_decoded
+    assert all(isinstance(proposal, LazyDescription) and not proposal.is_decoded for proposal in propose.proposals)
+    assert cfp.query == query
+    assert propose.proposals == proposals
+
+
+def test_inbound_propose_with_the_description_cache():
+    """Test that, with the description cache enabled, the same proposals are decoded once and shared."""
+    data = InboundPropose(1, 2, "origin", 3, [Description({"price": 10})]).to_pb().SerializeToString()
+
+    description_cache.resize(16)
+    try:
+        first, second = decode(data), decode(data)
+    finally:
+        description_cache.resize(0)
+        description_cache.clear()
+
+    assert first.proposals[0] is second.proposals[0]
+    assert first.proposals[0].is_frozen
+    assert first.proposals == [Description({"price": 10})]
+
+
+def test_unknown_messages_keep_their_protobuf_message():
+    """Test that a message of an unknown type is decoded as an InboundUnknown, with its Protobuf message."""
+    msg = agent_pb2.Server.AgentMessage()
+    msg.answer_id = 1
+    msg.content.dialogue_id = 2
+    msg.content.origin = "origin"
+
+    inbound = decode(msg.SerializeToString())
+
+    assert isinstance(inbound, InboundUnknown)
+    assert inbound.msg_id == 1
+    assert inbound.case is None
+    assert inbound.to_pb() == msg
+
+
+def test_from_send_message():
+    """Test that a message sent by an agent is decoded as it is delivered to the recipient."""
+    sent = [Message(1, 2, "destination", b"hello"), CFP(1, 2, "destination", 3, None)]
+
+    received = [InboundAgentMessage.from_send_message(msg.msg_id, "origin", msg.to_pb().send_message)
+                for msg in sent]
+
+    assert received == [InboundMessageContent(1, 2, "origin", b"hello"), InboundCFP(1, 2, "origin", 3, None)]
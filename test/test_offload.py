@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains tests for the execution of message handlers outside of the event loop."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from oef.messages import CFP_TYPES
+from oef.offload import Offloader, offload
+from oef.proxy import OEFLocalProxy
+from oef.schema import Description
+from .common import AgentTest
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+class _Seller(AgentTest):
+    """An agent that answers every CFP with a proposal, computed in a worker thread."""
+
+    def __init__(self, proxy):
+        super().__init__(proxy)
+        self.threads = []
+
+    @offload
+    def on_cfp(self, msg_id: int, dialogue_id: int, origin: str, target: int, query: CFP_TYPES):
+        self.threads.append(threading.get_ident())
+        time.sleep(0.01)
+        self.send_propose(msg_id + 1, dialogue_id, origin, msg_id, [Description({"price": dialogue_id})])
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+def _fail():
+    raise ValueError("failed")
+
+
+def test_offloaded_handler_sends_from_the_loop(loop):
+    """Test that an offloaded handler runs in a worker thread, and that the messages it sends are delivered."""
+    with OEFLocalProxy.LocalNode(loop) as node:
+        buyer = AgentTest(OEFLocalProxy("buyer", node, loop=loop))
+        seller = _Seller(OEFLocalProxy("seller", node, loop=loop))
+        buyer.connect()
+        seller.connect()
+        asyncio.ensure_future(seller.async_run(), loop=loop)
+        asyncio.ensure_future(buyer.async_run(), loop=loop)
+
+        for dialogue_id in range(3):
+            buyer.send_cfp(0, dialogue_id, seller.public_key, 0, None)
+        loop.run_until_complete(asyncio.sleep(0.3))
+
+        buyer.stop()
+        seller.stop()
+        buyer.disconnect()
+        seller.disconnect()
+
+    assert threading.get_ident() not in seller.threads
+    assert [(msg[1], msg[4][0].values["price"]) for msg in buyer.received_msg] == [(0, 0), (1, 1), (2, 2)]
+    assert seller.offload_stats.completed == 3
+    assert seller.offload_stats.in_flight == 0
+    assert seller.offload_stats.mean_run >= 0.01
+    assert 0.0 < seller.offload_stats.utilisation <= 1.0
+
+
+def test_offloader_with_a_process_pool(loop):
+    """Test that module-level functions run in a process pool, and that their failures are counted."""
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        offloader = Offloader(executor, loop=loop)
+        results = loop.run_until_complete(asyncio.gather(*[offloader.run(_square, i) for i in range(4)]))
+        with pytest.raises(ValueError):
+            loop.run_until_complete(offloader.run(_fail))
+
+    assert results == [0, 1, 4, 9]
+    assert offloader.stats.workers == 2
+    assert offloader.stats.submitted == 5
+    assert offloader.stats.completed == 4
+    assert offloader.stats.failed == 1
+    assert offloader.runs_in_processes
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains tests for the queue between the reader and the dispatcher stages of the agent loop."""
+
+import asyncio
+
+import pytest
+
+from oef.pipeline import FramePipeline, PipelineOverflowPolicy
+from oef.transport import OEFConnectionError
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+def _frames(*ids):
+    return [str(i).encode() for i in ids]
+
+
+def test_block_waits_for_the_dispatcher(loop):
+    """Test that, with BLOCK, the reader waits until the dispatcher has taken the queued frames."""
+    pipeline = FramePipeline(2, loop=loop)
+
+    async def run():
+        await pipeline.put(_frames(0, 1))
+        put = asyncio.ensure_future(pipeline.put(_frames(2)), loop=loop)
+        await asyncio.sleep(0.01)
+        assert not put.done()
+        first = await pipeline.get_many()
+        await put
+        return first, await pipeline.get_many()
+
+    first, second = loop.run_until_complete(run())
+
+    assert first == _frames(0, 1)
+    assert second == _frames(2)
+    assert pipeline.stats.frames_read == pipeline.stats.frames_dispatched == 3
+    assert pipeline.stats.dropped == 0
+    assert pipeline.stats.peak_depth == 2
+    assert pipeline.stats.blocked_time > 0
+
+
+@pytest.mark.parametrize("policy, expected", [(PipelineOverflowPolicy.DROP_NEWEST, _frames(0, 1, 2)),
+                                              (PipelineOverflowPolicy.DROP_OLDEST, _frames(2, 3, 4))])
+def test_drop_policies(loop, policy, expected):
+    """Test that, when the queue is full, the newest or the oldest frames are dropped."""
+    pipeline = FramePipeline(3, policy, loop=loop)
+
+    async def run():
+        await pipeline.put(_frames(0, 1))
+        await pipeline.put(_frames(2, 3, 4))
+        return await pipeline.get_many()
+
+    assert loop.run_until_complete(run()) == expected
+    assert pipeline.stats.dropped == 2
+    assert pipeline.stats.depth == 0
+
+
+def test_reader_error_is_raised_after_the_queued_frames(loop):
+    """Test that the error that stopped the reader is raised once the queued frames have been taken."""
+    pipeline = FramePipeline(10, loop=loop)
+
+    async def run():
+        await pipeline.put(_frames(0))
+        pipeline.close(OEFConnectionError("lost"))
+        frames = await pipeline.get_many()
+        with pytest.raises(OEFConnectionError):
+            await pipeline.get_many()
+        return frames
+
+    assert loop.run_until_complete(run()) == _frames(0)
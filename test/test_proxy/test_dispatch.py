@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains tests for the dispatch of the incoming messages to their handlers."""
+
+import asyncio
+
+from oef import agent_pb2
+from oef.chunking import split_content
+from oef.proxy import OEFLocalProxy
+from oef.scheduler import HandlerScheduler
+from ..common import AgentTest
+
+
+def _accept_message() -> bytes:
+    msg = agent_pb2.Server.AgentMessage()
+    msg.answer_id = 1
+    msg.content.dialogue_id = 2
+    msg.content.origin = "origin"
+    msg.content.fipa.target = 3
+    msg.content.fipa.accept.SetInParent()
+    return msg.SerializeToString()
+
+
+def test_default_and_registered_handlers():
+    """Test that a registered handler replaces the default one for its type of message."""
+    loop = asyncio.new_event_loop()
+    proxy = OEFLocalProxy("agent", OEFLocalProxy.LocalNode(loop), loop=loop)
+    agent = AgentTest(proxy)
+
+    loop.run_until_complete(proxy._dispatch(agent, _accept_message()))
+    assert agent.received_msg == [(1, 2, "origin", 3)]
+
+    handled = []
+
+    async def on_accept(agent_, msg):
+        handled.append(msg.target)
+
+    previous = proxy.register_handler("fipa.accept", on_accept)
+    loop.run_until_complete(proxy._dispatch(agent, _accept_message()))
+    loop.close()
+
+    assert previous is not None
+    assert handled == [3]
+    assert len(agent.received_msg) == 1
+
+
+def test_unknown_messages_go_to_the_fallback_handler():
+    """Test that a message without a handler is passed to the fallback handler, instead of stopping the agent."""
+    loop = asyncio.new_event_loop()
+    proxy = OEFLocalProxy("agent", OEFLocalProxy.LocalNode(loop), loop=loop)
+    agent = AgentTest(proxy)
+    msg = agent_pb2.Server.AgentMessage()
+    msg.answer_id = 1
+
+    loop.run_until_complete(proxy._dispatch(agent, msg.SerializeToString()))
+
+    unknown = []
+
+    async def fallback(agent_, msg_):
+        unknown.append(msg_.msg_id)
+
+    proxy.register_fallback_handler(fallback)
+    loop.run_until_complete(proxy._dispatch(agent, msg.SerializeToString()))
+    loop.close()
+
+    assert unknown == [1]
+
+
+def _simple_message(msg_id: int, dialogue_id: int) -> bytes:
+    msg = agent_pb2.Server.AgentMessage()
+    msg.answer_id = msg_id
+    msg.content.dialogue_id = dialogue_id
+    msg.content.origin = "origin"
+    msg.content.content = b"hello"
+    return msg.SerializeToString()
+
+
+def test_concurrent_handlers_keep_the_order_of_each_dialogue():
+    """Test that, with concurrent handlers, a slow dialogue does not block the others, and keeps its order."""
+    loop = asyncio.new_event_loop()
+    proxy = OEFLocalProxy("agent", OEFLocalProxy.LocalNode(loop), loop=loop, max_concurrent_handlers=4)
+    proxy.handler_scheduler = HandlerScheduler(proxy.max_concurrent_handlers, loop=loop)
+
+    class SlowAgent(AgentTest):
+        async def async_on_message(self, msg_id, dialogue_id, origin, content):
+            if dialogue_id == 0:
+                await asyncio.sleep(0.05)
+            self.on_message(msg_id, dialogue_id, origin, content)
+
+    agent = SlowAgent(proxy)
+
+    async def run():
+        for msg_id in range(3):
+            await proxy._schedule(agent, _simple_message(msg_id, 0))
+            await proxy._schedule(agent, _simple_message(msg_id, 1))
+        await proxy.handler_scheduler.join()
+
+    loop.run_until_complete(run())
+    loop.close()
+
+    dialogues = [dialogue_id for _, dialogue_id, _, _ in agent.received_msg]
+    assert dialogues == [1, 1, 1, 0, 0, 0]
+    assert [msg_id for msg_id, dialogue_id, _, _ in agent.received_msg if dialogue_id == 0] == [0, 1, 2]
+    assert proxy.handler_stats.completed == 6
+
+
+class _BatchAgent(AgentTest):
+    """An agent that records the batches of simple messages it receives."""
+
+    def __init__(self, proxy):
+        super().__init__(proxy)
+        self.batches = []
+
+    def on_message_batch(self, messages):
+        self.batches.append([msg_id for msg_id, _, _, _ in messages])
+
+
+def _run_loop(proxy, agent, bursts, delay=0.0, duration=0.05):
+    """Run the loop of the proxy for ``duration`` seconds, on bursts of frames received ``delay`` seconds apart."""
+    loop = proxy._loop
+    bursts = list(bursts)
+
+    async def receive_many():
+        if not bursts:
+            await loop.create_future()
+        if delay:
+            await asyncio.sleep(delay)
+        return bursts.pop(0)
+
+    proxy._receive_many = receive_many
+    task = asyncio.ensure_future(proxy.loop(agent), loop=loop)
+    loop.run_until_complete(asyncio.sleep(duration))
+    task.cancel()
+    loop.run_until_complete(task)
+    loop.close()
+
+
+def test_simple_messages_are_delivered_in_batches():
+    """Test that the simple messages are batched up to the maximum size, without crossing other messages."""
+    loop = asyncio.new_event_loop()
+    proxy = OEFLocalProxy("agent", OEFLocalProxy.LocalNode(loop), loop=loop, max_batch_size=4)
+    agent = _BatchAgent(proxy)
+    first = [_simple_message(msg_id, 0) for msg_id in range(6)] + [_accept_message()]
+    second = [_simple_message(msg_id, 0) for msg_id in range(6, 9)]
+
+    _run_loop(proxy, agent, [first, second])
+
+    assert agent.batches == [[0, 1, 2, 3], [4, 5], [6, 7, 8]]
+    assert agent.received_msg == [(1, 2, "origin", 3)]
+
+
+def test_batches_linger_for_more_messages():
+    """Test that a batch waits up to max_linger seconds for more messages."""
+    loop = asyncio.new_event_loop()
+    proxy = OEFLocalProxy("agent", OEFLocalProxy.LocalNode(loop), loop=loop, max_linger=0.1)
+    agent = _BatchAgent(proxy)
+    bursts = [[_simple_message(msg_id, 0)] for msg_id in range(3)]
+
+    _run_loop(proxy, agent, bursts, delay=0.01, duration=0.2)
+
+    assert agent.batches == [[0, 1, 2]]
+
+
+def test_last_batch_is_delivered_when_the_loop_is_cancelled():
+    """Test that the messages of a lingering batch are delivered when the loop is cancelled."""
+    loop = asyncio.new_event_loop()
+    proxy = OEFLocalProxy("agent", OEFLocalProxy.LocalNode(loop), loop=loop, max_linger=1.0)
+    agent = _BatchAgent(proxy)
+
+    _run_loop(proxy, agent, [[_simple_message(msg_id, 0) for msg_id in range(2)]])
+
+    assert agent.batches == [[0, 1]]
+
+
+def test_agents_without_batch_handler_receive_single_messages():
+    """Test that the agents that do not implement on_message_batch receive the messages one at a time."""
+    loop = asyncio.new_event_loop()
+    proxy = OEFLocalProxy("agent", OEFLocalProxy.LocalNode(loop), loop=loop)
+    agent = AgentTest(proxy)
+
+    _run_loop(proxy, agent, [[_simple_message(msg_id, 0) for msg_id in range(3)]])
+
+    assert [msg_id for msg_id, _, _, _ in agent.received_msg] == [0, 1, 2]
+
+
+def test_abandoned_chunked_contents_expire():
+    """Test that a chunked transfer that receives no more chunks is discarded after the timeout."""
+    loop = asyncio.new_event_loop()
+    proxy = OEFLocalProxy("agent", OEFLocalProxy.LocalNode(loop), loop=loop)
+    proxy.chunk_assembler.transfer_timeout = 0.05
+
+    assert proxy._assemble_chunk("origin", 0, next(split_content(0, b"abcd", chunk_size=2))) is None
+    assert proxy.chunk_assembler.pending == 1
+    loop.run_until_complete(asyncio.sleep(0.15))
+    loop.close()
+
+    assert proxy.chunk_assembler.pending == 0
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains tests for the framing of the messages exchanged with a networked OEF Node."""
+
+import asyncio
+import struct
+
+import pytest
+
+from oef.transport import OEFProtocol, OEFConnectionError, OEFFrameTooLargeError
+
+
+def _frame(body: bytes) -> bytes:
+    return struct.pack("I", len(body)) + body
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+    # leave a usable current loop to the tests that rely on the default one.
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+def test_receive_frame_split_in_many_chunks(loop):
+    """Test that a frame delivered in many small chunks is reassembled correctly."""
+    protocol = OEFProtocol(loop)
+    body = bytes(range(256)) * 1000
+    frame = _frame(body)
+    for i in range(0, len(frame), 1000):
+        protocol.data_received(frame[i:i + 1000])
+
+    assert loop.run_until_complete(protocol.receive()) == body
+
+
+def test_receive_many_frames_in_a_single_chunk(loop):
+    """Test that all the frames contained in a single chunk are split out at once, in order."""
+    protocol = OEFProtocol(loop)
+    bodies = [b"", b"a", b"bb" * 100, b"ccc"]
+    data = b"".join(_frame(body) for body in bodies)
+    # split the data in the middle of a length prefix
+    protocol.data_received(data[:2])
+    protocol.data_received(data[2:-5])
+    protocol.data_received(data[-5:])
+
+    assert loop.run_until_complete(protocol.receive_many()) == bodies
+
+
+def test_receive_waits_for_data(loop):
+    """Test that receiving waits until a complete frame has arrived."""
+    protocol = OEFProtocol(loop)
+    task = asyncio.ensure_future(protocol.receive())
+    loop.run_until_complete(asyncio.sleep(0))
+    assert not task.done()
+
+    protocol.data_received(_frame(b"hello"))
+    assert loop.run_until_complete(task) == b"hello"
+
+
+def test_receive_raises_connection_error_when_connection_is_lost(loop):
+    """Test that an OEFConnectionError is raised when the connection has been lost, after the pending frames."""
+    protocol = OEFProtocol(loop)
+    protocol.data_received(_frame(b"last") + struct.pack("I", 10) + b"12345")
+    protocol.connection_lost(None)
+
+    assert loop.run_until_complete(protocol.receive()) == b"last"
+    with pytest.raises(OEFConnectionError, match="Connection closed by the OEF Node"):
+        loop.run_until_complete(protocol.receive())
+
+
+class _RecordingTransport(asyncio.WriteTransport):
+    """A transport that records the data passed to every write call."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+        self.closed = False
+        self.reading = True
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+
+    def writelines(self, list_of_data):
+        self.writes.append(b"".join(list_of_data))
+
+    def close(self):
+        self.closed = True
+
+    def pause_reading(self):
+        self.reading = False
+
+    def resume_reading(self):
+        self.reading = True
+
+
+def test_reading_is_paused_until_the_frames_are_consumed(loop):
+    """Test that reading stops above the high-water mark of the received frames, and resumes below the low-water one."""
+    protocol = OEFProtocol(loop, read_buffer_limits=(10, 4))
+    protocol.connection_made(_RecordingTransport())
+    protocol.data_received(_frame(b"12345") + _frame(b"12345"))
+    assert protocol.transport.reading
+
+    protocol.data_received(_frame(b"12") + _frame(b"34"))
+    assert not protocol.transport.reading and protocol.reading_paused
+
+    loop.run_until_complete(protocol.receive())
+    assert not protocol.transport.reading
+    loop.run_until_complete(protocol.receive())
+    assert protocol.transport.reading and not protocol.reading_paused
+
+    protocol.data_received(_frame(b"x" * 20))
+    assert not protocol.transport.reading
+    assert loop.run_until_complete(protocol.receive_many()) == [b"12", b"34", b"x" * 20]
+    assert protocol.transport.reading
+
+
+def test_every_frame_is_written_with_a_single_call(loop):
+    """Test that the length prefix and the content of a frame are written together."""
+    protocol = OEFProtocol(loop)
+    protocol.connection_made(_RecordingTransport())
+    protocol.write_frame(b"hello")
+    protocol.write_frame(b"world")
+
+    assert protocol.transport.writes == [_frame(b"hello"), _frame(b"world")]
+
+
+def test_batched_frames_are_flushed_at_the_end_of_the_loop_iteration(loop):
+    """Test that, in batching mode, the frames written in the same loop iteration are flushed together."""
+    protocol = OEFProtocol(loop, batch_writes=True)
+    protocol.connection_made(_RecordingTransport())
+    protocol.write_frame(b"hello")
+    protocol.write_frame(b"world")
+    assert protocol.transport.writes == []
+
+    loop.run_until_complete(asyncio.sleep(0))
+    assert protocol.transport.writes == [_frame(b"hello") + _frame(b"world")]
+
+
+def test_cork(loop):
+    """Test that the frames written in a (nested) cork block are flushed when the outermost block is exited."""
+    protocol = OEFProtocol(loop)
+    protocol.connection_made(_RecordingTransport())
+    with protocol.cork():
+        protocol.write_frame(b"a")
+        with protocol.cork():
+            protocol.write_frame(b"b")
+        protocol.write_frame(b"c")
+        loop.run_until_complete(asyncio.sleep(0))
+        assert protocol.transport.writes == []
+
+    assert protocol.transport.writes == [_frame(b"a") + _frame(b"b") + _frame(b"c")]
+
+
+def test_frames_larger_than_the_maximum_size(loop):
+    """Test that an oversized frame is neither sent nor buffered, and that receiving one closes the connection."""
+    protocol = OEFProtocol(loop, max_frame_size=16)
+    protocol.connection_made(_RecordingTransport())
+    with pytest.raises(OEFFrameTooLargeError):
+        protocol.write_frame(b"x" * 17)
+    assert protocol.transport.writes == []
+
+    protocol.data_received(_frame(b"small") + struct.pack("I", 2 ** 31))
+    assert protocol.transport.closed
+    assert loop.run_until_complete(protocol.receive()) == b"small"
+    with pytest.raises(OEFFrameTooLargeError):
+        loop.run_until_complete(protocol.receive())
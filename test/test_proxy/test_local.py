@@ -148,6 +148,44 @@ def test_on_propose():
         assert expected_message_04 == agent_1.received_msg[3]
 
 
+def test_on_cfp_and_propose_many():
+    """
+    Test that an agent can send the same CFP and Propose in many dialogues,
+    and that it receives a Dialogue Error for an unknown recipient.
+    """
+    with OEFLocalProxy.LocalNode() as node:
+
+        agent_0 = AgentTest(OEFLocalProxy("agent_0", node))
+        agent_1 = AgentTest(OEFLocalProxy("agent_1", node))
+        agent_2 = AgentTest(OEFLocalProxy("agent_2", node))
+        dialogue_errors = []
+        agent_0.on_dialogue_error = lambda *args: dialogue_errors.append(args)
+
+        agent_0.connect()
+        agent_1.connect()
+        agent_2.connect()
+
+        asyncio.ensure_future(asyncio.gather(agent_0.async_run(), agent_1.async_run(), agent_2.async_run()))
+
+        recipients = [(1, agent_1.public_key), (2, agent_2.public_key), (3, "unknown")]
+        agent_0.send_cfp_many(0, recipients, 0, Query([Constraint("foo", Eq(0))]))
+        agent_0.send_propose_many(1, recipients[:2], 0, [Description({"foo": 0})])
+        asyncio.get_event_loop().run_until_complete(asyncio.sleep(_ASYNCIO_DELAY))
+
+        agent_0.stop()
+        agent_1.stop()
+        agent_2.stop()
+
+        agent_0.disconnect()
+        agent_1.disconnect()
+        agent_2.disconnect()
+
+    for dialogue_id, agent in [(1, agent_1), (2, agent_2)]:
+        assert agent.received_msg == [(0, dialogue_id, agent_0.public_key, 0, Query([Constraint("foo", Eq(0))])),
+                                      (1, dialogue_id, agent_0.public_key, 0, [Description({"foo": 0})])]
+    assert dialogue_errors == [(0, 3, "unknown")]
+
+
 def test_on_accept():
     """
     Test that an agent can send an Accept to another agent.
@@ -408,6 +446,53 @@ def test_oef_error_when_unregistering_an_unregistered_service():
         agent_1.disconnect()
 
 
+def test_oef_error_when_unregistering_a_service_with_another_description():
+    """Test that a service is unregistered only with an equal description, looked up by its fingerprint."""
+
+    with OEFLocalProxy.LocalNode() as node:
+
+        agent_0 = AgentTest(OEFLocalProxy("agent_0", node))
+        agent_0.connect()
+        asyncio.ensure_future(agent_0.async_run())
+
+        agent_0.on_oef_error = MagicMock()
+        agent_0.register_service(0, Description({"foo": 1}))
+        agent_0.unregister_service(1, Description({"foo": 2}))
+        asyncio.get_event_loop().run_until_complete(asyncio.sleep(_ASYNCIO_DELAY))
+
+        agent_0.on_oef_error.assert_called_with(1, OEFErrorOperation.UNREGISTER_SERVICE)
+        assert node.services["agent_0"] == [Description({"foo": 1})]
+
+        agent_0.unregister_service(2, Description({"foo": 1}))
+        assert "agent_0" not in node.services
+
+        agent_0.stop()
+        agent_0.disconnect()
+
+
+def test_unregister_a_service_changed_after_registering():
+    """Test that a service description changed after being registered can still be unregistered."""
+
+    with OEFLocalProxy.LocalNode() as node:
+
+        agent_0 = AgentTest(OEFLocalProxy("agent_0", node))
+        agent_0.connect()
+        asyncio.ensure_future(agent_0.async_run())
+
+        agent_0.on_oef_error = MagicMock()
+        description = Description({"foo": 1})
+        agent_0.register_service(0, description)
+        description.values["foo"] = 2
+        agent_0.unregister_service(1, description)
+        asyncio.get_event_loop().run_until_complete(asyncio.sleep(_ASYNCIO_DELAY))
+
+        agent_0.on_oef_error.assert_not_called()
+        assert "agent_0" not in node.services
+
+        agent_0.stop()
+        agent_0.disconnect()
+
+
 def test_oef_error_when_failing_in_unregistering_agent():
     """Test that we receive an OEF Error message when we try to unregister a non registered agent."""
 
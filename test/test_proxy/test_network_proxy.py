@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains tests for the networked proxy, run against an in-process fake OEF Node."""
+
+import asyncio
+import struct
+
+import pytest
+from google.protobuf.message import DecodeError
+
+from oef.messages import CFP
+from oef.pipeline import PipelineOverflowPolicy
+from oef.proxy import OEFNetworkProxy, OverflowPolicy, OEFWriteBufferFullError, ReconnectPolicy, \
+    connect_many
+from oef.query import Query, Constraint, Eq
+from oef.schema import Description
+from oef.transport import SocketOptions, OEFFrameTooLargeError, OEFConnectionError
+from oef.chunking import ChunkAssembler
+from ..common import AgentTest, FakeOEFNode
+from ..conftest import _ASYNCIO_DELAY
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+    # leave a usable current loop to the tests that rely on the default one.
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+def test_handshake_and_message_exchange(loop):
+    """Test that the connection handshake and the message exchange work on top of the protocol."""
+    with FakeOEFNode(loop) as node:
+        agent_0 = AgentTest(OEFNetworkProxy("agent_0", "127.0.0.1", node.port, loop=loop))
+        agent_1 = AgentTest(OEFNetworkProxy("agent_1", "127.0.0.1", node.port, loop=loop))
+        assert agent_0.connect()
+        assert agent_1.connect()
+
+        for i in range(10):
+            agent_0.send_message(i, 0, agent_1.public_key, b"hello" * i)
+
+        asyncio.ensure_future(agent_1.async_run(), loop=loop)
+        loop.run_until_complete(asyncio.sleep(_ASYNCIO_DELAY))
+        agent_1.stop()
+        agent_0.disconnect()
+        agent_1.disconnect()
+
+    assert agent_1.received_msg == [(i, 0, agent_0.public_key, b"hello" * i) for i in range(10)]
+
+
+def test_connect_fails_when_public_key_is_in_use(loop):
+    """Test that the handshake fails when the public key is already connected."""
+    with FakeOEFNode(loop) as node:
+        proxy_1 = OEFNetworkProxy("same_key", "127.0.0.1", node.port, loop=loop)
+        proxy_2 = OEFNetworkProxy("same_key", "127.0.0.1", node.port, loop=loop)
+        assert loop.run_until_complete(proxy_1.connect())
+        assert not loop.run_until_complete(proxy_2.connect())
+        loop.run_until_complete(proxy_1.stop())
+
+
+def test_overflow_policy_raise(loop):
+    """Test that a send raises an error when the write buffer is full and the policy is RAISE."""
+    with FakeOEFNode(loop) as node:
+        proxy = OEFNetworkProxy("agent", "127.0.0.1", node.port, loop=loop, overflow_policy=OverflowPolicy.RAISE)
+        loop.run_until_complete(proxy.connect())
+        proxy._protocol.pause_writing()
+        with pytest.raises(OEFWriteBufferFullError):
+            proxy.send_message(0, 0, "agent", b"hello")
+        proxy._protocol.resume_writing()
+        loop.run_until_complete(proxy.stop())
+
+
+def test_overflow_policy_drop(loop):
+    """Test that a send is dropped when the write buffer is full and the policy is DROP."""
+    with FakeOEFNode(loop) as node:
+        agent = AgentTest(OEFNetworkProxy("agent", "127.0.0.1", node.port, loop=loop,
+                                          overflow_policy=OverflowPolicy.DROP))
+        agent.connect()
+        agent._oef_proxy._protocol.pause_writing()
+        agent.send_message(0, 0, agent.public_key, b"dropped")
+        agent._oef_proxy._protocol.resume_writing()
+        agent.send_message(1, 0, agent.public_key, b"delivered")
+
+        asyncio.ensure_future(agent.async_run(), loop=loop)
+        loop.run_until_complete(asyncio.sleep(_ASYNCIO_DELAY))
+        agent.stop()
+        agent.disconnect()
+
+    assert agent._oef_proxy.dropped_messages == 1
+    assert agent.received_msg == [(1, 0, agent.public_key, b"delivered")]
+
+
+def test_async_send_waits_for_the_write_buffer_to_drain(loop):
+    """Test that the asynchronous send methods wait until the write buffer is below the low-water mark."""
+    with FakeOEFNode(loop) as node:
+        agent = AgentTest(OEFNetworkProxy("agent", "127.0.0.1", node.port, loop=loop,
+                                          write_buffer_limits=(2 ** 16, 2 ** 12)))
+        agent.connect()
+        agent._oef_proxy._protocol.pause_writing()
+        task = asyncio.ensure_future(agent.async_send_message(0, 0, agent.public_key, b"hello"), loop=loop)
+        loop.run_until_complete(asyncio.sleep(_ASYNCIO_DELAY))
+        assert not task.done()
+
+        agent._oef_proxy._protocol.resume_writing()
+        loop.run_until_complete(task)
+        asyncio.ensure_future(agent.async_run(), loop=loop)
+        loop.run_until_complete(asyncio.sleep(_ASYNCIO_DELAY))
+        agent.stop()
+        agent.disconnect()
+
+    assert agent.received_msg == [(0, 0, agent.public_key, b"hello")]
+
+
+def test_reconnect_registers_again_and_replays_buffered_messages(loop):
+    """Test that, when the connection drops, the proxy reconnects, registers again and replays the messages."""
+    policy = ReconnectPolicy(base_delay=0.05, jitter=0.0)
+    with FakeOEFNode(loop) as node:
+        agent_0 = AgentTest(OEFNetworkProxy("agent_0", "127.0.0.1", node.port, loop=loop, reconnect_policy=policy))
+        agent_1 = AgentTest(OEFNetworkProxy("agent_1", "127.0.0.1", node.port, loop=loop))
+        assert agent_0.connect()
+        assert agent_1.connect()
+        agent_0.register_service(0, Description({}))
+        loop.run_until_complete(asyncio.sleep(_ASYNCIO_DELAY))
+
+        node.drop_connections()
+        loop.run_until_complete(asyncio.sleep(0.01))
+        agent_0.send_message(1, 0, "agent_1", b"hello")
+        agent_1.connect()
+        asyncio.ensure_future(agent_1.async_run(), loop=loop)
+        loop.run_until_complete(asyncio.sleep(_ASYNCIO_DELAY * 2))
+        agent_1.stop()
+        agent_0.disconnect()
+        agent_1.disconnect()
+
+    registrations = [envelope for public_key, envelope in node.received
+                     if public_key == "agent_0" and envelope.WhichOneof("payload") == "register_service"]
+    assert len(registrations) == 2
+    assert agent_1.received_msg == [(1, 0, "agent_0", b"hello")]
+    stats = agent_0._oef_proxy.reconnect_stats
+    assert stats.reconnects == 1
+    assert stats.replayed_frames == 1
+    assert stats.dropped_frames == 0
+
+
+def test_reconnect_replays_the_messages_not_flushed(loop):
+    """Test that the messages corked when the connection drops are replayed after the reconnection."""
+    policy = ReconnectPolicy(base_delay=0.05, jitter=0.0)
+    with FakeOEFNode(loop) as node:
+        agent_0 = AgentTest(OEFNetworkProxy("agent_0", "127.0.0.1", node.port, loop=loop, reconnect_policy=policy))
+        agent_1 = AgentTest(OEFNetworkProxy("agent_1", "127.0.0.1", node.port, loop=loop))
+        assert agent_0.connect()
+        assert agent_1.connect()
+
+        with agent_0._oef_proxy.cork():
+            agent_0.send_message(0, 0, "agent_1", b"corked")
+            node.drop_connections()
+            loop.run_until_complete(asyncio.sleep(0.01))
+        agent_1.connect()
+        asyncio.ensure_future(agent_1.async_run(), loop=loop)
+        loop.run_until_complete(asyncio.sleep(_ASYNCIO_DELAY * 2))
+        agent_1.stop()
+        agent_0.disconnect()
+        agent_1.disconnect()
+
+    assert agent_1.received_msg == [(0, 0, "agent_0", b"corked")]
+    assert agent_0._oef_proxy.reconnect_stats.replayed_frames == 1
+
+
+def test_registration_while_reconnecting_is_sent_once(loop):
+    """Test that a service registered while reconnecting, even twice, is registered once with the new connection."""
+    policy = ReconnectPolicy(base_delay=0.05, jitter=0.0)
+    with FakeOEFNode(loop) as node:
+        proxy = OEFNetworkProxy("agent_0", "127.0.0.1", node.port, loop=loop, reconnect_policy=policy)
+        assert loop.run_until_complete(proxy.connect())
+
+        node.drop_connections()
+        loop.run_until_complete(asyncio.sleep(0.01))
+        proxy.register_service(0, Description({"foo": 1}))
+        proxy.register_service(1, Description({"foo": 1}))
+        loop.run_until_complete(asyncio.sleep(_ASYNCIO_DELAY * 2))
+        loop.run_until_complete(proxy.stop())
+
+    registrations = [envelope for public_key, envelope in node.received
+                     if envelope.WhichOneof("payload") == "register_service"]
+    assert len(registrations) == 1
+    assert proxy.reconnect_stats.replayed_frames == 0
+
+
+def test_failed_reconnection_is_raised_by_the_next_call(loop):
+    """Test that a reconnection that gives up is recorded, and raised by the next send, receive and connect."""
+    policy = ReconnectPolicy(max_attempts=2, base_delay=0.01, jitter=0.0)
+    with FakeOEFNode(loop) as node:
+        proxy = OEFNetworkProxy("agent_0", "127.0.0.1", node.port, loop=loop, reconnect_policy=policy)
+        assert loop.run_until_complete(proxy.connect())
+        receiving = asyncio.ensure_future(proxy._receive(), loop=loop)
+    loop.run_until_complete(asyncio.sleep(0.2))
+
+    assert isinstance(proxy.reconnect_error, OEFConnectionError)
+    with pytest.raises(OEFConnectionError, match="Unable to reconnect"):
+        proxy.send_message(0, 0, "agent_1", b"hello")
+    with pytest.raises(OEFConnectionError, match="Unable to reconnect"):
+        loop.run_until_complete(receiving)
+    with pytest.raises(OSError):
+        loop.run_until_complete(proxy.connect())
+    assert proxy.reconnect_error is None
+
+
+def test_connect_many(loop):
+    """Test that many proxies are connected concurrently, and that the failures are reported."""
+    with FakeOEFNode(loop) as node:
+        proxies = [OEFNetworkProxy("agent_{}".format(i), "127.0.0.1", node.port, loop=loop) for i in range(50)]
+        duplicate = OEFNetworkProxy("agent_0", "127.0.0.1", node.port, loop=loop)
+        stats = loop.run_until_complete(connect_many(proxies, concurrency=8, loop=loop))
+        duplicate_stats = loop.run_until_complete(
+            connect_many([duplicate], retry_policy=ReconnectPolicy(max_attempts=3, base_delay=0.01), loop=loop))
+
+        assert stats.connected == 50
+        assert len(node.connections) == 50
+        assert stats.retries == 0
+        assert stats.max_time <= stats.elapsed
+        assert duplicate_stats.connected == 0
+        assert duplicate_stats.failed[0].attempts == 3
+        assert not duplicate.is_connected()
+
+        for proxy in proxies:
+            loop.run_until_complete(proxy.stop())
+
+
+def test_connect_many_gives_up_on_an_unreachable_node(loop):
+    """Test that a proxy that always fails to connect is retried a limited number of times."""
+    with FakeOEFNode(loop) as node:
+        port = node.port
+    proxy = OEFNetworkProxy("agent_0", "127.0.0.1", port, loop=loop)
+
+    with pytest.raises(ValueError, match="limit the number of attempts"):
+        loop.run_until_complete(connect_many([proxy], retry_policy=ReconnectPolicy(), loop=loop))
+    stats = loop.run_until_complete(
+        connect_many([proxy], retry_policy=ReconnectPolicy(max_attempts=3, base_delay=0.01), loop=loop))
+
+    assert stats.connected == 0
+    assert stats.failed[0].attempts == 3 and isinstance(stats.failed[0].error, OSError)
+
+
+class _BadNode(asyncio.Protocol):
+    """A node that answers the ID of the agent with a malformed frame, or does not answer at all if ``silent``."""
+
+    def __init__(self, silent: bool):
+        self.silent = silent
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        if not self.silent:
+            self.transport.write(struct.pack("I", 2) + b"\xff\xff")
+
+
+@pytest.mark.parametrize("silent", [False, True])
+def test_connect_many_reports_stalled_and_malformed_handshakes(loop, silent):
+    """Test that a handshake that times out, or that fails to decode, is reported without stopping the others."""
+    server = loop.run_until_complete(loop.create_server(lambda: _BadNode(silent), "127.0.0.1", 0))
+    port = server.sockets[0].getsockname()[1]
+    with FakeOEFNode(loop) as node:
+        proxies = [OEFNetworkProxy("agent_0", "127.0.0.1", node.port, loop=loop),
+                   OEFNetworkProxy("agent_1", "127.0.0.1", port, loop=loop)]
+        stats = loop.run_until_complete(
+            connect_many(proxies, retry_policy=ReconnectPolicy(max_attempts=2, base_delay=0.01), timeout=0.1,
+                         loop=loop))
+
+        assert stats.connected == 1
+        assert stats.failed[0].proxy is proxies[1] and stats.failed[0].attempts == 2
+        assert isinstance(stats.failed[0].error, asyncio.TimeoutError if silent else DecodeError)
+        assert not proxies[1].is_connected()
+
+        loop.run_until_complete(proxies[0].stop())
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+
+
+def test_malformed_rehandshake_fails_the_reconnection(loop):
+    """Test that a reconnection whose handshake fails to decode is recorded, instead of hanging the proxy."""
+    server = loop.run_until_complete(loop.create_server(lambda: _BadNode(False), "127.0.0.1", 0))
+    policy = ReconnectPolicy(max_attempts=2, base_delay=0.01, jitter=0.0)
+    with FakeOEFNode(loop) as node:
+        proxy = OEFNetworkProxy("agent_0", "127.0.0.1", node.port, loop=loop, reconnect_policy=policy)
+        assert loop.run_until_complete(proxy.connect())
+        proxy.port = server.sockets[0].getsockname()[1]
+    loop.run_until_complete(asyncio.sleep(0.2))
+
+    assert proxy._reconnect_task is None
+    assert isinstance(proxy.reconnect_error, OEFConnectionError)
+    assert proxy.reconnect_stats.failed_attempts == 2
+    with pytest.raises(OEFConnectionError, match="Unable to reconnect"):
+        proxy.send_message(0, 0, "agent_1", b"hello")
+    with pytest.raises(OEFConnectionError, match="Unable to reconnect"):
+        loop.run_until_complete(proxy._receive())
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+
+
+def test_unix_domain_socket(loop, tmp_path):
+    """Test that the handshake and the message exchange work over a Unix domain socket."""
+    with FakeOEFNode(loop, path=str(tmp_path / "oef.sock")) as node:
+        agent_0 = AgentTest(OEFNetworkProxy("agent_0", node.addr, loop=loop))
+        agent_1 = AgentTest(OEFNetworkProxy("agent_1", node.addr, loop=loop))
+        assert agent_0.connect()
+        assert agent_1.connect()
+
+        agent_0.send_message(0, 0, agent_1.public_key, b"hello")
+
+        asyncio.ensure_future(agent_1.async_run(), loop=loop)
+        loop.run_until_complete(asyncio.sleep(_ASYNCIO_DELAY))
+        agent_1.stop()
+        agent_0.disconnect()
+        agent_1.disconnect()
+
+    assert agent_1.received_msg == [(0, 0, agent_0.public_key, b"hello")]
+
+
+def test_socket_options(loop):
+    """Test that the socket options are set after connecting, and that the effective values are reported."""
+    options = SocketOptions(nodelay=False, receive_buffer_size=65536, keepalive=True, keepalive_count=3)
+    with FakeOEFNode(loop) as node:
+        proxy = OEFNetworkProxy("agent_0", "127.0.0.1", node.port, loop=loop, socket_options=options)
+        assert loop.run_until_complete(proxy.connect())
+        effective = proxy.effective_socket_options
+        loop.run_until_complete(proxy.stop())
+
+    assert effective["nodelay"] == 0
+    assert effective["keepalive"] != 0
+    assert effective["receive_buffer_size"] >= 65536
+    if "keepalive_count" in effective:
+        assert effective["keepalive_count"] == 3
+
+
+@pytest.mark.parametrize("spool", [False, True])
+def test_send_message_chunked(loop, tmp_path, spool):
+    """Test that a content larger than the maximum frame size is sent in chunks, and delivered whole."""
+    content = bytes(range(256)) * 4096
+    with FakeOEFNode(loop) as node:
+        agent_0 = AgentTest(OEFNetworkProxy("agent_0", "127.0.0.1", node.port, loop=loop, max_frame_size=70000))
+        agent_1 = AgentTest(OEFNetworkProxy("agent_1", "127.0.0.1", node.port, loop=loop, max_frame_size=70000))
+        if spool:
+            agent_1._oef_proxy.chunk_assembler = ChunkAssembler(spool_dir=str(tmp_path))
+        assert agent_0.connect()
+        assert agent_1.connect()
+
+        with pytest.raises(OEFFrameTooLargeError):
+            agent_0.send_message(0, 0, agent_1.public_key, content)
+        received = []
+        agent_1.on_message = lambda msg_id, dialogue_id, origin, msg: received.append(bytes(msg))
+        agent_0.send_message_chunked(1, 0, agent_1.public_key, content, chunk_size=65536)
+
+        asyncio.ensure_future(agent_1.async_run(), loop=loop)
+        loop.run_until_complete(asyncio.sleep(_ASYNCIO_DELAY))
+        agent_1.stop()
+        agent_0.disconnect()
+        agent_1.disconnect()
+
+    assert received == [content]
+
+
+def test_pipelined_loop(loop):
+    """Test that, with a pipeline, the frames are read while a slow handler runs, and are handled in order."""
+
+    class SlowAgent(AgentTest):
+        async def async_on_message(self, msg_id, dialogue_id, origin, content):
+            await asyncio.sleep(0.01)
+            self.on_message(msg_id, dialogue_id, origin, content)
+
+    with FakeOEFNode(loop) as node:
+        sender = AgentTest(OEFNetworkProxy("sender", "127.0.0.1", node.port, loop=loop))
+        receiver = SlowAgent(OEFNetworkProxy("receiver", "127.0.0.1", node.port, loop=loop, pipeline_depth=100))
+        sender.connect()
+        receiver.connect()
+        asyncio.ensure_future(receiver.async_run(), loop=loop)
+
+        for i in range(10):
+            sender.send_message(i, 0, receiver.public_key, b"hello")
+        loop.run_until_complete(asyncio.sleep(0.3))
+        stats = receiver._oef_proxy.pipeline_stats
+        receiver.stop()
+        sender.disconnect()
+        receiver.disconnect()
+
+    assert [msg_id for msg_id, _, _, _ in receiver.received_msg] == list(range(10))
+    assert stats.frames_read == stats.frames_dispatched == 10
+    assert stats.dispatch_time >= 0.09
+    assert stats.dropped == 0
+
+
+def test_blocked_pipeline_pauses_reading(loop):
+    """Test that when the pipeline is full and blocks, the proxy stops reading from the connection."""
+    release = asyncio.Event()
+
+    class BlockedAgent(AgentTest):
+        async def async_on_message(self, msg_id, dialogue_id, origin, content):
+            await release.wait()
+            self.on_message(msg_id, dialogue_id, origin, content)
+
+    with FakeOEFNode(loop) as node:
+        sender = AgentTest(OEFNetworkProxy("sender", "127.0.0.1", node.port, loop=loop))
+        receiver = BlockedAgent(OEFNetworkProxy("receiver", "127.0.0.1", node.port, loop=loop, pipeline_depth=1,
+                                                pipeline_policy=PipelineOverflowPolicy.BLOCK,
+                                                read_buffer_limits=(1000, 100)))
+        sender.connect()
+        receiver.connect()
+        asyncio.ensure_future(receiver.async_run(), loop=loop)
+
+        # the first message blocks the dispatcher, the second one fills the pipeline, the others are not read.
+        for burst in (range(1), range(1, 2), range(2, 50)):
+            for i in burst:
+                sender.send_message(i, 0, receiver.public_key, b"x" * 100)
+            loop.run_until_complete(asyncio.sleep(0.1))
+        paused = receiver._oef_proxy._protocol.reading_paused
+        release.set()
+        loop.run_until_complete(asyncio.sleep(0.2))
+        resumed = not receiver._oef_proxy._protocol.reading_paused
+        receiver.stop()
+        sender.disconnect()
+        receiver.disconnect()
+
+    assert paused and resumed
+    assert [msg_id for msg_id, _, _, _ in receiver.received_msg] == list(range(50))
+
+
+def test_full_scheduler_pauses_reading(loop):
+    """Test that when the concurrent handlers cannot keep up, the proxy stops reading from the connection."""
+    release = asyncio.Event()
+
+    class BlockedAgent(AgentTest):
+        async def async_on_message(self, msg_id, dialogue_id, origin, content):
+            await release.wait()
+            self.on_message(msg_id, dialogue_id, origin, content)
+
+    with FakeOEFNode(loop) as node:
+        sender = AgentTest(OEFNetworkProxy("sender", "127.0.0.1", node.port, loop=loop))
+        receiver = BlockedAgent(OEFNetworkProxy("receiver", "127.0.0.1", node.port, loop=loop,
+                                                max_concurrent_handlers=1, read_buffer_limits=(1000, 100)))
+        sender.connect()
+        receiver.connect()
+        asyncio.ensure_future(receiver.async_run(), loop=loop)
+
+        # the first burst fills the queue of the handlers, the second one is not read.
+        for burst in (range(30), range(30, 80)):
+            for i in burst:
+                sender.send_message(i, 0, receiver.public_key, b"x" * 100)
+            loop.run_until_complete(asyncio.sleep(0.1))
+        paused = receiver._oef_proxy._protocol.reading_paused
+        release.set()
+        loop.run_until_complete(asyncio.sleep(0.2))
+        resumed = not receiver._oef_proxy._protocol.reading_paused
+        receiver.stop()
+        sender.disconnect()
+        receiver.disconnect()
+
+    assert paused and resumed
+    assert [msg_id for msg_id, _, _, _ in receiver.received_msg] == list(range(80))
+
+
+def test_send_cfp_many(loop):
+    """Test that a CFP sent in many dialogues is received in each of them, as if it was sent one at a time."""
+    query = Query([Constraint("foo", Eq(0))])
+    with FakeOEFNode(loop) as node:
+        buyer = AgentTest(OEFNetworkProxy("buyer", "127.0.0.1", node.port, loop=loop))
+        sellers = [AgentTest(OEFNetworkProxy("seller_{}".format(i), "127.0.0.1", node.port, loop=loop))
+                   for i in range(3)]
+        for agent in [buyer] + sellers:
+            agent.connect()
+            asyncio.ensure_future(agent.async_run(), loop=loop)
+
+        buyer.send_cfp_many(0, [(i, seller.public_key) for i, seller in enumerate(sellers)], 0, query)
+        buyer.send_propose_many(1, [(i, seller.public_key) for i, seller in enumerate(sellers)], 0, b"hello")
+        loop.run_until_complete(asyncio.sleep(_ASYNCIO_DELAY))
+        for agent in [buyer] + sellers:
+            agent.stop()
+            agent.disconnect()
+
+    for i, seller in enumerate(sellers):
+        assert seller.received_msg == [(0, i, buyer.public_key, 0, query), (1, i, buyer.public_key, 0, b"hello")]
+    broadcast = [envelope for _, envelope in node.received if envelope.WhichOneof("payload") == "send_message"]
+    assert broadcast[:3] == [CFP(0, i, seller.public_key, 0, query).to_pb() for i, seller in enumerate(sellers)]
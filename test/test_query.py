@@ -20,9 +20,9 @@
 import pytest
 from hypothesis import given
 
-from oef import query_pb2
-from oef.query import Relation, Range, Set, And, Or, Constraint, Query, Eq, In, Not, Distance
-from oef.schema import Location, DataModel, AttributeSchema
+from oef import agent_pb2, query_pb2
+from oef.query import Relation, Range, Set, And, Or, Constraint, Query, Eq, In, Not, Distance, LazyQuery
+from oef.schema import Location, DataModel, AttributeSchema, serialization_cache_stats
 from test.strategies import relations, ranges, query_sets, and_constraints, or_constraints, constraints, \
     queries, not_constraints, distances
 
@@ -207,6 +207,57 @@ class TestQuery:
 
         assert expected_query == actual_query
 
+    @given(queries())
+    def test_to_pb_in_place(self, query: Query):
+        """Test that a Query written into a field of an enclosing message is the same as the one built apart."""
+        search = agent_pb2.AgentSearch()
+        query_pb = query.to_pb(search.query)
+
+        assert query_pb is search.query
+        assert search.HasField("query")
+        assert search.query == query.to_pb()
+
+    @given(queries())
+    def test_frozen_query(self, query: Query):
+        """Test that the constraints of a frozen query cannot be changed, and that it is serialized only once."""
+        expected_pb = query.to_pb()
+        query.freeze()
+
+        assert all(constraint.is_frozen for constraint in query.constraints)
+        with pytest.raises(TypeError):
+            query.constraints.append(query.constraints[0])
+        with pytest.raises(AttributeError):
+            query.model = None
+
+        serialization_cache_stats.reset()
+        assert query.to_pb() == expected_pb
+        assert query.to_pb() == expected_pb
+        assert serialization_cache_stats.hits == 1
+
+    @given(queries())
+    def test_fingerprint_and_hash(self, query: Query):
+        """Test that equal queries and constraints have the same fingerprint, and that the frozen ones can be hashed."""
+        decoded = Query.from_pb(query.to_pb())
+
+        assert decoded.fingerprint == query.fingerprint
+        with pytest.raises(TypeError, match="unhashable"):
+            hash(query)
+        assert {query.freeze(), decoded.freeze()} == {query}
+        assert set(query.constraints) == set(decoded.constraints)
+        assert decoded == query
+
+    @given(queries())
+    def test_lazy_query(self, query: Query):
+        """Test that a LazyQuery is decoded on first access, and equals the original query."""
+        query_pb = query.to_pb()
+        lazy_query = LazyQuery(query_pb)
+
+        assert lazy_query.to_pb() is query_pb
+        assert not lazy_query.is_decoded
+        assert lazy_query == query
+        assert query == lazy_query
+        assert lazy_query.is_decoded
+
     def test_not_equal_when_compared_with_different_type(self):
         a_query = Query([Constraint("foo", Eq(0))], DataModel("bar", [AttributeSchema("foo", int, True)]))
         not_a_query = tuple()
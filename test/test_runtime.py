@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains tests for the selection of the event loop implementation."""
+
+import asyncio
+
+import pytest
+
+from oef import runtime
+from oef.proxy import OEFLocalProxy
+
+
+def test_new_event_loop_asyncio():
+    """Test that the asyncio implementation can always be selected."""
+    loop = runtime.new_event_loop("asyncio")
+    try:
+        assert isinstance(loop, asyncio.AbstractEventLoop)
+        assert "asyncio" in runtime.available_loops()
+    finally:
+        loop.close()
+
+
+def test_new_event_loop_from_environment(monkeypatch):
+    """Test that the implementation is read from the environment, and that unknown names are rejected."""
+    monkeypatch.setenv(runtime.OEF_EVENT_LOOP_ENV, "unknown")
+    with pytest.raises(ValueError):
+        runtime.new_event_loop()
+
+
+def test_proxy_uses_the_installed_loop():
+    """Test that a proxy created without an explicit loop uses the current event loop."""
+    loop = runtime.install("asyncio")
+    try:
+        proxy = OEFLocalProxy("agent", OEFLocalProxy.LocalNode(loop=loop))
+        assert proxy._loop is loop
+    finally:
+        asyncio.set_event_loop_policy(None)
+        loop.close()
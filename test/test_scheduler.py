@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains tests for the concurrent execution of the message handlers."""
+
+import asyncio
+
+import pytest
+
+from oef.scheduler import HandlerScheduler
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+
+def _job(log, lane, i, delay):
+    async def job():
+        log.append(("start", lane, i))
+        await asyncio.sleep(delay)
+        log.append(("end", lane, i))
+    return job
+
+
+def test_lanes_keep_order_and_run_concurrently(loop):
+    """Test that the handlers of a lane run in order, one at a time, while different lanes run concurrently."""
+    scheduler = HandlerScheduler(max_in_flight=4, loop=loop)
+    log = []
+
+    async def run():
+        for i in range(3):
+            await scheduler.submit("slow", _job(log, "slow", i, 0.03))
+            await scheduler.submit("fast", _job(log, "fast", i, 0.0))
+        await scheduler.join()
+
+    loop.run_until_complete(run())
+
+    for lane in ("slow", "fast"):
+        events = [(event, i) for event, lane_, i in log if lane_ == lane]
+        assert events == [("start", 0), ("end", 0), ("start", 1), ("end", 1), ("start", 2), ("end", 2)]
+    # the fast lane is not blocked by the slow one.
+    assert log.index(("end", "fast", 2)) < log.index(("end", "slow", 0))
+    assert scheduler.stats.completed == 6
+    assert scheduler.stats.peak_in_flight == 2
+    assert scheduler.stats.in_flight == scheduler.stats.queued == scheduler.stats.lanes == 0
+
+
+def test_max_in_flight_and_failures(loop):
+    """Test that no more than max_in_flight handlers run at once, and that failing handlers are counted."""
+    scheduler = HandlerScheduler(max_in_flight=2, max_queued=3, loop=loop)
+    log = []
+
+    async def failing():
+        raise ValueError()
+
+    async def run():
+        for i in range(10):
+            await scheduler.submit(i, _job(log, i, 0, 0.01))
+            assert scheduler.stats.queued <= 3
+        await scheduler.submit("failing", failing)
+        await scheduler.join()
+
+    loop.run_until_complete(run())
+
+    assert scheduler.stats.peak_in_flight == 2
+    assert scheduler.stats.peak_queued == 3
+    assert scheduler.stats.completed == 10
+    assert scheduler.stats.failed == 1
@@ -18,6 +18,11 @@
 #
 # ------------------------------------------------------------------------------
 
+import copy
+import os
+import pickle
+import subprocess
+import sys
 from typing import List, Dict
 
 import pytest
@@ -26,7 +31,9 @@ from hypothesis.strategies import text, from_type, one_of, none
 from oef import query_pb2
 
 from oef.schema import AttributeSchema, ATTRIBUTE_TYPES, DataModel, AttributeInconsistencyException, Description, \
-    generate_schema, Location
+    generate_schema, Location, LazyDescription, FrozenDict, serialization_cache_stats, DataModelRegistry, \
+    DescriptionCache, description_cache, data_model_registry, unfrozen_type
+from oef.query import Query, Constraint, Distance
 
 from test.strategies import attribute_schema_values, descriptions, data_models, attributes_schema, locations
 
@@ -107,6 +114,66 @@ class TestDataModel:
                 AttributeSchema("foo", str, False)
             ])
 
+    def test_validate(self):
+        """Test that the values are validated against the required and allowed names and the exact types."""
+        data_model = DataModel("bar", [AttributeSchema("foo", int, True), AttributeSchema("baz", str, False)])
+
+        data_model.validate({"foo": 1})
+        data_model.validate({"foo": 1, "baz": "qux"})
+        with pytest.raises(AttributeInconsistencyException, match="Missing required attribute"):
+            data_model.validate({"baz": "qux"})
+        with pytest.raises(AttributeInconsistencyException, match="extra attribute"):
+            data_model.validate({"foo": 1, "qux": 1})
+        with pytest.raises(AttributeInconsistencyException, match="Attribute foo has incorrect type"):
+            data_model.validate({"foo": True})
+
+    @given(data_models())
+    def test_from_pb_returns_a_new_data_model(self, data_model):
+        """Test that the data models decoded with DataModel.from_pb are neither interned nor frozen."""
+        data_model_pb = data_model.to_pb()
+
+        decoded = DataModel.from_pb(data_model_pb)
+        assert decoded == data_model
+        assert not decoded.is_frozen
+        assert DataModel.from_pb(data_model_pb) is not decoded
+
+    def test_decoded_descriptions_share_the_interned_data_model(self):
+        """Test that the data models of the decoded descriptions are interned in the process-wide registry."""
+        data_model_registry.clear()
+        data_model = DataModel("foo", [AttributeSchema("foo", int, True)])
+        description_pb = Description({"foo": 1}, data_model).to_pb()
+
+        decoded = Description.from_pb(description_pb).data_model
+        assert decoded.is_frozen and not data_model.is_frozen
+        assert Description.from_pb(description_pb).data_model is decoded
+        assert data_model_registry.from_pb(data_model.to_pb()) is decoded
+
+    @given(data_models())
+    def test_decoded_data_models_are_interned(self, data_model):
+        """Test that the data models decoded with the same fingerprint share one frozen instance."""
+        registry = DataModelRegistry()
+        data_model_pb = data_model.to_pb()
+
+        decoded = registry.from_pb(data_model_pb)
+        assert decoded == data_model
+        assert decoded.fingerprint == data_model.fingerprint
+        assert decoded.is_frozen
+        assert registry.from_pb(data_model_pb) is decoded
+        assert registry.intern(data_model) is decoded
+        assert not data_model.is_frozen
+        assert (registry.stats.hits, registry.stats.misses, len(registry)) == (2, 1, 1)
+
+    def test_the_registry_is_bounded(self):
+        """Test that once the registry is full, the new data models are returned without being interned."""
+        registry = DataModelRegistry(max_size=1)
+        foo = registry.intern(DataModel("foo", [AttributeSchema("foo", int, True)]))
+        bar = DataModel("bar", [AttributeSchema("bar", int, True)])
+
+        assert foo.is_frozen
+        assert registry.intern(bar) is bar and not bar.is_frozen
+        assert registry.from_pb(bar.to_pb()) is not registry.from_pb(bar.to_pb())
+        assert len(registry) == 1
+
 
 class TestDescription:
 
@@ -123,6 +190,146 @@ class TestDescription:
         """Test that equality test with different types works correctly."""
         assert desc != any
 
+    @given(descriptions())
+    def test_to_pb_in_place(self, description):
+        """Test that a Description written into a field of an enclosing message is the same as the one built apart."""
+        agent_description = description.to_agent_description_pb()
+
+        assert agent_description.HasField("description")
+        assert agent_description.description == description.to_pb()
+        assert LazyDescription(description.to_pb()).to_pb(query_pb2.Query.Instance()) == description.to_pb()
+
+    @given(descriptions())
+    def test_lazy_description(self, description):
+        """Test that a LazyDescription is decoded on first access, and equals the original description."""
+        description_pb = description.to_pb()
+        lazy_description = LazyDescription(description_pb)
+
+        assert lazy_description.to_pb() is description_pb
+        assert not lazy_description.is_decoded
+        assert lazy_description == description
+        assert description == lazy_description
+        assert lazy_description.is_decoded
+        assert lazy_description.values == description.values
+
+
+    @given(descriptions())
+    def test_frozen_description_caches_its_serialized_form(self, description):
+        """Test that a frozen description cannot be changed, and that it is serialized only once."""
+        expected_pb = description.to_pb()
+        description.freeze()
+
+        assert description.is_frozen and description.data_model.is_frozen
+        assert isinstance(description.values, FrozenDict)
+        with pytest.raises(AttributeError):
+            description.values = {}
+        with pytest.raises(TypeError):
+            description.values["foo"] = 0
+        with pytest.raises(AttributeError):
+            description.data_model.name = "foo"
+        with pytest.raises(TypeError):
+            description.data_model.attribute_schemas.append(AttributeSchema("foo", int, True))
+
+        serialization_cache_stats.reset()
+        assert description.to_pb() == expected_pb
+        assert description.to_pb() == expected_pb
+        assert description.to_agent_description_pb().description == expected_pb
+        # the description and its data model are serialized once, when the first Protobuf object is built.
+        assert (serialization_cache_stats.hits, serialization_cache_stats.misses) == (2, 2)
+        assert Description.from_pb(expected_pb) == description
+
+    def test_frozen_description_behaves_like_the_original(self):
+        """Test that a frozen description, and the location it contains, keep their class for equality,
+        validation, queries, copies and pickling."""
+        data_model = DataModel("foo", [AttributeSchema("position", Location, True)])
+        description = Description({"position": Location(1.0, 2.0)}, data_model)
+        frozen = copy.deepcopy(description).freeze()
+
+        assert isinstance(frozen, Description) and type(frozen).__name__ == "Description"
+        assert unfrozen_type(frozen) is Description and unfrozen_type(frozen.values["position"]) is Location
+        assert frozen == description and description == frozen
+        assert frozen.data_model == data_model and data_model == frozen.data_model
+        assert Description(dict(frozen.values), data_model) == description
+        assert generate_schema("foo", frozen.values) == data_model
+        assert Query([Constraint("position", Distance(Location(1.0, 2.0), 1.0))], data_model).check(frozen)
+        for copied in (copy.deepcopy(frozen), pickle.loads(pickle.dumps(frozen))):
+            assert copied == frozen and copied.is_frozen and copied is not frozen
+            with pytest.raises(AttributeError):
+                copied.values = {}
+
+    @given(descriptions())
+    def test_fingerprint_and_hash(self, description):
+        """Test that equal descriptions have the same fingerprint, and that only the frozen ones can be hashed."""
+        decoded = Description.from_pb(description.to_pb())
+
+        assert decoded.fingerprint == description.fingerprint
+        with pytest.raises(TypeError, match="unhashable"):
+            hash(description)
+        assert {description.freeze(), decoded.freeze()} == {description}
+        assert decoded == description
+        assert hash(decoded) == hash(description)
+
+    def test_fingerprint_is_the_same_in_every_process(self):
+        """Test that the fingerprint does not depend on the hash seed of the process."""
+        code = "from oef.schema import Description, Location; " \
+               "print(Description({'foo': 1, 'bar': 'baz', 'qux': Location(1.5, 2.0)}).fingerprint)"
+        fingerprints = {subprocess.check_output([sys.executable, "-c", code], env=dict(os.environ, PYTHONHASHSEED=seed)).strip()
+                        for seed in ("1", "2")}
+
+        assert fingerprints == {Description({"qux": Location(1.5, 2.0), "bar": "baz", "foo": 1}).fingerprint.encode()}
+        assert Description({"foo": 1}).fingerprint != Description({"foo": 2}).fingerprint
+
+    @given(descriptions())
+    def test_trusted_description(self, description):
+        """Test that a trusted description takes its values as they are, and equals the checked one."""
+        values = dict(description.values)
+        trusted = Description.trusted(values, description.data_model)
+
+        assert trusted.values is values
+        assert trusted == description
+        assert Description.trusted(values, data_model_name="foo") == Description(values, data_model_name="foo")
+
+    def test_from_pb_checks_the_values(self):
+        """Test that a description decoded from its Protobuf object is still checked against its data model."""
+        description_pb = Description({"foo": "bar"}).to_pb()
+        description_pb.model.attributes[0].type = query_pb2.Query.Attribute.INT
+
+        with pytest.raises(AttributeInconsistencyException, match="incorrect type"):
+            Description.from_pb(description_pb)
+
+
+    def test_description_cache(self):
+        """Test that the description cache shares frozen descriptions, and evicts the least recently used one."""
+        cache = DescriptionCache(capacity=2)
+        foo, bar, baz = [Description({"name": name}).to_pb() for name in ("foo", "bar", "baz")]
+
+        shared = cache.from_pb(foo)
+        assert shared.is_frozen and shared == Description({"name": "foo"})
+        assert cache.from_pb(foo) is shared
+        cache.from_pb(bar)
+        cache.from_pb(foo)
+        cache.from_pb(baz)
+        assert cache.from_pb(foo) is shared
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (3, 3, 1)
+
+        cache.resize(1)
+        assert len(cache) == 1 and cache.stats.evictions == 2
+        cache.resize(0)
+        assert not cache.enabled and cache.from_pb(foo) is not cache.from_pb(foo)
+
+    def test_from_pb_uses_the_description_cache_when_enabled(self):
+        """Test that Description.from_pb returns the shared descriptions only when the cache is enabled."""
+        description_pb = Description({"name": "foo"}).to_pb()
+        assert Description.from_pb(description_pb) is not Description.from_pb(description_pb)
+
+        description_cache.resize(16)
+        try:
+            assert Description.from_pb(description_pb) is Description.from_pb(description_pb)
+            assert Description.from_pb(description_pb).to_pb() == description_pb
+        finally:
+            description_cache.resize(0)
+            description_cache.clear()
+
 
 class TestGenerateSchema:
 
@@ -155,6 +362,15 @@ class TestGenerateSchema:
                                     {"foo": tuple()},
                                     "unallowed type")
 
+    def test_raise_when_have_generic_types(self):
+        """
+        Test that an attribute type that is not a class, like List[int], is accepted by the data model
+        but its values are refused.
+        """
+        check_inconsistency_checker([AttributeSchema("foo", List[int], True)],
+                                    {"foo": [1]},
+                                    "incorrect type")
+
     def test_raise_when_disallowed_types(self):
         """
         Test that if an attribute has a type that is no in the allowed set, we moan